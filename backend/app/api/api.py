@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import jobs, contacts, companies, resumes
+from app.api.v1 import jobs, contacts, companies, resumes, search, transfer, metrics
 
 api_router = APIRouter()
 
@@ -9,4 +9,6 @@ api_router.include_router(companies.router, prefix="/companies", tags=["companie
 api_router.include_router(resumes.router, prefix="/resumes", tags=["resumes"])
 from app.api.v1 import notes
 api_router.include_router(notes.router, prefix="/notes", tags=["notes"])
-
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(transfer.router, prefix="/data", tags=["data"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core import database
+from app.core.http_cache import CollectionCache
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, paginate
 from app.models import job_tracker as models
 from app.schemas import job_tracker as schemas
 
@@ -14,10 +16,22 @@ def get_db():
     finally:
         db.close()
 
+companies_cache = CollectionCache(["companies"], List[schemas.Company])
+
 @router.get("/", response_model=List[schemas.Company])
-def read_companies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    companies = db.query(models.Company).offset(skip).limit(limit).all()
-    return companies
+def read_companies(request: Request, response: Response, cursor: Optional[str] = None, skip: Optional[int] = Query(None, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    def load():
+        query = db.query(models.Company)
+        if skip is not None:
+            # Offset paging is kept for older clients only
+            return query.order_by(models.Company.id).offset(skip).limit(limit).all()
+
+        companies, next_cursor = paginate(query, models.Company.id, cursor, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return companies
+
+    return companies_cache.respond(request, response, load)
 
 @router.post("/", response_model=schemas.Company)
 def create_company(company: schemas.CompanyCreate, db: Session = Depends(get_db)):
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 from app.core import database
+from app.core.http_cache import CollectionCache
+from app.core.bulk import bulk_create, bulk_delete, bulk_patch
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, paginate
 from app.models import job_tracker as models
 from app.schemas import job_tracker as schemas
 
@@ -14,10 +18,23 @@ def get_db():
     finally:
         db.close()
 
+# Payload includes each contact's tasks
+contacts_cache = CollectionCache(["contacts", "tasks"], List[schemas.Contact])
+
 @router.get("/", response_model=List[schemas.Contact])
-def read_contacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    contacts = db.query(models.Contact).offset(skip).limit(limit).all()
-    return contacts
+def read_contacts(request: Request, response: Response, cursor: Optional[str] = None, skip: Optional[int] = Query(None, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    def load():
+        query = db.query(models.Contact)
+        if skip is not None:
+            # Offset paging is kept for older clients only
+            return query.order_by(models.Contact.id).offset(skip).limit(limit).all()
+
+        contacts, next_cursor = paginate(query, models.Contact.id, cursor, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return contacts
+
+    return contacts_cache.respond(request, response, load)
 
 @router.post("/", response_model=schemas.Contact)
 def create_contact(contact: schemas.ContactCreate, db: Session = Depends(get_db)):
@@ -27,6 +44,34 @@ def create_contact(contact: schemas.ContactCreate, db: Session = Depends(get_db)
     db.refresh(db_contact)
     return db_contact
 
+# Bulk routes are declared before "/{contact_id}" so "bulk" isn't parsed as an id
+@router.post("/bulk", response_model=List[schemas.BulkResult])
+def create_contacts_bulk(contacts: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    results = bulk_create(db, models.Contact, schemas.ContactCreate, contacts)
+    db.commit()
+    return results
+
+@router.patch("/bulk", response_model=List[schemas.BulkResult])
+def update_contacts_bulk(contacts: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    results = bulk_patch(db, models.Contact, schemas.ContactPatch, schemas.ContactCreate, contacts)
+    db.commit()
+    return results
+
+@router.delete("/bulk", response_model=List[schemas.BulkResult])
+def delete_contacts_bulk(request: schemas.BulkDelete, db: Session = Depends(get_db)):
+    def detach(contact_ids):
+        # Same effect as the ORM cascade on a single delete: tasks go with
+        # the contact, referred jobs just lose the link.
+        db.execute(delete(models.Task).where(models.Task.contact_id.in_(contact_ids)))
+        db.execute(
+            update(models.Job).where(models.Job.contact_id.in_(contact_ids)).values(contact_id=None),
+            execution_options={"synchronize_session": False},
+        )
+
+    results = bulk_delete(db, models.Contact, request.ids, before_delete=detach)
+    db.commit()
+    return results
+
 @router.put("/{contact_id}", response_model=schemas.Contact)
 def update_contact(contact_id: int, contact: schemas.ContactCreate, db: Session = Depends(get_db)):
     db_contact = db.query(models.Contact).filter(models.Contact.id == contact_id).first()
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date
 from app.core import database
+from app.core.http_cache import CollectionCache
+from app.core.bulk import bulk_create, bulk_delete, bulk_patch
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, paginate
 from app.models import job_tracker as models
 from app.schemas import job_tracker as schemas
 
@@ -14,10 +19,70 @@ def get_db():
     finally:
         db.close()
 
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Sortable columns. Each has an index ordered by (column, id) for the keyset
+# walk to seek on: company and position through their single-column indexes
+# (SQLite appends the rowid), the others through composite ones
+SORT_COLUMNS = {
+    "date_applied": models.Job.date_applied,
+    "company": models.Job.company,
+    "position": models.Job.position,
+    "status": models.Job.status,
+    "id": None,
+}
+
+# Payload includes each job's contact and that contact's tasks
+jobs_cache = CollectionCache(["jobs", "contacts", "tasks"], List[schemas.Job])
+
 @router.get("/", response_model=List[schemas.Job])
-def read_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    jobs = db.query(models.Job).offset(skip).limit(limit).all()
-    return jobs
+def read_jobs(
+    request: Request,
+    response: Response,
+    status: Optional[List[str]] = Query(None),
+    company: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    contact_id: Optional[int] = None,
+    sort: Literal["date_applied", "company", "position", "status", "id"] = "date_applied",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: Optional[str] = None,
+    skip: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    def load():
+        filters = []
+        if status:
+            filters.append(models.Job.status.in_(status))
+        if company:
+            filters.append(models.Job.company == company)
+        if date_from:
+            filters.append(models.Job.date_applied >= date_from)
+        if date_to:
+            filters.append(models.Job.date_applied <= date_to)
+        if contact_id is not None:
+            filters.append(models.Job.contact_id == contact_id)
+
+        # count(id) over the filtered rows is answered from an index, not the table
+        total = db.query(func.count(models.Job.id)).filter(*filters).scalar()
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+        query = db.query(models.Job).filter(*filters)
+        sort_column = SORT_COLUMNS[sort]
+        descending = order == "desc"
+
+        if skip is not None:
+            # Offset paging is kept for older clients only
+            keys = [sort_column, models.Job.id] if sort_column is not None else [models.Job.id]
+            return query.order_by(*[k.desc() if descending else k.asc() for k in keys]).offset(skip).limit(limit).all()
+
+        jobs, next_cursor = paginate(query, models.Job.id, cursor, limit, sort_column=sort_column, descending=descending)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return jobs
+
+    return jobs_cache.respond(request, response, load)
 
 @router.post("/", response_model=schemas.Job)
 def create_job(job: schemas.JobCreate, db: Session = Depends(get_db)):
@@ -27,6 +92,25 @@ def create_job(job: schemas.JobCreate, db: Session = Depends(get_db)):
     db.refresh(db_job)
     return db_job
 
+# Bulk routes are declared before "/{job_id}" so "bulk" isn't parsed as an id
+@router.post("/bulk", response_model=List[schemas.BulkResult])
+def create_jobs_bulk(jobs: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    results = bulk_create(db, models.Job, schemas.JobCreate, jobs)
+    db.commit()
+    return results
+
+@router.patch("/bulk", response_model=List[schemas.BulkResult])
+def update_jobs_bulk(jobs: List[Dict[str, Any]], db: Session = Depends(get_db)):
+    results = bulk_patch(db, models.Job, schemas.JobPatch, schemas.JobCreate, jobs)
+    db.commit()
+    return results
+
+@router.delete("/bulk", response_model=List[schemas.BulkResult])
+def delete_jobs_bulk(request: schemas.BulkDelete, db: Session = Depends(get_db)):
+    results = bulk_delete(db, models.Job, request.ids)
+    db.commit()
+    return results
+
 @router.put("/{job_id}", response_model=schemas.Job)
 def update_job(job_id: int, job: schemas.JobCreate, db: Session = Depends(get_db)):
     db_job = db.query(models.Job).filter(models.Job.id == job_id).first()
@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+from app.core import metrics
+
+router = APIRouter()
+
+@router.get("/")
+def read_metrics():
+    return metrics.snapshot()
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core import database
+from app.core.http_cache import CollectionCache
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, paginate
 from app.models import job_tracker as models
 from app.schemas import job_tracker as schemas
 from datetime import date
@@ -15,10 +17,22 @@ def get_db():
     finally:
         db.close()
 
+notes_cache = CollectionCache(["notes"], List[schemas.Note])
+
 @router.get("/", response_model=List[schemas.Note])
-def read_notes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    notes = db.query(models.Note).offset(skip).limit(limit).all()
-    return notes
+def read_notes(request: Request, response: Response, cursor: Optional[str] = None, skip: Optional[int] = Query(None, ge=0), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), db: Session = Depends(get_db)):
+    def load():
+        query = db.query(models.Note)
+        if skip is not None:
+            # Offset paging is kept for older clients only
+            return query.order_by(models.Note.id).offset(skip).limit(limit).all()
+
+        notes, next_cursor = paginate(query, models.Note.id, cursor, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return notes
+
+    return notes_cache.respond(request, response, load)
 
 @router.post("/", response_model=schemas.Note)
 def create_note(note: schemas.NoteCreate, db: Session = Depends(get_db)):
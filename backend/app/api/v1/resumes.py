@@ -1,43 +1,138 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional
+from app.core import metrics
+from app.core.bulk import describe_validation_error
+from app.core.config import settings
 from app.schemas.resume import ResumeData
+from app.services.llm.gateway import ApiKeyRequired, ClientDisconnected, LlmTimeout, cancel_on_disconnect
+from app.services.resume.ats_score import latex_to_text, resume_data_to_text, score_resume
+from app.services.resume.batch import BatchRenderer
+from app.services.resume.compiler import CompileQueueFull, LatexCompiler
+from app.services.resume.extraction import ExtractionLimitError, PageExtractor, server_timing
 from app.services.resume.generator import ResumeGenerator
+from app.services.resume.latex_formats import FormatCache
+from app.services.resume.pdf_cache import PdfCache
+from app.services.resume.retention import RetentionSweeper
+from urllib.parse import quote
+import json
 import os
+import re
 import uuid
 
 router = APIRouter()
 generator = ResumeGenerator()
+batch_renderer = BatchRenderer(workers=settings.RESUME_BATCH_WORKERS)
+page_extractor = PageExtractor(
+    workers=settings.IMPORT_EXTRACT_WORKERS,
+    max_bytes=settings.IMPORT_MAX_BYTES,
+    max_pages=settings.IMPORT_MAX_PAGES,
+)
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "generated_resumes")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-def cleanup_file(path: str):
-    if os.path.exists(path):
-        os.remove(path)
+pdf_cache = PdfCache(
+    os.path.join(OUTPUT_DIR, "pdf_cache"),
+    max_bytes=settings.LATEX_CACHE_MAX_BYTES,
+    max_entries=settings.LATEX_CACHE_MAX_ENTRIES,
+)
+metrics.register_gauge("latex_cache_bytes", lambda: pdf_cache.total_bytes)
+metrics.register_gauge("latex_cache_entries", lambda: len(pdf_cache))
+
+formats = None
+if settings.LATEX_WARM_FORMATS:
+    formats = FormatCache(
+        os.path.join(OUTPUT_DIR, "latex_formats"),
+        max_formats=settings.LATEX_MAX_FORMATS,
+        timeout=settings.LATEX_COMPILE_TIMEOUT,
+    )
+    metrics.register_gauge("latex_formats", lambda: len(formats))
+
+compiler = LatexCompiler(
+    OUTPUT_DIR,
+    concurrency=settings.LATEX_COMPILE_CONCURRENCY,
+    queue_size=settings.LATEX_COMPILE_QUEUE_SIZE,
+    timeout=settings.LATEX_COMPILE_TIMEOUT,
+    job_ttl=settings.LATEX_JOB_TTL,
+    cache=pdf_cache,
+    formats=formats,
+)
+
+# Everything else in OUTPUT_DIR is disposable; the saved resume, the
+# self-bounded PDF cache and the preamble formats are not
+retention = RetentionSweeper(
+    OUTPUT_DIR,
+    max_age=settings.RETENTION_MAX_AGE,
+    max_bytes=settings.RETENTION_MAX_BYTES,
+    grace=settings.RETENTION_GRACE,
+    protected=["current_resume.json", "pdf_cache", "latex_formats"],
+    in_use=compiler.active_dirs,
+)
+metrics.register_gauge("generated_resumes_bytes", lambda: retention.total_bytes)
+metrics.register_gauge("generated_resumes_entries", lambda: retention.total_entries)
+
+DOCX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+def attachment_headers(filename: str) -> dict:
+    # Same Content-Disposition FileResponse builds, for non-ASCII names too
+    quoted = quote(filename)
+    if quoted != filename:
+        return {"Content-Disposition": f"attachment; filename*=utf-8''{quoted}"}
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
 
 @router.post("/generate")
-def generate_resume(data: ResumeData, background_tasks: BackgroundTasks):
+def generate_resume(data: ResumeData, persist: bool = False):
+    download_name = f"{data.name.replace(' ', '_')}_Resume.docx"
     try:
-        filename = f"resume_{uuid.uuid4()}.docx"
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        
         # Convert Pydantic model to dict
         resume_dict = data.dict()
-        
+
+        if not persist:
+            # Rendered in memory; nothing touches the disk
+            buffer = generator.render(resume_dict)
+            return Response(buffer.getvalue(), media_type=DOCX_MEDIA_TYPE, headers=attachment_headers(download_name))
+
+        filename = f"resume_{uuid.uuid4()}.docx"
+        filepath = os.path.join(OUTPUT_DIR, filename)
         generator.generate(resume_dict, filepath)
-        
+
         if not os.path.exists(filepath):
             raise HTTPException(status_code=500, detail="Failed to generate resume file")
-            
-        # Schedule file deletion after sending (optional, to keep server clean)
-        # background_tasks.add_task(cleanup_file, filepath)
-        
-        return FileResponse(filepath, filename=f"{data.name.replace(' ', '_')}_Resume.docx", media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
-        
+
+        # Kept on disk until the retention sweep ages it out
+        return FileResponse(filepath, filename=download_name, media_type=DOCX_MEDIA_TYPE)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/batch")
+async def generate_resume_batch(payloads: List[Dict[str, Any]]):
+    # Streams a ZIP as resumes finish; manifest.json at the end lists every
+    # item with its file or the reason it failed
+    if len(payloads) > settings.RESUME_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.RESUME_BATCH_MAX_ITEMS} resumes per batch")
+
+    items, names, errors = [], [], []
+    for payload in payloads:
+        try:
+            data = ResumeData(**payload)
+        except ValidationError as e:
+            items.append(None)
+            names.append(str(payload.get("name") or ""))
+            errors.append(describe_validation_error(e))
+            continue
+        items.append(data.dict())
+        names.append(data.name)
+        errors.append(None)
+
+    return StreamingResponse(
+        batch_renderer.stream_zip(items, names, errors),
+        media_type="application/zip",
+        headers=attachment_headers("resumes.zip"),
+    )
+
 @router.post("/save")
 async def save_resume_data(data: ResumeData):
     try:
@@ -67,37 +162,52 @@ async def load_resume_data():
             return FileResponse(filepath, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+def tailor_inputs(request: dict):
+    """Return ``(resume_text, job_description, api_key)`` or raise 400."""
+    api_key = request.get('api_key')
+    resume_text = request.get('resume_text')
+    job_description = request.get('job_description')
+
+    if not resume_text or not job_description:
+        raise HTTPException(status_code=400, detail="Missing Resume Data or Job Description")
+
+    # Temporary: use server-side key if client doesn't provide one (for testing)
+    # In prod, user should provide key
+    if not api_key:
+         if not os.getenv("GEMINI_API_KEY"):
+            raise HTTPException(status_code=400, detail="Missing API Key")
+         api_key = os.getenv("GEMINI_API_KEY")
+    return resume_text, job_description, api_key
+
+def gemini_error(e: Exception) -> HTTPException:
+    if isinstance(e, LlmTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    # Check if it's a Google API error
+    error_str = str(e)
+    if "403" in error_str and "Generative Language API" in error_str:
+         return HTTPException(
+            status_code=403, 
+            detail="Google Generative Language API is disabled. Please enable it in your Google Cloud Console."
+        )
+    if "429" in error_str:
+         return HTTPException(
+            status_code=429,
+            detail="Too many requests. Please try again later."
+        )
+    if "400" in error_str:
+         return HTTPException(status_code=400, detail=f"Bad Request: {error_str}")
+    return HTTPException(status_code=500, detail=f"Internal Server Error: {error_str}")
+
 @router.post("/tailor")
-def tailor_resume(request: dict):
+async def tailor_resume(request: dict, http_request: Request):
     # Expects {'resume_text': str, 'job_description': str, 'api_key': str}
     try:
-        api_key = request.get('api_key')
-        resume_text = request.get('resume_text')
-        job_description = request.get('job_description')
-
-        if not api_key:
-             # Fallback to env var or error
-             # For now, require it from client for privacy/demo purposes
-             pass
-
-        if not resume_text or not job_description:
-            raise HTTPException(status_code=400, detail="Missing Resume Data or Job Description")
-
-        # Temporary: use server-side key if client doesn't provide one (for testing)
-        # In prod, user should provide key
-        if not api_key:
-             # Try to get from settings or env
-             # For this demo, we might need to handle this. 
-             # Let's assume the frontend sends it or we use a default if configured.
-             # raising error for now if missing
-             if not os.getenv("GEMINI_API_KEY"):
-                raise HTTPException(status_code=400, detail="Missing API Key")
-             api_key = os.getenv("GEMINI_API_KEY")
+        resume_text, job_description, api_key = tailor_inputs(request)
 
         from app.services.resume.ai_tailor import AITailor
         tailor = AITailor(api_key)
         # tailor_resume now returns a dict with latex_code and explanation
-        result = tailor.tailor_resume(resume_text, job_description)
+        result = await cancel_on_disconnect(http_request, tailor.tailor_resume(resume_text, job_description))
         
         return {
             "tailored_resume": result.get("latex_code", ""),
@@ -106,109 +216,162 @@ def tailor_resume(request: dict):
 
     except HTTPException as he:
         raise he
+    except ClientDisconnected:
+        # Nobody is listening; the status only shows up in access logs
+        return Response(status_code=499)
     except Exception as e:
-        # Check if it's a Google API error
-        error_str = str(e)
-        if "403" in error_str and "Generative Language API" in error_str:
-             raise HTTPException(
-                status_code=403, 
-                detail="Google Generative Language API is disabled. Please enable it in your Google Cloud Console."
-            )
-        if "429" in error_str:
-             raise HTTPException(
-                status_code=429,
-                detail="Too many requests. Please try again later."
-            )
-        if "400" in error_str:
-             raise HTTPException(status_code=400, detail=f"Bad Request: {error_str}")
-
         print(f"Tailor Error: {e}")
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {error_str}")
+        raise gemini_error(e)
 
-@router.post("/import")
-async def import_resume(file: UploadFile, api_key: str, format: str = "json"):
-    try:
-        from app.services.resume.parser import ResumeParser
-        parser = ResumeParser(api_key)
-        parsed_data = await parser.parse_file(file)
-        
-        if format == "latex":
-             # Load Jake Ryan template
-            template_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates", "jake_ryan.tex")
-            if not os.path.exists(template_path):
-                 # Fallback if template is missing (should verify this path)
-                 raise HTTPException(status_code=500, detail="Template file not found")
-            
-            with open(template_path, "r") as f:
-                template_content = f.read()
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/tailor/stream")
+async def tailor_resume_stream(request: dict):
+    """Same input as /tailor, answered as Server-Sent Events.
 
-            from app.services.resume.ai_tailor import AITailor
-            tailor = AITailor(api_key)
-            latex_code = tailor.convert_json_to_latex(parsed_data, template_content)
-            return {"latex": latex_code, "json": parsed_data}
+    ``token`` events carry model text as it is generated (progress only);
+    the stream ends with one ``result`` event holding the parsed
+    ``latex_code`` and ``explanation``, or one ``error`` event.
+    """
+    resume_text, job_description, api_key = tailor_inputs(request)
+    from app.services.resume.ai_tailor import AITailor
+    tailor = AITailor(api_key)
 
-        return parsed_data
+    # StreamingResponse cancels this when the client disconnects, which
+    # closes the model stream and frees its gateway slot
+    async def events():
+        try:
+            async for kind, payload in tailor.stream_tailor(resume_text, job_description):
+                if kind == "token":
+                    yield sse_event("token", {"text": payload})
+                else:
+                    yield sse_event("result", {
+                        "latex_code": payload["latex_code"],
+                        "explanation": payload.get("explanation", "I've tailored your resume."),
+                    })
+        except ValueError as e:
+            print(f"Tailor Stream Error: {e}")
+            yield sse_event("error", {"status": 502, "detail": "The model's answer could not be parsed. Please try again."})
+        except Exception as e:
+            print(f"Tailor Stream Error: {e}")
+            error = gemini_error(e)
+            yield sse_event("error", {"status": error.status_code, "detail": error.detail})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/import")
+async def import_resume(
+    file: UploadFile, http_request: Request, response: Response, api_key: Optional[str] = None, format: str = "json",
+):
+    # The key is optional: most resumes are parsed without the model
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    try:
+        return await cancel_on_disconnect(http_request, _import_resume(file, api_key, format, response))
+    except ClientDisconnected:
+        return Response(status_code=499)
+    except ApiKeyRequired as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except LlmTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except HTTPException as he:
+        raise he
     except Exception as e:
         print(f"Import Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _import_resume(file: UploadFile, api_key: Optional[str], format: str, response: Response):
+    from app.services.resume.parser import ResumeParser
+    parser = ResumeParser(api_key, extractor=page_extractor)
+    parsed_data = await parser.parse_file(file)
+    # Spool, per-page extraction, heuristic and model time, for the browser's network panel
+    response.headers["Server-Timing"] = server_timing(parser.timings)
+    
+    if format == "latex":
+         # Load Jake Ryan template
+        template_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates", "jake_ryan.tex")
+        if not os.path.exists(template_path):
+             # Fallback if template is missing (should verify this path)
+             raise HTTPException(status_code=500, detail="Template file not found")
+        
+        with open(template_path, "r") as f:
+            template_content = f.read()
+
+        from app.services.resume.ai_tailor import AITailor
+        tailor = AITailor(api_key)
+        latex_code = await tailor.convert_json_to_latex(parsed_data, template_content)
+        return {"latex": latex_code, "json": parsed_data}
+
+    return parsed_data
+
+class ScoreRequest(BaseModel):
+    job_description: str
+    # Either the editor's LaTeX (or plain text) or the form's resume data
+    resume_text: Optional[str] = None
+    resume: Optional[ResumeData] = None
+
+@router.post("/score")
+def score_against_job(request: ScoreRequest):
+    # Local keyword matching, no model call: cheap enough to run as the user types
+    if not request.job_description.strip() or (request.resume_text is None and request.resume is None):
+        raise HTTPException(status_code=400, detail="Missing Resume Data or Job Description")
+    if request.resume_text is not None:
+        text = request.resume_text
+        if "\\begin{document}" in text or re.search(r"\\[A-Za-z]+\{", text):
+            text = latex_to_text(text)
+    else:
+        text = resume_data_to_text(request.resume.model_dump())
+    return score_resume(text, request.job_description)
+
 class CompileRequest(BaseModel):
     latex_code: str
 
 @router.post("/compile")
 async def compile_latex(request: CompileRequest):
+    # Waits for a queued compile; pdflatex runs as a subprocess off the event loop
     try:
-        # Create a unique job ID
-        job_id = str(uuid.uuid4())
-        job_dir = os.path.join(OUTPUT_DIR, job_id)
-        os.makedirs(job_dir, exist_ok=True)
-        
-        tex_file = os.path.join(job_dir, "resume.tex")
-        pdf_file = os.path.join(job_dir, "resume.pdf")
-        
-        # Write LaTeX code to file
-        with open(tex_file, "w") as f:
-            f.write(request.latex_code)
-            
-        # Run pdflatex
-        # -interaction=nonstopmode prevents hanging on errors
-        # -output-directory ensures output goes to the right place
-        try:
-            import subprocess
-            process = subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", "-output-directory", job_dir, tex_file],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                timeout=30 # Timeout after 30 seconds
-            )
-            
-            if process.returncode != 0:
-                # Capture log if available
-                log_file = os.path.join(job_dir, "resume.log")
-                error_log = "PDF compilation failed.\n"
-                if os.path.exists(log_file):
-                    with open(log_file, "r", errors='ignore') as f:
-                        # Get last 20 lines of log
-                        lines = f.readlines()
-                        error_log += "".join(lines[-20:])
-                else:
-                    error_log += process.stdout.decode('utf-8', errors='ignore')
-                    
-                raise Exception(error_log)
-                
-        except FileNotFoundError:
-             raise HTTPException(status_code=500, detail="pdflatex command not found. Please install TeX Live (sudo apt-get install texlive-latex-base).")
-        except subprocess.TimeoutExpired:
-             raise HTTPException(status_code=500, detail="Compilation timed out.")
-
-        if not os.path.exists(pdf_file):
-             raise HTTPException(status_code=500, detail="PDF file was not generated.")
-
-        return FileResponse(pdf_file, filename="resume.pdf", media_type="application/pdf")
-        
-    except HTTPException as he:
-        raise he
-    except Exception as e:
-        # Clean up on error (optional)
-        # shutil.rmtree(job_dir, ignore_errors=True)
-        raise HTTPException(status_code=500, detail=str(e))
+        job = await compiler.compile(request.latex_code)
+    except CompileQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    if job.status != "done":
+        raise HTTPException(status_code=500, detail=job.error)
+    return _pdf_response(job)
+
+@router.post("/compile/jobs", status_code=202)
+async def submit_compile_job(request: CompileRequest):
+    try:
+        job = await compiler.submit(request.latex_code)
+    except CompileQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return job.to_dict()
+
+@router.get("/compile/jobs/{job_id}")
+async def get_compile_job(job_id: str):
+    job = compiler.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Compile job not found")
+    return job.to_dict()
+
+@router.get("/compile/jobs/{job_id}/pdf")
+async def get_compile_job_pdf(job_id: str):
+    job = compiler.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Compile job not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Compile job is {job.status}")
+    return _pdf_response(job)
+
+def _pdf_response(job):
+    pdf = compiler.read_pdf(job)
+    if pdf is None:
+        raise HTTPException(status_code=410, detail="The compiled PDF has expired. Please compile again.")
+    return Response(pdf, media_type="application/pdf", headers={"Content-Disposition": 'attachment; filename="resume.pdf"'})
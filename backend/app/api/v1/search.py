@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from app.core import database
+from app.core.config import settings
+from app.schemas.search import SearchResult
+import html
+import re
+
+router = APIRouter()
+
+def get_db():
+    db = database.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+# FTS5 wraps matches in these control characters; the stored text is
+# HTML-escaped before they become <mark> tags, so only our markup survives
+_OPEN_SENTINEL = "\x01"
+_CLOSE_SENTINEL = "\x02"
+
+def render_highlight(marked: Optional[str]) -> str:
+    if not marked:
+        return ""
+    return html.escape(marked).replace(_OPEN_SENTINEL, HIGHLIGHT_OPEN).replace(_CLOSE_SENTINEL, HIGHLIGHT_CLOSE)
+
+def build_match_query(q: str) -> Optional[str]:
+    # Quote every word so user input can never be parsed as FTS5 syntax.
+    # Only the last word is prefix-matched (it is the one still being typed);
+    # expanding every word multiplies the postings FTS5 has to merge. A single
+    # letter isn't expanded: no prefix index covers it, so it would merge the
+    # postings of every word starting with it.
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    last = f'"{terms[-1]}"*' if len(terms[-1]) > 1 else f'"{terms[-1]}"'
+    return " ".join([f'"{term}"' for term in terms[:-1]] + [last])
+
+def _with_kinds(statement, kind):
+    return statement.bindparams(bindparam("kinds", expanding=True)) if kind else statement
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1),
+    kind: Optional[List[Literal["note", "company", "job"]]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    match = build_match_query(q)
+    if not match:
+        return []
+
+    kind_filter = "AND kind IN :kinds" if kind else ""
+    params = {"match": match, "limit": limit, "skip": settings.SEARCH_RANK_MAX_MATCHES - 1}
+    if kind:
+        params["kinds"] = kind
+    # bm25 scores every match before ORDER BY rank can pick the top rows. For
+    # a term in thousands of rows only the newest matches are ranked: find
+    # the rowid of the last one (cheap, the doclist is in rowid order) and
+    # rank from there on.
+    floor = db.execute(_with_kinds(text(f"""
+        SELECT rowid FROM search_index
+        WHERE search_index MATCH :match {kind_filter}
+        ORDER BY rowid DESC
+        LIMIT 1 OFFSET :skip
+    """), kind), params).scalar()
+    params["floor"] = floor if floor is not None else 0
+
+    statement = _with_kinds(text(f"""
+        SELECT kind, ref_id AS id,
+               highlight(search_index, 2, char(1), char(2)) AS title,
+               snippet(search_index, 3, char(1), char(2), '…', 16) AS snippet,
+               rank AS score
+        FROM search_index
+        WHERE search_index MATCH :match AND rowid >= :floor {kind_filter}
+        ORDER BY rank
+        LIMIT :limit
+    """), kind)
+    rows = db.execute(statement, params).mappings().all()
+    return [
+        SearchResult(
+            kind=r["kind"], id=r["id"], title=render_highlight(r["title"]),
+            snippet=render_highlight(r["snippet"]), score=-r["score"],
+        )
+        for r in rows
+    ]
@@ -0,0 +1,233 @@
+from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Literal
+from app.core import database
+from app.core.bulk import describe_validation_error
+from app.models import job_tracker as models
+from app.schemas import job_tracker as schemas
+from datetime import date
+import codecs
+import csv
+import io
+import json
+
+router = APIRouter()
+
+TABLES = {
+    "jobs": (models.Job, schemas.JobCreate),
+    "contacts": (models.Contact, schemas.ContactCreate),
+    "companies": (models.Company, schemas.CompanyCreate),
+    "notes": (models.Note, schemas.NoteCreate),
+}
+
+# Rows per yielded chunk on export and per transaction on import
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _lookup(table: str):
+    if table not in TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+    return TABLES[table]
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _iter_rows(db, model):
+    columns = [c.key for c in model.__table__.columns]
+    result = db.execute(
+        select(model.__table__).order_by(model.__table__.c.id),
+        execution_options={"yield_per": CHUNK_SIZE},
+    )
+    for row in result:
+        yield dict(zip(columns, row))
+
+def _iter_contacts_with_tasks(db):
+    # Merge-join two ordered cursors so a contact's tasks are attached
+    # without loading either table into memory.
+    task_columns = [c.key for c in models.Task.__table__.columns]
+    tasks = db.execute(
+        select(models.Task.__table__).order_by(models.Task.contact_id, models.Task.id),
+        execution_options={"yield_per": CHUNK_SIZE},
+    )
+    pending = next(tasks, None)
+    for contact in _iter_rows(db, models.Contact):
+        contact["tasks"] = []
+        while pending is not None and (pending.contact_id is None or pending.contact_id < contact["id"]):
+            pending = next(tasks, None)
+        while pending is not None and pending.contact_id == contact["id"]:
+            contact["tasks"].append(dict(zip(task_columns, pending)))
+            pending = next(tasks, None)
+        yield contact
+
+def _export(table: str, format: str):
+    # The generator outlives the request, so it owns its session
+    db = database.SessionLocal()
+    try:
+        model, _ = TABLES[table]
+        rows = _iter_contacts_with_tasks(db) if table == "contacts" else _iter_rows(db, model)
+        buffer = io.StringIO()
+        writer = None
+        count = 0
+        for row in rows:
+            if format == "ndjson":
+                buffer.write(json.dumps(row, default=_json_default))
+                buffer.write("\n")
+            else:
+                if "tasks" in row:
+                    row["tasks"] = json.dumps(row["tasks"], default=_json_default)
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=list(row.keys()))
+                    writer.writeheader()
+                writer.writerow(row)
+            count += 1
+            if count % CHUNK_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if format == "csv" and writer is None:
+            # Empty table: still emit a header row
+            columns = [c.key for c in TABLES[table][0].__table__.columns]
+            csv.writer(buffer).writerow(columns + (["tasks"] if table == "contacts" else []))
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+@router.get("/export/{table}")
+def export_table(table: str, format: Literal["ndjson", "csv"] = "ndjson"):
+    _lookup(table)
+    return StreamingResponse(
+        _export(table, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
+
+def _parse_lines(upload: UploadFile, format: str):
+    """Yield ``(line, row, error)`` while decoding the spooled upload incrementally."""
+    lines = codecs.iterdecode(upload.file, "utf-8-sig")
+    if format == "ndjson":
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield number, None, "Expected a JSON object"
+                continue
+            yield number, row, None
+    else:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # CSV has no null, so empty cells mean "not set"
+            row = {k: (v if v != "" else None) for k, v in row.items()}
+            if row.get("tasks"):
+                try:
+                    row["tasks"] = json.loads(row["tasks"])
+                except ValueError as e:
+                    yield reader.line_num, None, f"Invalid tasks column: {e}"
+                    continue
+            yield reader.line_num, row, None
+
+def _upsert(db, model, rows):
+    if not rows:
+        return
+    # Rows carrying an id (e.g. a restored backup) overwrite that id;
+    # the rest are plain inserts. Each group is one executemany.
+    with_id = [r for r in rows if r.get("id") is not None]
+    without_id = [{k: v for k, v in r.items() if k != "id"} for r in rows if r.get("id") is None]
+    if with_id:
+        statement = sqlite_insert(model)
+        columns = [k for k in with_id[0] if k != "id"]
+        statement = statement.on_conflict_do_update(
+            index_elements=["id"], set_={c: statement.excluded[c] for c in columns}
+        )
+        db.execute(statement, with_id)
+    if without_id:
+        db.execute(insert(model), without_id)
+
+def _write_chunk(db, table, chunk):
+    model, _ = TABLES[table]
+    if table != "contacts":
+        _upsert(db, model, [values for _, values, _ in chunk])
+        return
+
+    # Tasks need their contact's id: rows that carry one (restored backups)
+    # are upserted together, the rest are inserted one by one.
+    _upsert(db, model, [values for _, values, _ in chunk if values.get("id") is not None])
+    tasks = []
+    for _, values, contact_tasks in chunk:
+        if values.get("id") is None:
+            new_values = {k: v for k, v in values.items() if k != "id"}
+            values["id"] = db.execute(insert(model).values(**new_values)).inserted_primary_key[0]
+        for task in contact_tasks or []:
+            task_values = schemas.TaskCreate(**task).dict()
+            task_values["contact_id"] = values["id"]
+            task_values["id"] = task.get("id")
+            tasks.append(task_values)
+    _upsert(db, models.Task, tasks)
+
+@router.post("/import/{table}")
+def import_table(table: str, file: UploadFile, format: Literal["ndjson", "csv"] = "ndjson"):
+    _, schema = _lookup(table)
+    imported = 0
+    errors = []
+
+    def record_error(line, message):
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "error": message})
+
+    db = database.SessionLocal()
+    try:
+        chunk = []
+
+        def flush():
+            nonlocal imported
+            if not chunk:
+                return
+            try:
+                _write_chunk(db, table, chunk)
+                db.commit()
+                imported += len(chunk)
+            except (SQLAlchemyError, ValidationError, TypeError) as e:
+                db.rollback()
+                message = describe_validation_error(e) if isinstance(e, ValidationError) else str(e.__cause__ or e).splitlines()[0]
+                record_error(f"{chunk[0][0]}-{chunk[-1][0]}", message)
+            chunk.clear()
+
+        try:
+            for line, row, error in _parse_lines(file, format):
+                if error:
+                    record_error(line, error)
+                    continue
+                try:
+                    row_id = row.pop("id", None)
+                    contact_tasks = row.pop("tasks", None)
+                    values = schema(**row).dict()
+                    values["id"] = int(row_id) if row_id is not None else None
+                except ValidationError as e:
+                    record_error(line, describe_validation_error(e))
+                    continue
+                except (ValueError, TypeError):
+                    record_error(line, f"Invalid id: {row_id!r}")
+                    continue
+                chunk.append((line, values, contact_tasks))
+                if len(chunk) >= CHUNK_SIZE:
+                    flush()
+        except (UnicodeDecodeError, csv.Error) as e:
+            record_error(None, f"Could not parse upload: {e}")
+        # Rows parsed before a fatal decode error are still written
+        flush()
+    finally:
+        db.close()
+
+    return {"imported": imported, "errors": errors}
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Type
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.schemas.job_tracker import BulkResult
+
+def describe_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+    )
+
+def bulk_create(db: Session, model, schema: Type[BaseModel], rows: List[Dict[str, Any]]) -> List[BulkResult]:
+    """Validate each row with ``schema`` and insert the valid ones in one executemany.
+
+    Invalid rows are reported individually and don't stop the rest of the batch.
+    The caller commits.
+    """
+    results: List[Optional[BulkResult]] = [None] * len(rows)
+    valid, values = [], []
+    for index, row in enumerate(rows):
+        try:
+            values.append(schema(**row).dict())
+            valid.append(index)
+        except ValidationError as e:
+            results[index] = BulkResult(index=index, ok=False, error=describe_validation_error(e))
+
+    if values:
+        # RETURNING in parameter order pairs each new id with its input row
+        ids = db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), values).all()
+        for index, new_id in zip(valid, ids):
+            results[index] = BulkResult(index=index, ok=True, id=new_id)
+    return results
+
+def bulk_patch(
+    db: Session,
+    model,
+    patch_schema: Type[BaseModel],
+    create_schema: Type[BaseModel],
+    rows: List[Dict[str, Any]],
+) -> List[BulkResult]:
+    """Apply partial updates keyed on ``id``.
+
+    Only the fields present in a row are written. Rows with the same set of
+    fields (e.g. 50 jobs moved to "Rejected") go out as a single executemany.
+    """
+    required = {name for name, field in create_schema.model_fields.items() if field.is_required()}
+    results: List[Optional[BulkResult]] = [None] * len(rows)
+    patches = []
+    for index, row in enumerate(rows):
+        try:
+            patch = patch_schema(**row)
+        except ValidationError as e:
+            results[index] = BulkResult(index=index, ok=False, error=describe_validation_error(e))
+            continue
+        changes = patch.dict(exclude_unset=True)
+        nulled = sorted(k for k in required if k in changes and changes[k] is None)
+        if nulled:
+            results[index] = BulkResult(index=index, ok=False, id=patch.id, error=f"{', '.join(nulled)} cannot be null")
+            continue
+        patches.append((index, changes))
+
+    existing = _existing_ids(db, model, (changes["id"] for _, changes in patches))
+    updates = []
+    for index, changes in patches:
+        if changes["id"] not in existing:
+            results[index] = BulkResult(index=index, ok=False, id=changes["id"], error="not found")
+            continue
+        results[index] = BulkResult(index=index, ok=True, id=changes["id"])
+        if len(changes) > 1:
+            updates.append(changes)
+
+    if updates:
+        # ORM bulk UPDATE by primary key; groups rows by their key set
+        db.execute(update(model), updates)
+    return results
+
+def bulk_delete(
+    db: Session,
+    model,
+    ids: List[int],
+    before_delete: Optional[Callable[[Set[int]], None]] = None,
+) -> List[BulkResult]:
+    """Delete rows by id in one statement.
+
+    ``before_delete`` receives the ids that exist, so callers can clear rows
+    that the ORM cascade would otherwise have handled.
+    """
+    existing = _existing_ids(db, model, ids)
+    if existing:
+        if before_delete:
+            before_delete(existing)
+        db.execute(
+            delete(model).where(model.id.in_(existing)),
+            execution_options={"synchronize_session": False},
+        )
+    return [
+        BulkResult(index=index, ok=row_id in existing, id=row_id, error=None if row_id in existing else "not found")
+        for index, row_id in enumerate(ids)
+    ]
+
+def _existing_ids(db: Session, model, ids: Iterable[int]) -> Set[int]:
+    ids = set(ids)
+    if not ids:
+        return set()
+    return set(db.scalars(select(model.id).where(model.id.in_(ids))))
@@ -7,9 +7,87 @@ class Settings:
     BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
     DATABASE_PATH: str = os.path.join(BASE_DIR, "database", "career.db")
 
+    # Relationship loading strategies ("select", "selectin", "joined") for the
+    # nested Job -> Contact -> Task responses. "select" is plain lazy loading.
+    JOB_CONTACT_LOADING: str = os.getenv("JOB_CONTACT_LOADING", "joined")
+    CONTACT_TASKS_LOADING: str = os.getenv("CONTACT_TASKS_LOADING", "selectin")
+    CONTACT_REFERRALS_LOADING: str = os.getenv("CONTACT_REFERRALS_LOADING", "select")
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+    # Connection pool. Handlers beyond DB_POOL_SIZE wait for a connection
+    # rather than for SQLite's locks; with AnyIO's 40 handler threads that
+    # kept p99 far lower (benchmarks/db_concurrency.py: read p99 ~26 ms at
+    # 4 connections vs ~500 ms at 40)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "4"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "0"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+    # LaTeX compilation: concurrent pdflatex processes, queued jobs beyond
+    # that, per-compile timeout and how long finished jobs stay pollable
+    LATEX_COMPILE_CONCURRENCY: int = int(os.getenv("LATEX_COMPILE_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+    LATEX_COMPILE_QUEUE_SIZE: int = int(os.getenv("LATEX_COMPILE_QUEUE_SIZE", "32"))
+    LATEX_COMPILE_TIMEOUT: int = int(os.getenv("LATEX_COMPILE_TIMEOUT", "30"))
+    LATEX_JOB_TTL: int = int(os.getenv("LATEX_JOB_TTL", "3600"))
+    # Compiled PDFs are cached by content hash, evicted least recently used first
+    LATEX_CACHE_MAX_BYTES: int = int(os.getenv("LATEX_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    LATEX_CACHE_MAX_ENTRIES: int = int(os.getenv("LATEX_CACHE_MAX_ENTRIES", "1000"))
+    # Warm compiles from preambles dumped with mylatexformat (needs the
+    # mylatexformat package from texlive-latex-extra; falls back to cold)
+    LATEX_WARM_FORMATS: bool = os.getenv("LATEX_WARM_FORMATS", "true").lower() == "true"
+    LATEX_MAX_FORMATS: int = int(os.getenv("LATEX_MAX_FORMATS", "8"))
+    # Imported resumes are typeset locally; ask Gemini only if that fails
+    LATEX_RENDER_LLM_FALLBACK: bool = os.getenv("LATEX_RENDER_LLM_FALLBACK", "true").lower() == "true"
+    # generated_resumes/ retention: sweep interval, maximum age and total size
+    # (the PDF cache has its own bounds), and a grace period for fresh files
+    RETENTION_INTERVAL: int = int(os.getenv("RETENTION_INTERVAL", "600"))
+    RETENTION_MAX_AGE: int = int(os.getenv("RETENTION_MAX_AGE", str(24 * 3600)))
+    RETENTION_MAX_BYTES: int = int(os.getenv("RETENTION_MAX_BYTES", str(512 * 1024 * 1024)))
+    RETENTION_GRACE: int = int(os.getenv("RETENTION_GRACE", "300"))
+    # Batch DOCX generation: worker processes and resumes per request
+    RESUME_BATCH_WORKERS: int = int(os.getenv("RESUME_BATCH_WORKERS", str(os.cpu_count() or 1)))
+    RESUME_BATCH_MAX_ITEMS: int = int(os.getenv("RESUME_BATCH_MAX_ITEMS", "500"))
+    # Resume import: upload limits and processes extracting PDF pages
+    IMPORT_MAX_BYTES: int = int(os.getenv("IMPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+    IMPORT_MAX_PAGES: int = int(os.getenv("IMPORT_MAX_PAGES", "20"))
+    IMPORT_EXTRACT_WORKERS: int = int(os.getenv("IMPORT_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Imports the rule-based parser scores at least this (0..1) skip the model
+    IMPORT_HEURISTIC_MIN_CONFIDENCE: float = float(os.getenv("IMPORT_HEURISTIC_MIN_CONFIDENCE", "0.8"))
+    # Search ranks at most this many matches, the most recent ones, so a term
+    # found in nearly every row isn't bm25-scored across the whole index
+    SEARCH_RANK_MAX_MATCHES: int = int(os.getenv("SEARCH_RANK_MAX_MATCHES", "2000"))
+    # Serialized tracker list pages kept for conditional GETs
+    HTTP_CACHE_MAX_ENTRIES: int = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+    # Gemini response cache: entries expire after LLM_CACHE_TTL seconds and the
+    # least recently used go first once either bound is exceeded
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+    LLM_CACHE_MAX_BYTES: int = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Gemini clients, one per API key: dropped after LLM_CLIENT_IDLE_TTL seconds
+    # unused, least recently used first beyond LLM_CLIENT_MAX_KEYS
+    LLM_CLIENT_IDLE_TTL: int = int(os.getenv("LLM_CLIENT_IDLE_TTL", "1800"))
+    LLM_CLIENT_MAX_KEYS: int = int(os.getenv("LLM_CLIENT_MAX_KEYS", "64"))
+    # Gemini calls in flight at once, and seconds each may take including
+    # the wait for a free slot
+    LLM_CONCURRENCY: int = int(os.getenv("LLM_CONCURRENCY", "4"))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "90"))
+    # Timed-out Gemini calls whose threads may keep running in the background
+    # before further timeouts hold on to their slot until the thread returns
+    LLM_MAX_ABANDONED: int = int(os.getenv("LLM_MAX_ABANDONED", "4"))
 
     @property
     def DATABASE_URL(self):
         return f"sqlite:///{self.DATABASE_PATH}"
 
+    @property
+    def LLM_CACHE_PATH(self):
+        # Kept beside career.db unless overridden
+        return os.getenv("LLM_CACHE_PATH") or os.path.join(os.path.dirname(self.DATABASE_PATH), "llm_cache.db")
+
 settings = Settings()
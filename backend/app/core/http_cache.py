@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Callable, Dict, FrozenSet, Iterable
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+# Conditional GET for the tracker collections. Every table has a version
+# that is bumped when a transaction writing to it commits; a collection's
+# ETag is built from the versions of the tables its payload is made of, so
+# an unchanged collection is answered with 304 (or a cached body) without
+# opening a database connection.
+#
+# Versions live in this process, so run a single worker; the boot id keeps
+# ETags from before a restart from ever matching.
+
+_BOOT_ID = uuid.uuid4().hex[:8]
+_CHANGED_KEY = "http_cache_changed_tables"
+
+_lock = threading.Lock()
+_versions: Dict[str, int] = {}
+_modified: Dict[str, float] = {}
+# (path, query) -> (etag, tables, body, headers), least recently used first
+_pages: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def bump(tables: Iterable[str]):
+    tables = set(tables)
+    if not tables:
+        return
+    now = time.time()
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+            _modified[table] = now
+        for key in [key for key, entry in _pages.items() if entry[1] & tables]:
+            del _pages[key]
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_flush(session, flush_context):
+    changed = session.info.setdefault(_CHANGED_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        changed.add(obj.__table__.name)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _track_execute(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        changed = orm_execute_state.session.info.setdefault(_CHANGED_KEY, set())
+        changed.add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish(session):
+    bump(session.info.pop(_CHANGED_KEY, ()))
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard(session, previous_transaction):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class CollectionCache:
+    """Serves a list endpoint from the page cache when its tables are unchanged."""
+
+    def __init__(self, tables: Iterable[str], response_model):
+        self.tables: FrozenSet[str] = frozenset(tables)
+        self.adapter = TypeAdapter(response_model)
+
+    def _state(self):
+        with _lock:
+            versions = ".".join(str(_versions.get(table, 0)) for table in sorted(self.tables))
+            modified = max((_modified.get(table, 0.0) for table in self.tables), default=0.0)
+        return f'"{_BOOT_ID}-{versions}"', modified
+
+    def respond(self, request: Request, response: Response, load: Callable[[], list]) -> Response:
+        """Return 304, a cached page, or the page built by ``load``.
+
+        ``load`` runs the query and may set headers on ``response``; those
+        are cached together with the body.
+        """
+        # Read before loading, so a stored body is never older than its tag
+        etag, modified = self._state()
+        validators = {"ETag": etag, "Cache-Control": "no-cache"}
+        if modified:
+            validators["Last-Modified"] = formatdate(modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            metrics.inc("http_cache_not_modified")
+            return Response(status_code=304, headers=validators)
+
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        with _lock:
+            entry = _pages.get(key)
+            if entry is not None and entry[0] == etag:
+                _pages.move_to_end(key)
+        if entry is not None and entry[0] == etag:
+            metrics.inc("http_cache_hits")
+            return Response(entry[2], media_type="application/json", headers={**entry[3], **validators})
+
+        metrics.inc("http_cache_misses")
+        rows = load()
+        body = self.adapter.dump_json(self.adapter.validate_python(rows, from_attributes=True))
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+        if self._state()[0] == etag:
+            # Not stored if a write landed while loading; it would never match
+            with _lock:
+                _pages[key] = (etag, self.tables, body, headers)
+                _pages.move_to_end(key)
+                while len(_pages) > settings.HTTP_CACHE_MAX_ENTRIES:
+                    _pages.popitem(last=False)
+        return Response(body, media_type="application/json", headers={**headers, **validators})
@@ -0,0 +1,20 @@
+import threading
+from typing import Callable, Dict
+
+# In-process counters and gauges, exposed at /api/v1/metrics
+_lock = threading.Lock()
+_counters: Dict[str, int] = {}
+_gauges: Dict[str, Callable[[], float]] = {}
+
+def inc(name: str, value: int = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def register_gauge(name: str, read: Callable[[], float]):
+    """Register a callable that reports the current value of ``name``."""
+    _gauges[name] = read
+
+def snapshot() -> dict:
+    with _lock:
+        counters = dict(_counters)
+    return {"counters": counters, "gauges": {name: read() for name, read in _gauges.items()}}
@@ -0,0 +1,80 @@
+from sqlalchemy import text
+from app.core.database import Base
+
+# Full-text index over notes, companies and jobs. The rowid packs the source
+# row as id * 3 + kind code so triggers can update entries by rowid instead
+# of scanning the UNINDEXED columns.
+SEARCH_SOURCES = {
+    # kind: (code, table, title column, body column)
+    "note": (0, "notes", "title", "content"),
+    "company": (1, "companies", "name", "notes"),
+    "job": (2, "jobs", "position", "company"),
+}
+
+SEARCH_INDEX_DDL = """
+CREATE VIRTUAL TABLE search_index USING fts5(
+    kind UNINDEXED,
+    ref_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4'
+)
+"""
+
+def _search_triggers(kind, code, table, title, body):
+    """``{name: CREATE TRIGGER statement}`` keeping ``search_index`` in step with ``table``."""
+    insert = (
+        f"INSERT INTO search_index(rowid, kind, ref_id, title, body) "
+        f"VALUES (new.id * 3 + {code}, '{kind}', new.id, new.{title}, new.{body});"
+    )
+    delete = f"DELETE FROM search_index WHERE rowid = old.id * 3 + {code};"
+    return {
+        f"{table}_search_ai": f"AFTER INSERT ON {table} BEGIN {insert} END",
+        f"{table}_search_ad": f"AFTER DELETE ON {table} BEGIN {delete} END",
+        # Only the indexed columns; moving a job to another status leaves the index alone
+        f"{table}_search_au": f"AFTER UPDATE OF {title}, {body} ON {table} BEGIN {delete} {insert} END",
+    }
+
+def _ensure_trigger(conn, name, definition):
+    ddl = f"CREATE TRIGGER {name} {definition}"
+    current = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"), {"name": name}
+    ).scalar()
+    if current == ddl:
+        return
+    if current is not None:
+        # Created by an older version of this migration
+        conn.execute(text(f"DROP TRIGGER {name}"))
+    conn.execute(text(ddl))
+
+def _ensure_search_index(conn):
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+    ).first()
+    if not exists:
+        conn.execute(text(SEARCH_INDEX_DDL))
+        # Titles outweigh bodies; kind and ref_id never contribute to the score
+        conn.execute(text("INSERT INTO search_index(search_index, rank) VALUES ('rank', 'bm25(0.0, 0.0, 10.0, 1.0)')"))
+        for kind, (code, table, title, body) in SEARCH_SOURCES.items():
+            conn.execute(text(
+                f"INSERT INTO search_index(rowid, kind, ref_id, title, body) "
+                f"SELECT id * 3 + {code}, '{kind}', id, {title}, {body} FROM {table}"
+            ))
+    for kind, (code, table, title, body) in SEARCH_SOURCES.items():
+        for name, definition in _search_triggers(kind, code, table, title, body).items():
+            _ensure_trigger(conn, name, definition)
+
+def run_migrations(engine):
+    """Bring an existing career.db up to the current models.
+
+    ``create_all`` only creates missing tables, so indexes added to a model
+    after the database file was first created have to be added here.
+    """
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        _ensure_search_index(conn)
+        # Refresh planner statistics for any index that was just built
+        conn.execute(text("PRAGMA optimize"))
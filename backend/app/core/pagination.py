@@ -0,0 +1,102 @@
+import base64
+import json
+from datetime import date
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values: List[Any], ordering: str) -> str:
+    payload = json.dumps([ordering, *(v.isoformat() if isinstance(v, date) else v for v in values)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: List[Any], ordering: str) -> List[Any]:
+    """Values of ``columns`` stored in ``cursor``.
+
+    A cursor only resumes the ordering it was issued for; one from another
+    sort would seek to a meaningless position, so it is rejected.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != len(columns) + 1:
+            raise ValueError("cursor does not match sort")
+        if payload[0] != ordering:
+            raise ValueError("cursor does not match sort")
+        values = payload[1:]
+        return [
+            date.fromisoformat(v) if v is not None and _is_date(col) else v
+            for col, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _is_date(column) -> bool:
+    try:
+        return column.type.python_type is date
+    except NotImplementedError:
+        return False
+
+
+def _segments(column, id_column, value, last_id, descending: bool):
+    # SQLite sorts NULLs first ascending and last descending. Rather than one
+    # OR'd predicate (which defeats the index), the rows after the cursor are
+    # described as consecutive segments that each seek on the sort index: the
+    # rest of the cursor's own value, then the values past it. (A range on the
+    # column with an id condition OR'd in only seeks to the start of the
+    # value's run, then scans it.)
+    if descending:
+        if value is None:
+            return [and_(column.is_(None), id_column < last_id)]
+        return [and_(column == value, id_column < last_id), column < value, column.is_(None)]
+    if value is None:
+        return [and_(column.is_(None), id_column > last_id), column.isnot(None)]
+    return [and_(column == value, id_column > last_id), column > value]
+
+
+def paginate(
+    query: Query,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    sort_column=None,
+    descending: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """Keyset pagination over ``(sort_column, id)``, or ``id`` alone.
+
+    Returns the page and an opaque cursor for the next one (``None`` on the
+    last page). Fetches one extra row to know whether there is a next page.
+    """
+    columns = [sort_column, id_column] if sort_column is not None else [id_column]
+    order = [c.desc() if descending else c.asc() for c in columns]
+    ordering = f"{columns[0].key}:{'desc' if descending else 'asc'}"
+
+    if not cursor:
+        segments = [None]
+    else:
+        values = decode_cursor(cursor, columns, ordering)
+        if sort_column is not None:
+            segments = _segments(sort_column, id_column, values[0], values[1], descending)
+        else:
+            segments = [id_column < values[0] if descending else id_column > values[0]]
+
+    rows = []
+    for segment in segments:
+        segment_query = query if segment is None else query.filter(segment)
+        rows += segment_query.order_by(*order).limit(limit + 1 - len(rows)).all()
+        if len(rows) > limit:
+            break
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, c.key) for c in columns], ordering)
@@ -1,15 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from app.api.api import api_router
+from app.api.v1.resumes import batch_renderer, page_extractor, retention
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.migrations import run_migrations
+import asyncio
 import os
 
 # Create Database Tables
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Periodic cleanup of generated_resumes/, run in a worker thread
+    sweeper = asyncio.create_task(retention.run_forever(settings.RETENTION_INTERVAL))
+    yield
+    sweeper.cancel()
+    batch_renderer.shutdown()
+    page_extractor.shutdown()
+
+app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION, lifespan=lifespan)
 
 # API Router
 app.include_router(api_router, prefix="/api/v1")
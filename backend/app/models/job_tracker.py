@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, JSON, Index
 from sqlalchemy.orm import relationship as sa_relationship
+from app.core.config import settings
 from app.core.database import Base
 from datetime import date
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Board columns filter on status and sort by date; list paging sorts by (date_applied, id)
+        # or (status, id)
+        Index("ix_jobs_status_date_applied", "status", "date_applied"),
+        Index("ix_jobs_date_applied_id", "date_applied", "id"),
+        Index("ix_jobs_status_id", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     company = Column(String, index=True)
@@ -15,8 +23,8 @@ class Job(Base):
     url = Column(String, nullable=True)
     
     # Relationships
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=True)
-    contact = sa_relationship("Contact", back_populates="referrals")
+    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=True, index=True)
+    contact = sa_relationship("Contact", back_populates="referrals", lazy=settings.JOB_CONTACT_LOADING)
 
 class Contact(Base):
     __tablename__ = "contacts"
@@ -32,8 +40,8 @@ class Contact(Base):
     outreach_status = Column(String, default="Not Contacted") # Not Contacted, Sent, Responded
     
     # Relationships
-    referrals = sa_relationship("Job", back_populates="contact")
-    tasks = sa_relationship("Task", back_populates="contact", cascade="all, delete-orphan")
+    referrals = sa_relationship("Job", back_populates="contact", lazy=settings.CONTACT_REFERRALS_LOADING)
+    tasks = sa_relationship("Task", back_populates="contact", cascade="all, delete-orphan", lazy=settings.CONTACT_TASKS_LOADING)
 
 class Company(Base):
     __tablename__ = "companies"
@@ -49,7 +57,7 @@ class Task(Base):
     id = Column(Integer, primary_key=True, index=True)
     text = Column(String)
     completed = Column(Integer, default=0) # SQLite doesn't have Boolean, use 0/1 or Integer
-    contact_id = Column(Integer, ForeignKey("contacts.id"))
+    contact_id = Column(Integer, ForeignKey("contacts.id"), index=True)
     
     contact = sa_relationship("Contact", back_populates="tasks")
 
@@ -60,4 +68,4 @@ class Note(Base):
     title = Column(String, default="Untitled")
     content = Column(Text, nullable=True)
     created_at = Column(Date, default=date.today)
-    updated_at = Column(Date, default=date.today, onupdate=date.today)
+    updated_at = Column(Date, default=date.today, onupdate=date.today, index=True)
@@ -30,6 +30,17 @@ class ContactBase(BaseModel):
 class ContactCreate(ContactBase):
     pass
 
+class ContactPatch(BaseModel):
+    id: int
+    name: Optional[str] = None
+    company: Optional[str] = None
+    role: Optional[str] = None
+    linkedin: Optional[str] = None
+    whatsapp: Optional[str] = None
+    relationship: Optional[str] = None
+    referral_status: Optional[str] = None
+    outreach_status: Optional[str] = None
+
 class Contact(ContactBase):
     id: int
     tasks: List[Task] = []
@@ -49,6 +60,16 @@ class JobBase(BaseModel):
 class JobCreate(JobBase):
     pass
 
+class JobPatch(BaseModel):
+    id: int
+    company: Optional[str] = None
+    position: Optional[str] = None
+    status: Optional[str] = None
+    date_applied: Optional[date] = None
+    location: Optional[str] = None
+    url: Optional[str] = None
+    contact_id: Optional[int] = None
+
 class Job(JobBase):
     id: int
     contact: Optional[Contact] = None
@@ -83,3 +104,13 @@ class Note(NoteBase):
     id: int
     class Config:
         from_attributes = True
+
+# --- Bulk operations ---
+class BulkDelete(BaseModel):
+    ids: List[int]
+
+class BulkResult(BaseModel):
+    index: int
+    ok: bool
+    id: Optional[int] = None
+    error: Optional[str] = None
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+class SearchResult(BaseModel):
+    kind: str  # note, company or job
+    id: int
+    title: str
+    snippet: str
+    score: float
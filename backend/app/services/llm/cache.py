@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from app.core import metrics
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used ON llm_responses (last_used);
+"""
+
+
+class ResponseCache:
+    """Persistent cache of raw model responses, with request coalescing.
+
+    Entries are keyed on the model name, the prompt's template version and
+    the rendered prompt (which carries the inputs). They expire after
+    ``ttl`` seconds, and the least recently used are evicted once the table
+    holds more than ``max_entries`` rows or ``max_bytes`` of text.
+    Identical requests that arrive while one is already in flight wait for
+    it instead of calling the model again.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; sync routes run on the threadpool
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def key_for(model: str, prompt_version: str, prompt: str) -> str:
+        return hashlib.sha256(json.dumps([model, prompt_version, prompt]).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT response FROM llm_responses WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, len(response.encode()), now, now),
+        )
+        self._evict(connection, now)
+
+    def lookup(self, key: str, parse: Callable[[str], T]) -> Optional[T]:
+        """Return ``parse`` of the cached response, or None on a miss.
+
+        A cached response that no longer parses is dropped. A cache that
+        can't be read (locked, corrupt, disk gone) counts as a miss.
+        Blocking; async callers run it through ``asyncio.to_thread``.
+        """
+        try:
+            cached = self.get(key)
+        except sqlite3.Error as e:
+            print(f"LLM Cache Error: {e}")
+            return None
+        if cached is None:
+            return None
+        try:
+            result = parse(cached)
+        except Exception:
+            try:
+                self.discard(key)
+            except sqlite3.Error as e:
+                print(f"LLM Cache Error: {e}")
+            return None
+        metrics.inc("llm_cache_hits")
+        return result
+
+    def store(self, key: str, model: str, response: str):
+        """Cache ``response``; blocking, like ``lookup``."""
+        try:
+            self.put(key, model, response)
+        except sqlite3.Error as e:
+            # A cache that can't be written must not fail the request
+            print(f"LLM Cache Error: {e}")
+
+    def discard(self, key: str):
+        self._connection().execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        connection.execute("DELETE FROM llm_responses WHERE created_at <= ?", (now - self.ttl,))
+        count, total = connection.execute("SELECT count(*), coalesce(sum(size), 0) FROM llm_responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk from least recently used until both bounds hold again
+        doomed = []
+        for key, size in connection.execute("SELECT key, size FROM llm_responses ORDER BY last_used"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        connection.executemany("DELETE FROM llm_responses WHERE key = ?", doomed)
+
+    async def fetch(
+        self,
+        model: str,
+        prompt_version: str,
+        prompt: str,
+        call: Callable[[], Awaitable[str]],
+        parse: Callable[[str], T],
+    ) -> T:
+        """Return ``parse`` of the cached or freshly generated response.
+
+        ``call`` asks the model; its text is only cached when ``parse``
+        accepts it, so a malformed answer is retried next time.
+        """
+        key = self.key_for(model, prompt_version, prompt)
+        # sqlite I/O stays off the event loop
+        result = await asyncio.to_thread(self.lookup, key, parse)
+        if result is not None:
+            return result
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            metrics.inc("llm_cache_coalesced")
+            try:
+                text = await asyncio.wrap_future(future)
+            except _LeaderCancelled:
+                # Its client went away; ours is still waiting, so ask again
+                return await self.fetch(model, prompt_version, prompt, call, parse)
+            return parse(text)
+
+        metrics.inc("llm_cache_misses")
+        try:
+            text = await call()
+            result = parse(text)
+            await asyncio.to_thread(self.store, key, model, text)
+            future.set_result(text)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+@lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCache:
+    return ResponseCache(
+        settings.LLM_CACHE_PATH,
+        ttl=settings.LLM_CACHE_TTL,
+        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        max_bytes=settings.LLM_CACHE_MAX_BYTES,
+    )
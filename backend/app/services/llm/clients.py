@@ -0,0 +1,74 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple
+import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from app.core import metrics
+from app.core.config import settings
+
+
+class ClientPool:
+    """One Gemini model handle per (API key, model), shared across threads.
+
+    ``genai.configure`` sets a process-wide key, so two requests with
+    different keys could each end up calling with the other's. Instead every
+    handle gets its own ``GenerativeServiceClient`` bound to its key, and
+    nothing global is configured. Handles unused for ``idle_ttl`` seconds are
+    dropped, as are the least recently used beyond ``max_keys``.
+    """
+
+    def __init__(self, idle_ttl: float, max_keys: int):
+        self.idle_ttl = idle_ttl
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # (key digest, model) -> (model handle, last used), least recently used first
+        self._models: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+
+    def model(self, api_key: str, model_name: str) -> genai.GenerativeModel:
+        # Keyed on a digest so the raw key isn't kept around as a dict key
+        slot = (hashlib.sha256(api_key.encode()).hexdigest(), model_name)
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._models.get(slot)
+            if entry is not None:
+                self._models[slot] = (entry[0], now)
+                self._models.move_to_end(slot)
+                return entry[0]
+
+        # Built outside the lock; a racing build for the same key just loses
+        model = genai.GenerativeModel(model_name)
+        # generate_content only falls back to the global client when this is unset
+        model._client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+        with self._lock:
+            entry = self._models.get(slot)
+            if entry is not None:
+                model = entry[0]
+            self._models[slot] = (model, now)
+            self._models.move_to_end(slot)
+            while len(self._models) > self.max_keys:
+                self._models.popitem(last=False)
+        return model
+
+    def _evict(self, now: float):
+        # Evicted handles aren't closed: a request may still be using one,
+        # and its channel goes away with the last reference
+        while self._models:
+            slot, (_, last_used) = next(iter(self._models.items()))
+            if now - last_used < self.idle_ttl:
+                break
+            del self._models[slot]
+
+    def __len__(self):
+        return len(self._models)
+
+
+@lru_cache(maxsize=None)
+def get_client_pool() -> ClientPool:
+    pool = ClientPool(idle_ttl=settings.LLM_CLIENT_IDLE_TTL, max_keys=settings.LLM_CLIENT_MAX_KEYS)
+    metrics.register_gauge("llm_clients", lambda: len(pool))
+    return pool
@@ -0,0 +1,166 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional, TypeVar
+from fastapi import Request
+from app.core import metrics
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_END = object()
+
+
+class LlmTimeout(Exception):
+    pass
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class ApiKeyRequired(Exception):
+    """The request needs Gemini, but came without an API key and none is configured."""
+
+
+class _Slot:
+    # The pool thread the slot's current SDK call is running on
+    running: Optional[Future] = None
+
+
+class LlmGateway:
+    """Runs blocking model calls off the event loop, a bounded number at a time.
+
+    The SDK calls go to a dedicated thread pool, so a slow model ties up
+    neither the event loop nor the request threadpool. Each call gets
+    ``timeout`` seconds, counting the wait for a free slot. The SDK call
+    itself can't be interrupted, so a call that times out or is cancelled
+    leaves its thread running. Up to ``max_abandoned`` such threads are
+    allowed on top of ``concurrency``, and their slots are given back at
+    once; past that, a slot is only given back when its thread returns.
+    Either way a call that gets a slot never queues behind abandoned work.
+    """
+
+    def __init__(self, concurrency: int, timeout: float, max_abandoned: Optional[int] = None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_abandoned = concurrency if max_abandoned is None else max_abandoned
+        self.active = 0
+        self.waiting = 0
+        self.abandoned = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency + self.max_abandoned, thread_name_prefix="llm"
+        )
+
+    @asynccontextmanager
+    async def _slot(self, deadline: float):
+        loop = asyncio.get_running_loop()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            metrics.inc("llm_timeouts")
+            raise LlmTimeout("Timed out waiting for a free model slot")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        slot = _Slot()
+        try:
+            yield slot
+        finally:
+            self.active -= 1
+            self._release(loop, slot.running)
+
+    def _release(self, loop: asyncio.AbstractEventLoop, running: Optional[Future]):
+        if running is None or running.done():
+            self._slots.release()
+            return
+        metrics.inc("llm_abandoned_calls")
+        if self.abandoned < self.max_abandoned:
+            self.abandoned += 1
+            self._slots.release()
+            _when_done(loop, running, self._abandoned_returned)
+        else:
+            # No spare thread to cover it: the slot stays taken until it returns
+            _when_done(loop, running, self._slots.release)
+
+    def _abandoned_returned(self):
+        self.abandoned -= 1
+
+    async def _call(self, slot: _Slot, deadline: float, fn: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        slot.running = self._executor.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(slot.running), max(0.0, deadline - loop.time()),
+            )
+        except asyncio.TimeoutError:
+            metrics.inc("llm_timeouts")
+            raise LlmTimeout(f"Model call exceeded {self.timeout:g}s")
+
+    async def run(self, call: Callable[[], T]) -> T:
+        """Run the blocking ``call`` in a slot and return its result."""
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        async with self._slot(deadline) as slot:
+            return await self._call(slot, deadline, call)
+
+    async def stream(self, start: Callable[[], Iterator[T]]) -> AsyncIterator[T]:
+        """Yield the items of the blocking iterator returned by ``start``.
+
+        The slot is held, and the deadline applies, until the iterator is
+        exhausted or the consumer stops.
+        """
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        async with self._slot(deadline) as slot:
+            iterator = await self._call(slot, deadline, start)
+            while True:
+                item = await self._call(slot, deadline, next, iterator, _END)
+                if item is _END:
+                    return
+                yield item
+
+
+def _when_done(loop: asyncio.AbstractEventLoop, future: Future, callback: Callable[[], None]):
+    """Run ``callback`` on ``loop`` once the pool thread behind ``future`` returns."""
+    def done(_):
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            pass  # the loop has closed; nothing left to release
+    future.add_done_callback(done)
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """Await ``awaitable`` but cancel it if the client goes away first.
+
+    Only for routes whose body has already been read, so the next ASGI
+    message can only be the disconnect. Raises ClientDisconnected.
+    """
+    work = asyncio.ensure_future(awaitable)
+
+    async def disconnected():
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+
+    watcher = asyncio.ensure_future(disconnected())
+    try:
+        done, _ = await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not work.done():
+            work.cancel()
+    if work not in done:
+        metrics.inc("llm_disconnects")
+        raise ClientDisconnected()
+    return work.result()
+
+
+@lru_cache(maxsize=None)
+def get_llm_gateway() -> LlmGateway:
+    gateway = LlmGateway(settings.LLM_CONCURRENCY, settings.LLM_TIMEOUT, settings.LLM_MAX_ABANDONED)
+    metrics.register_gauge("llm_active", lambda: gateway.active)
+    metrics.register_gauge("llm_waiting", lambda: gateway.waiting)
+    metrics.register_gauge("llm_abandoned", lambda: gateway.abandoned)
+    return gateway
@@ -1,23 +1,23 @@
-import google.generativeai as genai
+import asyncio
 import json
 import os
+from contextlib import aclosing
+from typing import Optional
+from app.core import metrics
+from app.core.config import settings
+from app.services.llm.cache import get_response_cache
+from app.services.llm.gateway import ApiKeyRequired, LlmTimeout, get_llm_gateway
+from app.services.resume.latex_sections import HEADING, LatexDocument
+from app.services.resume.latex_renderer import LatexRenderError, render_resume_latex
 
-class AITailor:
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        # Using gemini-2.0-flash for speed and cost effectiveness, or pro if needed. 
-        # flash is usually good for JSON tasks.
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+# Part of the response cache key; bump when a prompt or the parsing of its
+# answer changes so cached answers to the old prompt are not reused
+TAILOR_PROMPT_VERSION = "1"
+TAILOR_SECTIONS_PROMPT_VERSION = "1"
+LATEX_PROMPT_VERSION = "1"
 
-    def tailor_resume(self, resume_latex: str, job_description: str) -> dict:
-        prompt = f"""
-        You are an EXPERT resume writer specializing in ATS-optimized, single-page resumes using the Jake Ryan LaTeX template.
-        
-        **INPUTS:**
-        1. CURRENT RESUME (LaTeX format)
-        2. USER INPUT (either a Job Description OR a direct instruction like "make it one page", "remove X")
-        
-        **YOUR MISSION:**
+# Shared by the whole-document and the section prompts
+TAILOR_GUIDE = """**YOUR MISSION:**
         Modify the resume to either:
         A) **Tailor it for a Job Description** - Optimize for ATS scoring and keyword matching
         B) **Follow a Direct Instruction** - Execute exactly what the user asks
@@ -28,10 +28,10 @@ class AITailor:
         
         1. **Experience/Education Structure:**
            ```latex
-           \\resumeSubheading{{COMPANY/SCHOOL NAME}}{{Location}}{{Job Title/Degree}}{{Dates}}
+           \\resumeSubheading{COMPANY/SCHOOL NAME}{Location}{Job Title/Degree}{Dates}
            ```
            - **COMPANY/SCHOOL NAME** goes FIRST (bold) - NOT the title!
-           - Example: `\\resumeSubheading{{Accenture}}{{Bengaluru, India}}{{Advanced Associate Software Engineer}}{{Aug 2022 -- May 2023}}`
+           - Example: `\\resumeSubheading{Accenture}{Bengaluru, India}{Advanced Associate Software Engineer}{Aug 2022 -- May 2023}`
         
         2. **Bullet Points:**
            - Start with strong action verbs: "Managed", "Designed", "Implemented", "Automated"
@@ -42,7 +42,7 @@ class AITailor:
         3. **One-Page Optimization (if requested):**
            - Remove older/less relevant experience first
            - Condense bullet points (merge similar ones)
-           - Reduce `\\vspace` aggressively: `\\vspace{{-7pt}}` or `\\vspace{{-5pt}}`
+           - Reduce `\\vspace` aggressively: `\\vspace{-7pt}` or `\\vspace{-5pt}`
            - Keep only 3-4 bullets per role
            - Prioritize most relevant content
 
@@ -60,7 +60,7 @@ class AITailor:
         
         6. **Technical Skills:**
            - Reorder skills to match JD priorities
-           - Format: `\\textbf{{Category}}{{: Item1, Item2, Item3}}`
+           - Format: `\\textbf{Category}{: Item1, Item2, Item3}`
            - Categories: Networking, Security, Systems, Tools/Languages
         
         ---
@@ -73,7 +73,171 @@ class AITailor:
         - **"Tailor for [job]"** → Treat as JD tailoring, optimize keywords
         
         ---
+        """
+
+def _load_json(text: str):
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
+
+def _parse_tailor_response(text: str) -> dict:
+    data = _load_json(text)
+    if not isinstance(data, dict) or not isinstance(data.get("latex_code"), str):
+        raise ValueError("Model response has no latex_code")
+    return data
+
+def _clean_latex_response(text: str) -> str:
+    text = text.replace("```latex", "").replace("```", "").strip()
+    # Basic cleanup if Gemini adds markdown
+    if text.startswith("json"): text = text[4:]
+    return text
+
+class AITailor:
+    def __init__(self, api_key: Optional[str], model=None):
+        # Using gemini-2.0-flash for speed and cost effectiveness, or pro if needed. 
+        # flash is usually good for JSON tasks.
+        self.model_name = 'gemini-2.0-flash'
+        if model is None and api_key:
+            # Imported here so the app loads without the Gemini SDK installed
+            from app.services.llm.clients import get_client_pool
+            model = get_client_pool().model(api_key, self.model_name)
+        # Anything with generate_content(prompt).text will do, e.g. a local fake
+        self.model = model
+        self.cache = get_response_cache()
+        self.gateway = get_llm_gateway()
+
+    async def _generate(self, prompt_version: str, prompt: str, parse):
+        return await self.cache.fetch(
+            self.model_name, prompt_version, prompt,
+            lambda: self.gateway.run(lambda: self.model.generate_content(prompt).text),
+            parse,
+        )
+
+    async def tailor_resume(self, resume_latex: str, job_description: str) -> dict:
+        prompt_version, prompt, parse = self._tailor_request(resume_latex, job_description)
+
+        try:
+            return await self._generate(prompt_version, prompt, parse)
+        except LlmTimeout:
+            raise
+        except Exception as e:
+            print(f"Error tailoring resume: {e}")
+            # Robust fallback
+            return {
+                "latex_code": resume_latex,  # Return original if parsing fails
+                "explanation": "I encountered an error processing your request. Please try rephrasing your instruction."
+            }
+
+    async def stream_tailor(self, resume_latex: str, job_description: str):
+        """Yield ``("token", text)`` as the model writes, then ``("result", dict)``.
+
+        Tokens are progress only; the result is yielded once the whole answer
+        has parsed, otherwise the error propagates. A cached answer yields
+        the result straight away.
+        """
+        prompt_version, prompt, parse = self._tailor_request(resume_latex, job_description)
+        key = self.cache.key_for(self.model_name, prompt_version, prompt)
+        result = await asyncio.to_thread(self.cache.lookup, key, parse)
+        if result is not None:
+            yield "result", result
+            return
+
+        metrics.inc("llm_cache_misses")
+        parts = []
+        chunks = self.gateway.stream(lambda: iter(self.model.generate_content(prompt, stream=True)))
+        # Closed explicitly so a client that leaves frees the slot right away
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. the closing finish reason)
+                    continue
+                if text:
+                    parts.append(text)
+                    yield "token", text
+        text = "".join(parts)
+        result = parse(text)
+        await asyncio.to_thread(self.cache.store, key, self.model_name, text)
+        yield "result", result
+
+    def _tailor_request(self, resume_latex: str, job_description: str):
+        """Return ``(prompt_version, prompt, parse)`` for one tailoring call.
+
+        A resume that splits into sections is tailored by section: the model
+        gets an outline plus the sections the input is about, returns only
+        the ones it changed, and those are merged back here. Output tokens
+        dominate latency, so this is much faster than echoing the whole
+        document. Anything that doesn't split is sent whole, as before.
+        """
+        document = LatexDocument.split(resume_latex)
+        if document is None:
+            return TAILOR_PROMPT_VERSION, self._tailor_prompt(resume_latex, job_description), _parse_tailor_response
+
+        included = document.relevant(job_description)
+
+        def parse(text: str) -> dict:
+            data = _load_json(text)
+            if not isinstance(data, dict):
+                raise ValueError("Model response is not an object")
+            return {
+                "latex_code": document.merge(data.get("sections", [])),
+                "explanation": data.get("explanation", "I've tailored your resume."),
+            }
+
+        return TAILOR_SECTIONS_PROMPT_VERSION, self._sections_prompt(document, included, job_description), parse
+
+    def _sections_prompt(self, document: LatexDocument, included: list, job_description: str) -> str:
+        sections = "\n".join(
+            f"[{name}]\n{document.sections[name].strip()}\n" for name in included
+        )
+        return f"""
+        You are an EXPERT resume writer specializing in ATS-optimized, single-page resumes using the Jake Ryan LaTeX template.
+        
+        **INPUTS:**
+        1. RESUME OUTLINE: every section of the current resume, in order
+        2. SECTIONS: the full LaTeX of the sections relevant to the user input, each under its [name]
+        3. USER INPUT (either a Job Description OR a direct instruction like "make it one page", "remove X")
+        
+        {TAILOR_GUIDE}
+        **OUTPUT REQUIREMENTS:**
+        
+        Return a JSON object with:
+        1. `sections`: a list with ONLY the sections you changed, added or removed, each as {{"name": ..., "latex": ...}}
+           - `name`: the section name exactly as in the outline ("{HEADING}" is the name/contact block)
+           - `latex`: the COMPLETE new LaTeX of that section, starting with its `\\section{{...}}` line (the {HEADING} has none)
+           - To remove a section (even one not included below), give its name with `"latex": ""`
+           - To add a section, use a new name and add `"after": "<name of the section it follows>"`
+           - Leave out every section you did not change
+        2. `explanation`: A natural, 1-sentence summary of what you changed
+        
+        **DO NOT:**
+        - Return markdown code blocks
+        - Fabricate experience
+        - Return the preamble or unchanged sections
+        - Use generic/weak language
+        
+        ---
+        
+        **RESUME OUTLINE:**
+        {document.outline(included)}
+        
+        **SECTIONS:**
+        {sections}
         
+        **USER INPUT:**
+        {job_description}
+        
+        **OUTPUT (JSON only):**
+        """
+
+    def _tailor_prompt(self, resume_latex: str, job_description: str) -> str:
+        return f"""
+        You are an EXPERT resume writer specializing in ATS-optimized, single-page resumes using the Jake Ryan LaTeX template.
+        
+        **INPUTS:**
+        1. CURRENT RESUME (LaTeX format)
+        2. USER INPUT (either a Job Description OR a direct instruction like "make it one page", "remove X")
+        
+        {TAILOR_GUIDE}
         **OUTPUT REQUIREMENTS:**
         
         Return a JSON object with:
@@ -103,21 +267,21 @@ class AITailor:
         **OUTPUT (JSON only):**
         """
 
+    async def convert_json_to_latex(self, resume_json: dict, latex_template: str) -> str:
+        # The Jake Ryan template is filled in locally; the model is only
+        # asked when the template or the JSON doesn't fit the renderer
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.replace("```json", "").replace("```", "").strip()
-            import json
-            data = json.loads(text)
-            return data
-        except Exception as e:
-            print(f"Error tailoring resume: {e}")
-            # Robust fallback
-            return {
-                "latex_code": resume_latex,  # Return original if parsing fails
-                "explanation": "I encountered an error processing your request. Please try rephrasing your instruction."
-            }
+            latex = render_resume_latex(resume_json, latex_template)
+            metrics.inc("latex_render_local")
+            return latex
+        except LatexRenderError as e:
+            if not settings.LATEX_RENDER_LLM_FALLBACK:
+                raise
+            if self.model is None:
+                raise ApiKeyRequired("Missing API Key") from e
+            print(f"Local LaTeX render failed, asking the model: {e}")
+            metrics.inc("latex_render_llm_fallback")
 
-    def convert_json_to_latex(self, resume_json: dict, latex_template: str) -> str:
         prompt = f"""
         You are an expert LaTeX typesetter. I have a resume in JSON format and a specific LaTeX template.
         Your task is to transfer the content from the JSON into the LaTeX template, maintaining the exact formatting and structure of the template.
@@ -178,11 +342,7 @@ class AITailor:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.replace("```latex", "").replace("```", "").strip()
-            # Basic cleanup if Gemini adds markdown
-            if text.startswith("json"): text = text[4:]
-            return text
+            return await self._generate(LATEX_PROMPT_VERSION, prompt, _clean_latex_response)
         except Exception as e:
             print(f"Error converting to latex: {e}")
             raise e
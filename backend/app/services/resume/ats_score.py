@@ -0,0 +1,245 @@
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+# Scores how well a resume covers a job description's keywords, the way an
+# ATS keyword filter would, without a model round trip. Words are compared
+# by a light suffix-stripping stem, and acronyms and their spelled-out
+# forms ("AD", "Active Directory") count as the same keyword.
+
+# Keywords kept per job description, heaviest first
+MAX_KEYWORDS = 40
+
+# Canonical name -> other ways of writing it. Two-letter acronyms only match
+# text written in capitals, so "AD" the acronym is not "ad" the word.
+SYNONYMS = {
+    "Active Directory": ("AD",),
+    "Amazon Web Services": ("AWS",),
+    "Google Cloud Platform": ("GCP", "Google Cloud"),
+    "Microsoft Azure": ("Azure",),
+    "Microsoft 365": ("M365", "O365", "Office 365"),
+    "Kubernetes": ("k8s",),
+    "JavaScript": ("JS",),
+    "TypeScript": ("TS",),
+    "Node.js": ("node", "nodejs"),
+    "React": ("react.js", "reactjs"),
+    "Vue": ("vue.js", "vuejs"),
+    "PostgreSQL": ("postgres", "psql"),
+    "C#": ("csharp",),
+    ".NET": ("dotnet",),
+    "CI/CD": ("CI CD", "continuous integration", "continuous delivery", "continuous deployment"),
+    "Machine Learning": ("ML",),
+    "Artificial Intelligence": ("AI",),
+    "Natural Language Processing": ("NLP",),
+    "REST API": ("REST", "RESTful", "RESTful API"),
+    "User Interface": ("UI",),
+    "User Experience": ("UX",),
+    "Object-Oriented Programming": ("OOP", "object oriented"),
+    "Single Sign-On": ("SSO",),
+    "Identity and Access Management": ("IAM",),
+    "Group Policy": ("GPO",),
+    "Domain Name System": ("DNS",),
+    "Dynamic Host Configuration Protocol": ("DHCP",),
+    "Virtual Private Network": ("VPN",),
+    "Local Area Network": ("LAN",),
+    "Wide Area Network": ("WAN",),
+    "Transmission Control Protocol": ("TCP/IP", "TCP"),
+    "Service Level Agreement": ("SLA",),
+    "Customer Relationship Management": ("CRM",),
+    "Infrastructure as Code": ("IaC",),
+    "Quality Assurance": ("QA",),
+    "Software Development Life Cycle": ("SDLC",),
+    "Help Desk": ("helpdesk", "service desk"),
+    "Windows Server": ("win server",),
+}
+
+_STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have having
+he her here hers him his how i if in into is it its itself just may me might more most must my no nor not now of
+off on once only or other our ours out over own per same shall she should so some such than that the their them
+then there these they this those through to too under until up upon us very via was we were what when where which
+while who whom why will with within without would you your yours
+ability able across activities additional applicant applicants apply based benefits bonus candidate candidates
+company degree demonstrated desired duties e.g ensure environment equivalent excellent expected experience
+familiarity field get good great help highly i.e ideal ideally include includes including job join know knowing
+knowledge least ll looking make minimum need needed needing needs new nice opportunity plus position
+preferably preferred proficiency proficient proven qualification qualifications re related require required
+requirement requirements requires responsibilities responsibility responsible role seek seeking seeks skill
+skills solid someone strong successful team understanding use used uses using various ve want wants well work
+working year years
+""".split())
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.]*[A-Za-z0-9+#]|[A-Za-z0-9][+#]*")
+# Punctuation between two words ends a phrase; spaces, hyphens and slashes don't
+_BREAK_RE = re.compile(r"[^\s/-]")
+_SUFFIXES = (
+    ("izations", "iz"), ("ization", "iz"), ("ations", "at"), ("ation", "at"), ("ments", ""), ("ment", ""),
+    ("ities", ""), ("ity", ""), ("ies", "y"), ("ied", "y"), ("ings", ""), ("ing", ""), ("ers", ""), ("er", ""),
+    ("ed", ""), ("ly", ""), ("es", ""), ("s", ""),
+)
+
+
+def stem(word: str) -> str:
+    """Light suffix stripping: "managed", "manager" and "management" all become "manag"."""
+    word = word.lower()
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word[-2] in "isu":
+                break  # "analysis", "status", "class"
+            if suffix == "es" and word[-3] not in "sxzh":
+                word = word[:-1]  # "services" -> "service", then "servic" below
+            else:
+                word = word[:-len(suffix)] + replacement
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]  # "planning" -> "plan"
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+class _Unit(NamedTuple):
+    key: str
+    surface: str
+    notable: bool  # capitalised mid-sentence, an acronym, or has digits/symbols
+    breaks: bool  # punctuation before it, so no phrase spans into it
+    stop: bool
+
+
+def _stems(text: str) -> Tuple[str, ...]:
+    return tuple(stem(m.group()) for m in _TOKEN_RE.finditer(text))
+
+
+def _synonym_index() -> Dict[Tuple[str, ...], Tuple[str, bool]]:
+    # stems -> (canonical name, whether the text must be in capitals)
+    index = {}
+    for canonical, variants in SYNONYMS.items():
+        index[_stems(canonical)] = (canonical, False)
+        for variant in variants:
+            index[_stems(variant)] = (canonical, variant.isupper() and len(variant) <= 2)
+    return index
+
+
+_SYNONYM_INDEX = _synonym_index()
+_LONGEST_SYNONYM = max(len(stems) for stems in _SYNONYM_INDEX)
+
+
+def _units(text: str) -> List[_Unit]:
+    """Words of ``text`` as stemmed units, with known phrases and acronyms merged into one."""
+    text = re.sub(r"(?<![\w.])\.net\b", "dotnet", text, flags=re.I)
+    tokens = list(_TOKEN_RE.finditer(text))
+    stems = [stem(t.group()) for t in tokens]
+    units, i, previous_end = [], 0, 0
+    while i < len(tokens):
+        gap = text[previous_end:tokens[i].start()]
+        breaks = bool(_BREAK_RE.search(gap)) or "\n" in gap or i == 0
+        for length in range(min(_LONGEST_SYNONYM, len(tokens) - i), 0, -1):
+            match = _SYNONYM_INDEX.get(tuple(stems[i:i + length]))
+            if match is None:
+                continue
+            surface = text[tokens[i].start():tokens[i + length - 1].end()]
+            canonical, capitals = match
+            if capitals and not surface.rstrip("s").isupper():
+                continue  # "ADs" is fine, "ad" is not
+            units.append(_Unit(f"={canonical.lower()}", surface, True, breaks, False))
+            i += length
+            break
+        else:
+            word = tokens[i].group()
+            notable = (
+                not word.isalpha() and not word.isdigit()
+                or (word.isupper() and len(word) > 1)
+                or any(c.isupper() for c in word[1:])  # "PowerShell"
+                or (word[0].isupper() and not breaks)
+            )
+            stop = (
+                word.lower() in _STOPWORDS
+                or not any(c.isalpha() for c in word)  # "2019", "3+"
+                or (len(word) < 2 and word.lower() not in "cr")
+            )
+            units.append(_Unit(stems[i], word, notable, breaks, stop))
+            i += 1
+        previous_end = tokens[i - 1].end()
+    return units
+
+
+def _terms(units: List[_Unit]):
+    """``(key, surface, notable, phrase)`` for each keyword and each two-word phrase."""
+    for i, unit in enumerate(units):
+        if unit.stop:
+            continue
+        yield unit.key, unit.surface, unit.notable, False
+        following = units[i + 1] if i + 1 < len(units) else None
+        if following is not None and not following.stop and not following.breaks:
+            surface = f"{unit.surface} {following.surface}"
+            yield f"{unit.key}|{following.key}", surface, unit.notable or following.notable, True
+
+
+def latex_to_text(latex: str) -> str:
+    """The readable text of a LaTeX resume: body only, commands and braces dropped."""
+    _, marker, body = latex.partition("\\begin{document}")
+    text = body.partition("\\end{document}")[0] if marker else latex
+    text = re.sub(r"(?<!\\)%.*", "", text)
+    text = re.sub(r"\\href\{[^}]*\}", " ", text)
+    text = re.sub(r"\\([&%$#_{}])", r"\1", text)
+    text = re.sub(r"\\[A-Za-z@]+\*?(\[[^\]]*\])?", " ", text)
+    return re.sub(r"[{}$~\\]", " ", text)
+
+
+def resume_data_to_text(data) -> str:
+    """Every string in a ``ResumeData`` dict, one per line."""
+    if isinstance(data, dict):
+        return "\n".join(resume_data_to_text(v) for v in data.values())
+    if isinstance(data, list):
+        return "\n".join(resume_data_to_text(v) for v in data)
+    return str(data) if data is not None else ""
+
+
+@lru_cache(maxsize=64)
+def job_keywords(job_description: str) -> Tuple[Tuple[str, str, float], ...]:
+    """``(key, keyword, weight)`` for the job description's top keywords, heaviest first.
+
+    Cached: while a resume is edited against one posting, only the resume
+    side is tokenized on each call.
+    """
+    counts: Dict[str, int] = {}
+    surfaces: Dict[str, str] = {}
+    notable: Dict[str, bool] = {}
+    phrases = set()
+    for key, surface, is_notable, phrase in _terms(_units(job_description)):
+        counts[key] = counts.get(key, 0) + 1
+        surfaces.setdefault(key, surface)
+        notable[key] = notable.get(key, False) or is_notable
+        if phrase:
+            phrases.add(key)
+
+    keywords = []
+    for key, count in counts.items():
+        phrase = key in phrases
+        if phrase and count < 2:
+            continue  # a two-word phrase has to recur to count as a keyword
+        weight = (1 + math.log2(count)) * (1.5 if notable[key] else 1.0) * (1.2 if phrase else 1.0)
+        keywords.append((key, surfaces[key], round(weight, 2)))
+    # Stable sort keeps the posting's order among equal weights
+    keywords.sort(key=lambda k: -k[2])
+    return tuple(keywords[:MAX_KEYWORDS])
+
+
+def score_resume(resume_text: str, job_description: str) -> dict:
+    """Weighted share (0-100) of the job description's keywords the resume contains.
+
+    Returns ``{"score", "matched", "missing"}``; the keyword lists hold
+    ``{"keyword", "weight"}`` and are heaviest first, so the top of
+    ``missing`` is what to add next.
+    """
+    keywords = job_keywords(job_description)
+    present = {key for key, _, _, _ in _terms(_units(resume_text))}
+    matched = [{"keyword": keyword, "weight": weight} for key, keyword, weight in keywords if key in present]
+    missing = [{"keyword": keyword, "weight": weight} for key, keyword, weight in keywords if key not in present]
+    total = sum(weight for _, _, weight in keywords)
+    score = 100 * sum(k["weight"] for k in matched) / total if total else 0.0
+    return {"score": round(score, 1), "matched": matched, "missing": missing}
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import re
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, List, Optional
+from app.services.resume.generator import ResumeGenerator
+from app.services.resume.processes import SpawnPool
+
+# One generator per worker process, built by the pool initializer
+_generator: Optional[ResumeGenerator] = None
+
+def _init_worker():
+    global _generator
+    _generator = ResumeGenerator()
+
+def _render(data: dict) -> bytes:
+    return _generator.render(data).getvalue()
+
+
+class _ChunkSink:
+    """Write-only file object that hands what ZipFile wrote back in chunks.
+
+    ZipFile falls back to data descriptors on unseekable output, so the
+    archive can be streamed entry by entry.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+def archive_name(index: int, name: str) -> str:
+    safe = re.sub(r"[^\w.-]+", "_", name).strip("_") or "Resume"
+    return f"{index + 1:03d}_{safe}_Resume.docx"
+
+
+class BatchRenderer:
+    """Renders many resumes across a process pool and streams them as a ZIP.
+
+    Rendering is CPU-bound, so it runs in worker processes rather than the
+    request threadpool. At most ``2 * workers`` items are in flight, so a
+    slow client holds back rendering instead of buffering finished files.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._processes = SpawnPool(workers, initializer=_init_worker)
+
+    def shutdown(self):
+        self._processes.shutdown()
+
+    async def _render_all(self, items: List[dict]):
+        """Yield ``(index, docx bytes, error)`` in completion order.
+
+        Items in flight when a worker dies fail with that error; the rest
+        go to a new pool.
+        """
+        loop = asyncio.get_running_loop()
+        queue = iter(enumerate(items))
+        pending = {}
+        try:
+            while True:
+                while len(pending) < 2 * self.workers:
+                    next_item = next(queue, None)
+                    if next_item is None:
+                        break
+                    index, data = next_item
+                    pool = self._processes.get()
+                    try:
+                        pending[loop.run_in_executor(pool, _render, data)] = (index, pool)
+                    except BrokenProcessPool as e:
+                        self._processes.discard(pool)
+                        yield index, None, str(e) or type(e).__name__
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    index, pool = pending.pop(future)
+                    try:
+                        docx, error = future.result(), None
+                    except BrokenProcessPool as e:
+                        self._processes.discard(pool)
+                        docx, error = None, str(e) or type(e).__name__
+                    except Exception as e:
+                        docx, error = None, str(e) or type(e).__name__
+                    yield index, docx, error
+        finally:
+            # Client went away (or we're done): drop work that hasn't started
+            for future in pending:
+                future.cancel()
+
+    async def stream_zip(self, items: List[Optional[dict]], names: List[str], errors: List[Optional[str]]) -> AsyncIterator[bytes]:
+        """Stream a ZIP of rendered resumes followed by ``manifest.json``.
+
+        ``items[i]`` is None when the payload already failed validation;
+        ``errors[i]`` then says why. Failed items never stop the batch.
+        """
+        sink = _ChunkSink()
+        manifest = [
+            {"index": i, "name": names[i], "file": None, "ok": False, "error": errors[i]}
+            for i in range(len(items))
+        ]
+        renderable = [i for i, item in enumerate(items) if item is not None]
+        with zipfile.ZipFile(sink, "w") as archive:
+            async for position, docx, error in self._render_all([items[i] for i in renderable]):
+                index = renderable[position]
+                if error is not None:
+                    manifest[index]["error"] = error
+                    continue
+                filename = archive_name(index, names[index])
+                # A .docx is already deflated; storing it again is cheaper
+                archive.writestr(filename, docx, compress_type=zipfile.ZIP_STORED)
+                manifest[index].update(file=filename, ok=True)
+                yield sink.drain()
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+        yield sink.drain()
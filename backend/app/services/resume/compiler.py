@@ -0,0 +1,245 @@
+import asyncio
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, List, Optional, Set
+from app.core import metrics
+from app.services.resume.latex_formats import FormatCache
+from app.services.resume.pdf_cache import PdfCache
+from app.services.resume.processes import run_process
+
+
+class CompileQueueFull(Exception):
+    pass
+
+
+class CompileJob:
+    def __init__(self, job_id: str, job_dir: str):
+        self.id = job_id
+        self.job_dir = job_dir
+        self.status = "queued"  # queued, running, done, failed
+        self.cache_key: Optional[str] = None
+        self.error: Optional[str] = None
+        self.pdf_path: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {"job_id": self.id, "status": self.status, "error": self.error}
+
+
+class LatexCompiler:
+    """Runs pdflatex off the event loop with bounded concurrency.
+
+    Jobs wait in a bounded queue and a fixed number of workers compile them
+    as subprocesses, so a burst of compiles queues up (or is refused once
+    the queue is full) instead of stalling the server. Sources that were
+    compiled before are answered from ``cache`` without touching the queue,
+    and with ``formats`` set, compiles reuse a precompiled preamble.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        concurrency: int,
+        queue_size: int,
+        timeout: float,
+        job_ttl: float,
+        cache: Optional[PdfCache] = None,
+        formats: Optional[FormatCache] = None,
+    ):
+        self.output_dir = output_dir
+        self.cache = cache
+        self.formats = formats
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.job_ttl = job_ttl
+        self.jobs: Dict[str, CompileJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._inflight: Dict[str, CompileJob] = {}
+        self._compiler_version: Optional[str] = None
+
+    def _ensure_workers(self):
+        # Workers are started lazily so they bind to the server's event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def _forget_expired(self):
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j.id for j in self.jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    async def compiler_version(self) -> str:
+        # Part of the cache key, so a TeX Live upgrade never serves stale PDFs
+        if self._compiler_version is None:
+            try:
+                _, stdout = await run_process(["pdflatex", "--version"], timeout=self.timeout)
+                self._compiler_version = stdout.decode("utf-8", errors="ignore").split("\n", 1)[0].strip()
+            except (OSError, asyncio.TimeoutError):
+                # Nothing will compile anyway; don't pin the version
+                return "unavailable"
+        return self._compiler_version
+
+    async def submit(self, latex_code: str) -> CompileJob:
+        self._ensure_workers()
+        self._forget_expired()
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(latex_code, await self.compiler_version())
+            cached_pdf = self.cache.get(cache_key)
+            if cached_pdf:
+                metrics.inc("latex_cache_hits")
+                return self._cached_job(cache_key, cached_pdf)
+            if cache_key in self._inflight:
+                # Same source is already compiling; share its job
+                metrics.inc("latex_cache_coalesced")
+                return self._inflight[cache_key]
+            metrics.inc("latex_cache_misses")
+
+        job_id = str(uuid.uuid4())
+        job = CompileJob(job_id, os.path.join(self.output_dir, job_id))
+        job.cache_key = cache_key
+        try:
+            self._queue.put_nowait((job, latex_code))
+        except asyncio.QueueFull:
+            raise CompileQueueFull("Too many compilations in progress. Please try again shortly.")
+        self.jobs[job_id] = job
+        if cache_key:
+            self._inflight[cache_key] = job
+        return job
+
+    def _cached_job(self, cache_key: str, pdf_path: str) -> CompileJob:
+        # Not kept in self.jobs: its id is the cache key, which get() resolves
+        # straight from the cache for as long as the PDF is there
+        job = CompileJob(cache_key, os.path.dirname(pdf_path))
+        job.cache_key = cache_key
+        job.status = "done"
+        job.pdf_path = pdf_path
+        job.finished_at = time.time()
+        job.done.set()
+        return job
+
+    async def compile(self, latex_code: str) -> CompileJob:
+        job = await self.submit(latex_code)
+        await job.done.wait()
+        return job
+
+    def get(self, job_id: str) -> Optional[CompileJob]:
+        job = self.jobs.get(job_id)
+        if job is None and self.cache is not None:
+            cached_pdf = self.cache.get(job_id)
+            if cached_pdf:
+                job = self._cached_job(job_id, cached_pdf)
+        return job
+
+    def read_pdf(self, job: CompileJob) -> Optional[bytes]:
+        """The finished job's PDF, or None once the cache or retention has removed it."""
+        path = self.cache.get(job.cache_key) if job.cache_key and self.cache is not None else job.pdf_path
+        if path is None:
+            return None
+        try:
+            # Read whole, so an eviction can't remove it mid-response
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def active_dirs(self) -> Set[str]:
+        return {job.job_dir for job in self.jobs.values() if job.status in ("queued", "running")}
+
+    async def _worker(self):
+        while True:
+            job, latex_code = await self._queue.get()
+            try:
+                job.status = "running"
+                await self._run(job, latex_code)
+                job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                if job.cache_key:
+                    self._inflight.pop(job.cache_key, None)
+                if job.pdf_path is None or job.cache_key:
+                    # The PDF (if any) now lives in the cache and the error
+                    # text is on the job, so .tex/.aux/.log can go right away
+                    shutil.rmtree(job.job_dir, ignore_errors=True)
+                job.finished_at = time.time()
+                job.done.set()
+                self._queue.task_done()
+
+    async def _run(self, job: CompileJob, latex_code: str):
+        os.makedirs(job.job_dir, exist_ok=True)
+        tex_file = os.path.join(job.job_dir, "resume.tex")
+        pdf_file = os.path.join(job.job_dir, "resume.pdf")
+
+        with open(tex_file, "w") as f:
+            f.write(latex_code)
+
+        # One budget for the whole job, so a warm attempt that fails slowly
+        # leaves its cold retry only what is left
+        deadline = asyncio.get_running_loop().time() + self.timeout
+
+        format_key = preamble = None
+        if self.formats is not None:
+            preamble = self.formats.split_preamble(latex_code)
+            if preamble is not None:
+                format_key = self.formats.key_for(preamble, await self.compiler_version())
+
+        if format_key and self.formats.lookup(format_key):
+            returncode, stdout = await self._pdflatex(job, tex_file, deadline, format_key)
+            if returncode == 0:
+                metrics.inc("latex_warm_compiles")
+            else:
+                # Don't trust the format with a failure; retry cold
+                metrics.inc("latex_warm_fallbacks")
+                returncode, stdout = await self._pdflatex(job, tex_file, deadline)
+        else:
+            returncode, stdout = await self._pdflatex(job, tex_file, deadline)
+            metrics.inc("latex_cold_compiles")
+            if returncode == 0 and format_key:
+                self.formats.schedule_build(format_key, preamble)
+
+        if returncode != 0:
+            # Capture log if available
+            log_file = os.path.join(job.job_dir, "resume.log")
+            error_log = "PDF compilation failed.\n"
+            if os.path.exists(log_file):
+                with open(log_file, "r", errors='ignore') as f:
+                    # Get last 20 lines of log
+                    lines = f.readlines()
+                    error_log += "".join(lines[-20:])
+            else:
+                error_log += stdout.decode('utf-8', errors='ignore')
+            raise Exception(error_log)
+
+        if not os.path.exists(pdf_file):
+            raise Exception("PDF file was not generated.")
+        job.pdf_path = self.cache.put(job.cache_key, pdf_file) if job.cache_key else pdf_file
+
+    async def _pdflatex(self, job: CompileJob, tex_file: str, deadline: float, format_name: Optional[str] = None):
+        # -interaction=nonstopmode prevents hanging on errors
+        # -output-directory ensures output goes to the right place
+        args = ["pdflatex", "-interaction=nonstopmode", "-output-directory", job.job_dir, tex_file]
+        env = None
+        if format_name:
+            # Start from the dumped preamble instead of loading it again
+            args.insert(1, f"-fmt={format_name}")
+            env = self.formats.env()
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise Exception("Compilation timed out.")
+        try:
+            return await run_process(args, timeout=remaining, env=env)
+        except FileNotFoundError:
+            raise Exception("pdflatex command not found. Please install TeX Live (sudo apt-get install texlive-latex-base).")
+        except asyncio.TimeoutError:
+            raise Exception("Compilation timed out.")
@@ -0,0 +1,50 @@
+import io
+import zipfile
+from lxml import etree
+from docx.opc.oxml import serialize_part_xml
+from docx.oxml.parser import parse_xml
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS_PART = "word/_rels/document.xml.rels"
+
+
+class DocxPackage:
+    """A saved .docx split into the parts that change per resume and the rest.
+
+    Styles, theme, numbering and so on are about 800 KB of XML that is the
+    same for every resume, so they are deflated once into a template
+    archive. ``write`` copies the template and appends the document body
+    and its relationships with ``zipfile``'s append mode, so only those two
+    parts are serialized and compressed per resume.
+    """
+
+    def __init__(self, blob: bytes):
+        template = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(blob)) as package, \
+                zipfile.ZipFile(template, "w", zipfile.ZIP_DEFLATED) as static:
+            for info in package.infolist():
+                data = package.read(info)
+                if info.filename == DOCUMENT_PART:
+                    self.document = parse_xml(data)
+                    self._document_info = _part_info(info)
+                elif info.filename == DOCUMENT_RELS_PART:
+                    self.rels = etree.fromstring(data)
+                    self._rels_info = _part_info(info)
+                else:
+                    static.writestr(_part_info(info), data)
+        self._template = template.getvalue()
+
+    def write(self, document, rels) -> io.BytesIO:
+        buffer = io.BytesIO(self._template)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as package:
+            package.writestr(self._document_info, serialize_part_xml(document))
+            package.writestr(self._rels_info, serialize_part_xml(rels))
+        buffer.seek(0)
+        return buffer
+
+
+def _part_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    # Keeps the saved timestamp, so identical resumes give identical bytes
+    part = zipfile.ZipInfo(info.filename, info.date_time)
+    part.compress_type = zipfile.ZIP_DEFLATED
+    return part
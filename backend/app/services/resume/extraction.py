@@ -0,0 +1,159 @@
+import asyncio
+import os
+import re
+import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, List, Optional, Tuple
+from docx import Document
+from pypdf import PdfReader
+from app.services.resume.processes import SpawnPool
+
+SPOOL_CHUNK = 1024 * 1024
+
+
+class ExtractionLimitError(ValueError):
+    pass
+
+
+def _extract_pdf_page(page) -> str:
+    # Layout mode keeps the gap between a resume's left and right columns
+    # ("Google    Mountain View, CA") and the indent of wrapped bullets,
+    # which the heuristic parser splits on; plain mode runs them together
+    try:
+        return page.extract_text(extraction_mode="layout") or ""
+    except Exception:
+        return page.extract_text() or ""
+
+
+def _extract_pdf_pages(path: str, start: int, stop: int) -> List[Tuple[int, str, float]]:
+    """``(page number, text, seconds)`` for pages ``start``..``stop - 1``."""
+    reader = PdfReader(path)
+    pages = []
+    for number in range(start, stop):
+        began = time.perf_counter()
+        text = _extract_pdf_page(reader.pages[number])
+        pages.append((number, text, time.perf_counter() - began))
+    return pages
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    parts = []
+    for item in paragraph.iter_inner_content():
+        # A hyperlink's text alone ("LinkedIn", "Link") would lose the address
+        url = getattr(item, "url", "")
+        keep = url and not url.startswith("mailto:") and url not in item.text
+        parts.append(f"{item.text} ({url})" if keep else item.text)
+    text = "".join(parts)
+    # List paragraphs carry no bullet character of their own; mark them
+    if paragraph.style is not None and paragraph.style.name.startswith("List"):
+        return f"• {text}"
+    return text
+
+
+def _extract_docx(path: str) -> List[Tuple[int, str, float]]:
+    began = time.perf_counter()
+    text = "\n".join(_docx_paragraph_text(paragraph) for paragraph in Document(path).paragraphs)
+    return [(0, text, time.perf_counter() - began)]
+
+
+def collapse_layout(text: str) -> str:
+    """Layout-mode text as plain text: column gaps and indents become single spaces."""
+    lines = (re.sub(r" {2,}", " ", line.strip()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+def _count_pdf_pages(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+
+class PageExtractor:
+    """Extracts upload text off the event loop, PDF pages in parallel.
+
+    The upload is spooled to a temp file (so workers can open it by path)
+    with ``max_bytes`` enforced while copying; PDFs are then checked
+    against ``max_pages`` before any text is extracted. Page ranges are
+    spread over a process pool, since pypdf is pure Python and would
+    serialize on the GIL in threads.
+    """
+
+    def __init__(self, workers: int, max_bytes: int, max_pages: int):
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self._processes = SpawnPool(workers)
+
+    def shutdown(self):
+        self._processes.shutdown()
+
+    def _spool(self, source: BinaryIO, suffix: str) -> str:
+        source.seek(0)
+        spool = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        try:
+            with spool:
+                copied = 0
+                while chunk := source.read(SPOOL_CHUNK):
+                    copied += len(chunk)
+                    if copied > self.max_bytes:
+                        raise ExtractionLimitError(f"File is larger than {self.max_bytes // (1024 * 1024)} MB")
+                    spool.write(chunk)
+        except BaseException:
+            os.unlink(spool.name)
+            raise
+        return spool.name
+
+    async def extract(self, source: BinaryIO, filename: str, size: Optional[int] = None):
+        """Return ``(text, timings)`` for an uploaded PDF or DOCX.
+
+        ``timings`` is a list of ``(name, milliseconds)``: the spool, each
+        page, and the whole extraction. Raises ExtractionLimitError when
+        the file is too large or has too many pages.
+        """
+        filename = filename.lower()
+        if not filename.endswith((".pdf", ".docx")):
+            raise ValueError("Unsupported file format. Please upload PDF or DOCX.")
+        if size is not None and size > self.max_bytes:
+            raise ExtractionLimitError(f"File is larger than {self.max_bytes // (1024 * 1024)} MB")
+
+        began = time.perf_counter()
+        path = await asyncio.to_thread(self._spool, source, os.path.splitext(filename)[1])
+        timings = [("spool", (time.perf_counter() - began) * 1000)]
+        try:
+            if filename.endswith(".docx"):
+                pages = await asyncio.to_thread(_extract_docx, path)
+            else:
+                pages = await self._extract_pdf(path)
+        finally:
+            os.unlink(path)
+
+        timings += [(f"page-{number + 1}", seconds * 1000) for number, _, seconds in pages]
+        timings.append(("extract", (time.perf_counter() - began) * 1000))
+        # One join; every page ends with a newline, as before
+        return "".join(f"{text}\n" for _, text, _ in pages), timings
+
+    async def _extract_pdf(self, path: str) -> List[Tuple[int, str, float]]:
+        count = await asyncio.to_thread(_count_pdf_pages, path)
+        if count > self.max_pages:
+            raise ExtractionLimitError(f"PDF has {count} pages; at most {self.max_pages} are allowed")
+        chunks = min(self.workers, count)
+        if chunks <= 1:
+            # Not worth a round trip through the pool
+            return await asyncio.to_thread(_extract_pdf_pages, path, 0, count)
+
+        loop = asyncio.get_running_loop()
+        pool = self._processes.get()
+        bounds = [count * i // chunks for i in range(chunks + 1)]
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _extract_pdf_pages, path, start, stop)
+                for start, stop in zip(bounds, bounds[1:])
+            ))
+        except BrokenProcessPool:
+            # A worker died (a hostile PDF can exhaust memory); start afresh next time
+            self._processes.discard(pool)
+            raise
+        return [page for result in results for page in result]
+
+
+def server_timing(timings: List[Tuple[str, float]]) -> str:
+    return ", ".join(f"{name};dur={milliseconds:.1f}" for name, milliseconds in timings)
@@ -1,21 +1,49 @@
+from copy import deepcopy
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+from lxml import etree
 import docx.opc.constants
-import os
+import io
+from app.services.resume.docx_package import DocxPackage
+
+RELATIONSHIP_TAG = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
 
 class ResumeGenerator:
+    """Renders resume data to .docx from a pre-styled base document.
+
+    The base document (margins, Normal style) and one styled paragraph per
+    kind of line (section title, bullet, two-column row, ...) are built once
+    with python-docx. Rendering deep-copies those paragraphs and fills in
+    their text, so no per-request style lookups or document setup remain.
+    """
+
     def __init__(self):
-        pass
+        document = Document()
 
-    def add_hyperlink(self, paragraph, url, text, color="0000FF", underline=True, bold=False):
-        part = paragraph.part
-        r_id = part.relate_to(url, docx.opc.constants.RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
+        # Margins
+        sections = document.sections
+        for section in sections:
+            section.top_margin = Inches(0.4)
+            section.bottom_margin = Inches(0.4)
+            section.left_margin = Inches(0.5)
+            section.right_margin = Inches(0.5)
 
+        style = document.styles['Normal']
+        font = style.font
+        font.name = 'Times New Roman'
+        font.size = Pt(10)
+
+        self._fragments = self._build_fragments(document)
+
+        buffer = io.BytesIO()
+        document.save(buffer)
+        self._package = DocxPackage(buffer.getvalue())
+
+    def _hyperlink_element(self, text, color, underline, bold):
         hyperlink = OxmlElement('w:hyperlink')
-        hyperlink.set(qn('r:id'), r_id, )
 
         new_run = OxmlElement('w:r')
         rPr = OxmlElement('w:rPr')
@@ -29,7 +57,7 @@ class ResumeGenerator:
             u = OxmlElement('w:u')
             u.set(qn('w:val'), 'single')
             rPr.append(u)
-            
+
         if bold:
             b = OxmlElement('w:b')
             rPr.append(b)
@@ -38,193 +66,224 @@ class ResumeGenerator:
         new_run.text = text
         hyperlink.append(new_run)
 
-        paragraph._p.append(hyperlink)
-
         return hyperlink
 
     def generate(self, data: dict, output_path: str):
-        document = Document()
-        
-        # Margins
-        sections = document.sections
-        for section in sections:
-            section.top_margin = Inches(0.4)
-            section.bottom_margin = Inches(0.4)
-            section.left_margin = Inches(0.5)
-            section.right_margin = Inches(0.5)
+        with open(output_path, "wb") as f:
+            f.write(self.render(data).getvalue())
+        return output_path
 
-        style = document.styles['Normal']
-        font = style.font
-        font.name = 'Times New Roman'
-        font.size = Pt(10)
+    def render(self, data: dict) -> io.BytesIO:
+        """Build the resume in memory; the returned buffer is rewound."""
+        doc = _ResumeBody(self._package, self._fragments)
 
         # Header
-        self._add_header(document, data)
-        self._add_summary(document, data.get('summary', ''))
-        self._add_education(document, data.get('education', []))
-        self._add_certifications(document, data.get('certifications', []))
-        self._add_experience(document, data.get('experience', []))
-        self._add_projects(document, data.get('projects', []))
-        self._add_skills(document, data.get('skills', []))
-
-        document.save(output_path)
-        return output_path
+        self._add_header(doc, data)
+        self._add_summary(doc, data.get('summary', ''))
+        self._add_education(doc, data.get('education', []))
+        self._add_certifications(doc, data.get('certifications', []))
+        self._add_experience(doc, data.get('experience', []))
+        self._add_projects(doc, data.get('projects', []))
+        self._add_skills(doc, data.get('skills', []))
 
-    def _add_section_title(self, doc, title):
-        p = doc.add_paragraph()
-        run = p.add_run(title)
+        return self._package.write(doc.document, doc.rels)
+
+    def _build_fragments(self, document):
+        # Each fragment is styled exactly like the line it stands for; the
+        # placeholder text is replaced run by run (in document order) on render.
+        fragments = {}
+
+        def keep(name, paragraph):
+            fragments[name] = paragraph._p
+            paragraph._p.getparent().remove(paragraph._p)
+
+        name_paragraph = document.add_paragraph()
+        name_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        name_paragraph.paragraph_format.space_after = Pt(2)
+        name_run = name_paragraph.add_run('NAME')
+        name_run.bold = False
+        name_run.font.size = Pt(20)
+        name_run.font.name = 'Times New Roman'
+        keep('name', name_paragraph)
+
+        contact_paragraph = document.add_paragraph()
+        contact_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        contact_paragraph.paragraph_format.space_after = Pt(6)
+        run = contact_paragraph.add_run('phone')
+        run.font.size = Pt(9)
+        contact_paragraph.add_run('  |  ')
+        contact_paragraph._p.append(self._hyperlink_element('email', "000000", False, False))
+        contact_paragraph.add_run('  |  ')
+        contact_paragraph._p.append(self._hyperlink_element('LinkedIn', "0000FF", True, False))
+        keep('contact', contact_paragraph)
+
+        title = document.add_paragraph()
+        run = title.add_run('TITLE')
         run.bold = False
         run.font.size = Pt(10)
         run.font.name = 'Times New Roman'
-        run.text = title.upper()
-        
-        p_element = p._p
-        pPr = p_element.get_or_add_pPr()
         pBdr = OxmlElement('w:pBdr')
         bottom = OxmlElement('w:bottom')
         bottom.set(qn('w:val'), 'single')
-        bottom.set(qn('w:sz'), '4') 
+        bottom.set(qn('w:sz'), '4')
         bottom.set(qn('w:space'), '1')
         bottom.set(qn('w:color'), '000000')
         pBdr.append(bottom)
-        pPr.append(pBdr)
-        
-        p.paragraph_format.space_after = Pt(3)
+        title._p.get_or_add_pPr().append(pBdr)
+        title.paragraph_format.space_after = Pt(3)
+        keep('section_title', title)
+
+        summary = document.add_paragraph('summary')
+        summary.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+        summary.paragraph_format.space_after = Pt(6)
+        keep('summary', summary)
+
+        keep('school', self._row_two_cols(document, True, False, False, False))
+        keep('degree', self._row_two_cols(document, False, True, False, False, space_after=Pt(2)))
+        keep('title', self._row_two_cols(document, True, None, None, None))
+        keep('company', self._row_two_cols(document, None, True, None, True, space_after=Pt(1)))
+
+        for points in (4, 6):
+            spacer = document.add_paragraph()
+            spacer.paragraph_format.space_after = Pt(points)
+            keep(f'spacer_{points}', spacer)
+
+        cert = document.add_paragraph(style='List Bullet')
+        cert.paragraph_format.space_after = Pt(0)
+        cert.add_run('name').bold = True
+        cert.add_run(' – provider – ').italic = True
+        cert._p.append(self._hyperlink_element("Link", "0000FF", True, False))
+        keep('certification', cert)
+
+        bullet = document.add_paragraph(style='List Bullet')
+        bullet.paragraph_format.space_after = Pt(0)
+        bullet.add_run('bullet').font.size = Pt(10)
+        keep('bullet', bullet)
+
+        project = document.add_paragraph()
+        project.paragraph_format.space_after = Pt(1)
+        project.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), alignment=WD_TAB_ALIGNMENT.RIGHT)
+        project.add_run('name').bold = True
+        project.add_run(" | ")
+        project.add_run('stack').italic = True
+        project.add_run("\tdate")
+        keep('project', project)
+
+        skill = document.add_paragraph()
+        skill.paragraph_format.space_after = Pt(1)
+        skill.add_run('category: ').bold = True
+        skill.add_run('items')
+        keep('skill', skill)
+
+        return fragments
+
+    def _add_section_title(self, doc, title):
+        doc.add('section_title', title.upper())
 
     def _add_header(self, doc, data):
-        name_paragraph = doc.add_paragraph()
-        name_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        name_paragraph.paragraph_format.space_after = Pt(2)
-        
-        name_run = name_paragraph.add_run(data.get('name', 'NAME'))
-        name_run.bold = False 
-        name_run.font.size = Pt(20) 
-        name_run.font.name = 'Times New Roman'
+        doc.add('name', data.get('name', 'NAME'))
 
-        contact_paragraph = doc.add_paragraph()
-        contact_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        contact_paragraph.paragraph_format.space_after = Pt(6)
-        
-        run = contact_paragraph.add_run(data.get('phone', ''))
-        run.font.size = Pt(9)
-        
-        contact_paragraph.add_run('  |  ')
-        
         email = data.get('email', '')
-        self.add_hyperlink(contact_paragraph, f'mailto:{email}', email, "000000", False)
-        
-        contact_paragraph.add_run('  |  ')
-        
         linkedin = data.get('linkedin', '')
-        self.add_hyperlink(contact_paragraph, linkedin, 'LinkedIn', "0000FF", True)
+        doc.add(
+            'contact', data.get('phone', ''), None, email, None, None,
+            links=[f'mailto:{email}', linkedin],
+        )
 
     def _add_summary(self, doc, summary):
         if not summary: return
         self._add_section_title(doc, 'Professional Summary')
-        p = doc.add_paragraph(summary)
-        p.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-        p.paragraph_format.space_after = Pt(6)
+        doc.add('summary', summary)
 
     def _add_education(self, doc, education_list):
         if not education_list: return
         self._add_section_title(doc, 'Education')
         for edu in education_list:
-            self._add_row_two_cols(doc, edu['school'], True, False, edu['location'], False, False)
-            self._add_row_two_cols(doc, edu['degree'], False, True, edu['date'], False, False, space_after=Pt(2))
-        doc.add_paragraph().paragraph_format.space_after = Pt(4)
+            doc.add('school', edu['school'], f"\t{edu['location']}")
+            doc.add('degree', edu['degree'], f"\t{edu['date']}")
+        doc.add('spacer_4')
 
     def _add_certifications(self, doc, certs):
         if not certs: return
         self._add_section_title(doc, 'Certifications')
         for cert in certs:
-            p = doc.add_paragraph(style='List Bullet')
-            p.paragraph_format.space_after = Pt(0)
-            
-            run_name = p.add_run(cert['name'])
-            run_name.bold = True
-            
-            run_prov = p.add_run(f" – {cert['provider']} – ")
-            run_prov.italic = True
-            
-            self.add_hyperlink(p, cert['url'], "Link", "0000FF", True, False)
-        doc.add_paragraph().paragraph_format.space_after = Pt(6)
+            doc.add('certification', cert['name'], f" – {cert['provider']} – ", links=[cert['url']])
+        doc.add('spacer_6')
 
     def _add_experience(self, doc, jobs):
         if not jobs: return
         self._add_section_title(doc, 'Experience')
         for job in jobs:
-            p = doc.add_paragraph()
-            p.paragraph_format.space_after = Pt(0)
-            p.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), alignment=WD_TAB_ALIGNMENT.RIGHT)
-            
-            run1 = p.add_run(job['title'])
-            run1.bold = True
-            
-            run2 = p.add_run(f"\t{job['date']}")
-            
-            p2 = doc.add_paragraph()
-            p2.paragraph_format.space_after = Pt(1)
-            p2.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), alignment=WD_TAB_ALIGNMENT.RIGHT)
-            
-            run3 = p2.add_run(job['company'])
-            run3.italic = True
-            
-            run4 = p2.add_run(f"\t{job['location']}")
-            run4.italic = True
+            doc.add('title', job['title'], f"\t{job['date']}")
+            doc.add('company', job['company'], f"\t{job['location']}")
 
             for bullet in job['bullets']:
-                p = doc.add_paragraph(style='List Bullet')
-                p.paragraph_format.space_after = Pt(0) 
-                run = p.add_run(bullet)
-                run.font.size = Pt(10)
-                
-            doc.add_paragraph().paragraph_format.space_after = Pt(6)
+                doc.add('bullet', bullet)
+
+            doc.add('spacer_6')
 
     def _add_projects(self, doc, projects):
         if not projects: return
         self._add_section_title(doc, 'Projects')
         for proj in projects:
-            p = doc.add_paragraph()
-            p.paragraph_format.space_after = Pt(1)
-            p.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), alignment=WD_TAB_ALIGNMENT.RIGHT)
-            
-            run_name = p.add_run(proj['name'])
-            run_name.bold = True
-            
-            p.add_run(" | ")
-            
-            run_stack = p.add_run(proj['stack'])
-            run_stack.italic = True
-            
-            p.add_run(f"\t{proj['date']}")
+            doc.add('project', proj['name'], None, proj['stack'], f"\t{proj['date']}")
 
             for bullet in proj['bullets']:
-                p = doc.add_paragraph(style='List Bullet')
-                p.paragraph_format.space_after = Pt(0)
-                run = p.add_run(bullet)
-                run.font.size = Pt(10)
-                
-            doc.add_paragraph().paragraph_format.space_after = Pt(6)
+                doc.add('bullet', bullet)
+
+            doc.add('spacer_6')
 
     def _add_skills(self, doc, skills):
         if not skills: return
         self._add_section_title(doc, 'Technical Skills')
         for category, items in skills.items():
-            p = doc.add_paragraph()
-            p.paragraph_format.space_after = Pt(1)
-            run_cat = p.add_run(f"{category}: ")
-            run_cat.bold = True
-            p.add_run(items)
+            doc.add('skill', f"{category}: ", items)
 
-    def _add_row_two_cols(self, doc, col1_text, col1_bold, col1_italic, col2_text, col2_bold, col2_italic, space_after=Pt(0)):
+    def _row_two_cols(self, doc, col1_bold, col1_italic, col2_bold, col2_italic, space_after=Pt(0)):
         p = doc.add_paragraph()
         p.paragraph_format.space_after = space_after
         p.paragraph_format.tab_stops.add_tab_stop(Inches(7.5), alignment=WD_TAB_ALIGNMENT.RIGHT)
-        
-        run1 = p.add_run(col1_text)
-        run1.bold = col1_bold
-        run1.italic = col1_italic
-        
-        run2 = p.add_run(f"\t{col2_text}")
-        run2.bold = col2_bold
-        run2.italic = col2_italic
+
+        for text, bold, italic in (('col1', col1_bold, col1_italic), ("\tcol2", col2_bold, col2_italic)):
+            run = p.add_run(text)
+            # None leaves the property out entirely
+            if bold is not None:
+                run.bold = bold
+            if italic is not None:
+                run.italic = italic
+        return p
+
+
+class _ResumeBody:
+    """One render: a copy of the base document body and its relationships."""
+
+    def __init__(self, package: DocxPackage, fragments: dict):
+        self.document = deepcopy(package.document)
+        self.rels = deepcopy(package.rels)
+        self._fragments = fragments
+        self._sectPr = self.document.body.sectPr
+        self._links = {}
+        self._next_rel = 1 + max(int(rel.get('Id')[3:]) for rel in self.rels)
+
+    def add(self, name, *texts, links=()):
+        """Append a copy of fragment ``name``; a ``None`` text keeps the run's own."""
+        p = deepcopy(self._fragments[name])
+        for run, text in zip(p.iter(qn('w:r')), texts):
+            if text is not None:
+                run.text = text
+        for hyperlink, url in zip(p.iter(qn('w:hyperlink')), links):
+            hyperlink.set(qn('r:id'), self._relate(url))
+        self._sectPr.addprevious(p)
+        return p
+
+    def _relate(self, url):
+        # One relationship per distinct URL, as python-docx's relate_to does
+        if url not in self._links:
+            r_id = f'rId{self._next_rel}'
+            self._next_rel += 1
+            etree.SubElement(
+                self.rels, RELATIONSHIP_TAG,
+                Id=r_id, Type=docx.opc.constants.RELATIONSHIP_TYPE.HYPERLINK, Target=url, TargetMode='External',
+            )
+            self._links[url] = r_id
+        return self._links[url]
@@ -0,0 +1,313 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Rule-based parser for resumes laid out like the Jake Ryan template (and
+# the DOCX this app generates). It fills the same JSON schema as the model
+# prompt in parser.py and scores how sure it is, so the caller can fall
+# back to the model for anything that doesn't fit.
+
+SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "objective", "career objective", "about me"),
+    "education": ("education",),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history",
+    ),
+    "projects": ("projects", "personal projects", "academic projects"),
+    "certifications": (
+        "certifications", "certificates", "licenses & certifications", "licenses and certifications",
+        "certifications & licenses",
+    ),
+    "skills": ("technical skills", "skills", "core competencies"),
+    "awards": ("awards", "honors", "honors & awards", "awards & honors"),
+    "publications": ("publications",),
+    "languages": ("languages",),
+    "volunteer": ("volunteer", "volunteering", "volunteer experience"),
+}
+_HEADERS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+_MONTH = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?"
+    r"|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?|Spring|Summer|Fall|Winter)\.?"
+)
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}})"
+_RANGE = rf"{_DATE}(?:\s*(?:–|—|-{{1,2}}|to)\s*(?:{_DATE}|Present|Current|Now))?"
+_DATES_RE = re.compile(rf"^(?P<left>.*?)[\s|,–—-]*\b(?P<right>{_RANGE})\s*$", re.I)
+_LOCATION_RE = re.compile(
+    r"^(?P<left>.*?)[\s|,]*\b(?P<right>(?:[A-Z][\w.'-]*(?:\s+[A-Z][\w.'-]*){0,3},\s*[A-Z][\w.]*(?:\s+[A-Z][\w.]*){0,2})"
+    r"|Remote|Hybrid|On-?site)\s*$"
+)
+# Words that start multi-word city names; without a column gap to go by, a
+# city is otherwise taken to be the one word before the comma
+_CITY_PREFIXES = {
+    "new", "san", "los", "las", "santa", "salt", "st.", "saint", "fort", "college", "palo", "mountain",
+    "el", "kansas", "oklahoma", "jersey", "long", "grand", "west", "east", "north", "south", "baton",
+}
+_COLUMN_RE = re.compile(r"\t+| {2,}")
+# Includes the glyphs some PDF fonts map bullets to (WinAnsi 0x95, Symbol/Wingdings private use)
+_BULLET_RE = re.compile(r"^(\s*)[•●◦▪■▸►➢❖○\-–*·\x95\uf0b7\uf0a7\uf0d8\uf076]\s*")
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+|\b(?:[\w-]+\.)+(?:com|org|net|io|dev|me)/\S*", re.I)
+_CERT_URL_RE = re.compile(
+    r"(?:https?://)?(?:[\w-]+\.)*(?:certmetrics\.com|credly\.com|learn\.microsoft\.com)/\S*", re.I
+)
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def _split_columns(line: str) -> Tuple[str, str, str, bool]:
+    """Return ``(left, right, kind, guessed)`` for a two-column header line.
+
+    ``kind`` is "dates", "location" or "" for a line with one column;
+    ``guessed`` is set when no column gap or separator marked the split.
+    """
+    stripped = line.strip()
+    columns = [c.strip() for c in _COLUMN_RE.split(stripped) if c.strip()]
+    if len(columns) >= 2:
+        left, right = " ".join(columns[:-1]), columns[-1]
+        dates = _DATES_RE.match(right)
+        if dates and not dates.group("left"):
+            return left, right, "dates", False
+        # A right-hand column is short: "Remote", "Austin, TX", "London, United Kingdom"
+        if len(right) <= 40 and not right.endswith("."):
+            return left, right, "location", False
+        return stripped, "", "", False
+
+    match = _DATES_RE.match(stripped)
+    if match and match.group("left"):
+        return match.group("left").rstrip(" |,"), match.group("right"), "dates", True
+    match = _LOCATION_RE.match(stripped)
+    if match:
+        left, right = match.group("left"), match.group("right")
+        if "," in right:
+            # The regex grabs every capitalized word; keep the city short
+            city, region = (part.strip() for part in right.split(",", 1))
+            words = city.split()
+            keep = 2 if len(words) >= 2 and words[-2].lower() in _CITY_PREFIXES else 1
+            left = " ".join([left] + words[:-keep]).strip()
+            right = f"{' '.join(words[-keep:])}, {region}"
+        if left:
+            return left.rstrip(" |,"), right, "location", True
+    return stripped, "", "", False
+
+
+def _group_items(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """Split a section into ``(header line, bullets)`` groups.
+
+    A line after a bullet continues it when it is indented past the bullet
+    marker (PDF layout text) or starts in lower case.
+    """
+    groups: List[Tuple[Optional[str], List[str]]] = []
+    bullet_indent = None
+    for line in lines:
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            if not groups:
+                groups.append((None, []))
+            groups[-1][1].append(line[bullet.end():].strip())
+            bullet_indent = len(bullet.group(1))
+            continue
+        stripped = line.strip()
+        if bullet_indent is not None and groups and groups[-1][1] and (
+            _indent(line) > bullet_indent + 1 or stripped[:1].islower()
+        ):
+            groups[-1][1][-1] += " " + stripped
+            continue
+        bullet_indent = None
+        groups.append((line, []))
+    return groups
+
+
+def _entries(lines: List[str], named: str, role: str) -> Tuple[List[dict], List[float]]:
+    """Education/experience entries: a dated line and a located line, in either order.
+
+    Each entry scores the credit of its two header lines: 1 for a clean
+    split, 0.5 for a guessed one, nothing for a line that didn't split.
+    """
+    entries, scores = [], []
+    current, credit = None, {}
+    for header, bullets in _group_items(lines):
+        if header is not None:
+            left, right, kind, guessed = _split_columns(header)
+            slot = kind or "location"
+            if current is None or current["bullets"] or slot in credit:
+                if current is not None:
+                    scores.append(sum(credit.values()) / 2)
+                current, credit = {named: "", "location": "", role: "", "dates": "", "bullets": []}, {}
+                entries.append(current)
+            if slot == "dates":
+                current[role], current["dates"] = left, right
+            else:
+                current[named], current["location"] = left, right
+            credit[slot] = 0.0 if not kind else 0.5 if guessed else 1.0
+        elif current is None:
+            scores.append(0.0)  # bullets with no entry to belong to
+            continue
+        current["bullets"].extend(bullets)
+    if current is not None:
+        scores.append(sum(credit.values()) / 2)
+    return entries, scores
+
+
+def _projects(lines: List[str]) -> Tuple[List[dict], List[float]]:
+    projects, scores = [], []
+    for header, bullets in _group_items(lines):
+        if header is None:
+            scores.append(0.0)
+            continue
+        left, dates, kind, _ = _split_columns(header)
+        if kind != "dates":
+            left, dates = header.strip(), ""
+        name, _, technologies = (part.strip() for part in left.partition("|"))
+        projects.append({"name": name, "technologies": technologies, "dates": dates, "bullets": bullets})
+        scores.append(1.0 if technologies or dates else 0.5)
+    return projects, scores
+
+
+def _certifications(lines: List[str]) -> List[dict]:
+    items = []
+    for line in lines:
+        line = _BULLET_RE.sub("", line).strip()
+        items += [item.strip() for item in re.split(r"\s+\|\s+|\s*;\s*", line) if item.strip()]
+    certifications = []
+    for item in items:
+        url_match = _CERT_URL_RE.search(item) or _URL_RE.search(item)
+        url, text = "", item
+        if url_match:
+            url = url_match.group().rstrip(").,")
+            # Drop the URL and any parentheses left empty around it, but not a "(Provider)"
+            rest = item[:url_match.start()] + item[url_match.start() + len(url):]
+            text = re.sub(r"\(\s*\)", "", rest).strip(" -–.,")
+            if not url.startswith("http"):
+                url = "https://" + url
+        if url and not text:
+            # A URL on its own line: give it to the cert whose provider it names, else the last one
+            waiting = [c for c in certifications if not c["url"]]
+            if waiting:
+                named = [c for c in waiting if c["provider"] and c["provider"].lower() in url.lower()]
+                (named or waiting)[-1]["url"] = url
+                continue
+        text = re.sub(r"\s*[–-]\s*Link$", "", text)
+        match = re.match(r"^(?P<name>.+?)\s*\((?P<provider>[^)]+)\)$", text)
+        if match:
+            name, provider = match.group("name"), match.group("provider")
+        else:
+            parts = re.split(r"\s+[–-]\s+", text)
+            name, provider = parts[0], parts[1] if len(parts) > 1 else ""
+        certifications.append({"name": name.strip(), "provider": provider.strip(), "url": url})
+    return certifications
+
+
+def _skills(lines: List[str]) -> Dict[str, str]:
+    skills: Dict[str, str] = {}
+    key = None
+    for line in lines:
+        line = _BULLET_RE.sub("", line).strip()
+        category, colon, items = line.partition(":")
+        if colon and len(category) <= 40:
+            key = re.sub(r"[^a-z0-9]+", "_", category.strip().lower()).strip("_") or "skills"
+            skills[key] = items.strip()
+        elif key is not None:
+            skills[key] = f"{skills[key]} {line}".strip()
+        else:
+            key = "skills"
+            skills[key] = line
+    return skills
+
+
+def _link(part: str, domain: str) -> str:
+    # "LinkedIn (https://linkedin.com/in/x)" from a DOCX hyperlink, or the bare address
+    match = re.search(rf"\S*{re.escape(domain)}\S*", part, re.I)
+    return match.group().strip("()<>,") if match else part
+
+
+def _personal_info(lines: List[str]) -> Tuple[dict, float]:
+    info = {"name": "", "email": "", "phone": "", "linkedin": "", "github": ""}
+    lines = [line.strip() for line in lines if line.strip()]
+    if lines and not _EMAIL_RE.search(lines[0]) and not _PHONE_RE.search(lines[0]):
+        info["name"] = _COLUMN_RE.sub(" ", lines[0])
+        lines = lines[1:]
+    for part in (p.strip() for line in lines for p in re.split(r"\s*[|•·]\s*|\t+| {2,}", line)):
+        email, phone = _EMAIL_RE.search(part), _PHONE_RE.search(part)
+        if email and not info["email"]:
+            info["email"] = email.group()
+        elif "linkedin.com" in part.lower() and not info["linkedin"]:
+            info["linkedin"] = _link(part, "linkedin.com")
+        elif "github.com" in part.lower() and not info["github"]:
+            info["github"] = _link(part, "github.com")
+        elif phone and not info["phone"]:
+            info["phone"] = phone.group().strip()
+    score = 0.5 * bool(info["name"]) + 0.5 * bool(info["email"] or info["phone"])
+    return info, score
+
+
+def parse_resume_text(text: str) -> Tuple[dict, float]:
+    """Parse extracted resume text; returns ``(data, confidence)``.
+
+    ``confidence`` (0..1) weighs the name/contact block, how much of the
+    text sat under recognised section headers, and how completely each
+    education, experience and project entry could be split into its
+    fields.
+    """
+    heading: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current = None
+    body_lines = stray_lines = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        header = _HEADERS.get(_COLUMN_RE.sub(" ", line.strip()).lower().rstrip(":"))
+        if header is not None:
+            current = sections.setdefault(header, [])
+            continue
+        if current is None:
+            heading.append(line)
+            continue
+        current.append(line)
+        body_lines += 1
+
+    # Anything past the name and contact lines before the first header is unplaced
+    stray_lines = max(0, len(heading) - 3)
+    data = {
+        "personal_info": {},
+        "summary": " ".join(line.strip() for line in sections.get("summary", [])),
+        "education": [],
+        "experience": [],
+        "projects": [],
+        "certifications": _certifications(sections.get("certifications", [])),
+        "skills": _skills(sections.get("skills", [])),
+    }
+    data["personal_info"], heading_score = _personal_info(heading[:3])
+
+    entry_scores: List[float] = []
+    if "education" in sections:
+        entries, scores = _entries(sections["education"], "school", "degree")
+        data["education"] = [{k: e[k] for k in ("school", "location", "degree", "dates")} for e in entries]
+        entry_scores += scores
+    if "experience" in sections:
+        entries, scores = _entries(sections["experience"], "company", "title")
+        data["experience"] = [
+            {"title": e["title"], "company": e["company"], "location": e["location"], "dates": e["dates"], "bullets": e["bullets"]}
+            for e in entries
+        ]
+        entry_scores += scores
+    if "projects" in sections:
+        data["projects"], scores = _projects(sections["projects"])
+        entry_scores += scores
+    for extra in ("awards", "publications", "volunteer"):
+        if extra in sections:
+            data[extra] = [_BULLET_RE.sub("", line).strip() for line in sections[extra]]
+    if "languages" in sections:
+        data["languages"] = [
+            part.strip() for line in sections["languages"] for part in _BULLET_RE.sub("", line).split(",") if part.strip()
+        ]
+
+    has_core = bool(data["experience"] or data["education"])
+    coverage = body_lines / (body_lines + stray_lines) if body_lines else 0.0
+    entries_score = max(0.0, sum(entry_scores) / len(entry_scores)) if entry_scores else 0.0
+    confidence = 0.15 * heading_score + 0.15 * has_core + 0.1 * coverage + 0.6 * entries_score
+    return data, round(confidence, 3)
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import os
+from typing import Optional, Set
+from app.core import metrics
+from app.services.resume.processes import run_process
+
+BEGIN_DOCUMENT = "\\begin{document}"
+
+
+class FormatCache:
+    """Precompiled pdflatex formats, one per distinct preamble.
+
+    Loading the Jake Ryan preamble (packages, fonts, titlesec setup) is most
+    of a cold compile. A format dumped with ``mylatexformat`` after that
+    preamble lets later compiles of documents with the same preamble start
+    at ``\\begin{document}``. Documents whose preamble has no format yet
+    compile cold, and a format for it is built in the background. Past
+    ``max_formats`` the least recently used format is deleted to make
+    room; a ``.fmt`` file's mtime is its last use.
+    """
+
+    def __init__(self, directory: str, max_formats: int, timeout: float):
+        self.directory = directory
+        self.max_formats = max_formats
+        self.timeout = timeout
+        self._building: Set[str] = set()
+        # The loop only keeps weak references to tasks; these keep builds alive
+        self._tasks: Set[asyncio.Task] = set()
+        # Preambles that mylatexformat could not dump; never retried
+        self._failed: Set[str] = set()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def split_preamble(latex_code: str) -> Optional[str]:
+        index = latex_code.find(BEGIN_DOCUMENT)
+        if index == -1:
+            return None
+        return latex_code[:index]
+
+    @staticmethod
+    def key_for(preamble: str, compiler_version: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(compiler_version.encode())
+        digest.update(b"\0")
+        digest.update(preamble.encode())
+        return digest.hexdigest()[:32]
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the format name for ``-fmt`` if it has been built, marking it used."""
+        try:
+            os.utime(os.path.join(self.directory, f"{key}.fmt"))
+        except FileNotFoundError:
+            return None
+        return key
+
+    def env(self) -> dict:
+        # The trailing separator keeps kpathsea's default format path
+        return {**os.environ, "TEXFORMATS": self.directory + os.pathsep}
+
+    def _formats(self):
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".fmt")]
+
+    def __len__(self) -> int:
+        return len(self._formats())
+
+    def _evict(self):
+        # Builds in flight will each add a format too
+        formats = sorted(self._formats(), key=lambda entry: entry.stat().st_mtime)
+        excess = len(formats) + len(self._building) - self.max_formats + 1
+        for entry in formats[:max(0, excess)]:
+            try:
+                # A compile already using it just falls back to a cold run
+                os.remove(entry.path)
+                metrics.inc("latex_format_evictions")
+            except FileNotFoundError:
+                pass
+
+    def schedule_build(self, key: str, preamble: str):
+        if key in self._building or key in self._failed or self.lookup(key):
+            return
+        if len(self._building) >= self.max_formats:
+            return
+        self._evict()
+        self._building.add(key)
+        task = asyncio.create_task(self._build(key, preamble))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _build(self, key: str, preamble: str):
+        tex_file = os.path.join(self.directory, f"{key}.tex")
+        try:
+            with open(tex_file, "w") as f:
+                f.write(preamble)
+                f.write(BEGIN_DOCUMENT + "\n\\end{document}\n")
+            try:
+                returncode, _ = await run_process(
+                    ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={key}",
+                     "&pdflatex", "mylatexformat.ltx", tex_file],
+                    timeout=self.timeout, cwd=self.directory,
+                )
+            except asyncio.TimeoutError:
+                returncode = None
+                # Don't leave a half-written format behind
+                if os.path.exists(os.path.join(self.directory, f"{key}.fmt")):
+                    os.remove(os.path.join(self.directory, f"{key}.fmt"))
+            if returncode == 0 and self.lookup(key):
+                metrics.inc("latex_format_builds")
+            else:
+                self._failed.add(key)
+                metrics.inc("latex_format_build_failures")
+        except Exception as e:
+            self._failed.add(key)
+            metrics.inc("latex_format_build_failures")
+            print(f"Format Build Error: {e}")
+        finally:
+            self._building.discard(key)
+            for ext in (".tex", ".log"):
+                try:
+                    os.remove(os.path.join(self.directory, key + ext))
+                except FileNotFoundError:
+                    pass
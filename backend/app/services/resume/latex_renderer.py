@@ -0,0 +1,276 @@
+import re
+from typing import Any, Iterable, List
+
+# Renders the parser's resume JSON into the Jake Ryan template without a
+# model round trip. The template supplies the preamble (and with it the
+# \resume* macros); the document body is generated here.
+
+REQUIRED_MACROS = ("resumeSubheading", "resumeProjectHeading", "resumeItem", "resumeSubHeadingListStart")
+
+# Sections beyond the template's own, in the order they are appended
+EXTRA_SECTIONS = (
+    ("awards", "Awards"),
+    ("publications", "Publications"),
+    ("volunteer", "Volunteer Experience"),
+    ("licenses", "Licenses"),
+    ("languages", "Languages"),
+)
+
+_SPECIAL = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+    "<": r"\textless{}",
+    ">": r"\textgreater{}",
+    "|": r"\textbar{}",
+}
+_SPECIAL_RE = re.compile("|".join(re.escape(c) for c in _SPECIAL))
+
+
+class LatexRenderError(ValueError):
+    pass
+
+
+def escape_latex(value: Any) -> str:
+    """Plain text as LaTeX source; each special character is escaped once."""
+    return _SPECIAL_RE.sub(lambda m: _SPECIAL[m.group()], _text(value))
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_text(v) for v in value if _text(v))
+    return str(value).strip()
+
+
+def _url(value: Any) -> str:
+    url = _text(value).replace(" ", "")
+    if url and not re.match(r"^[a-z][a-z0-9+.-]*:", url, re.I):
+        url = "https://" + url
+    # Inside \href only these still need escaping
+    return re.sub(r"([%#\\{}])", r"\\\1", url)
+
+
+def _display_url(value: Any) -> str:
+    return re.sub(r"^(https?://)?(www\.)?", "", _text(value)).rstrip("/")
+
+
+def _first(entry: dict, *keys) -> str:
+    for key in keys:
+        if _text(entry.get(key)):
+            return _text(entry.get(key))
+    return ""
+
+
+def _bullets(entry: dict) -> List[str]:
+    bullets = entry.get("bullets") or entry.get("description") or []
+    if isinstance(bullets, str):
+        bullets = [bullets]
+    return [b for b in (_text(b) for b in bullets) if b]
+
+
+def _item_list(bullets: Iterable[str], indent: str) -> List[str]:
+    bullets = list(bullets)
+    if not bullets:
+        return []
+    return (
+        [f"{indent}\\resumeItemListStart"]
+        + [f"{indent}  \\resumeItem{{{escape_latex(b)}}}" for b in bullets]
+        + [f"{indent}\\resumeItemListEnd"]
+    )
+
+
+def _heading(info: dict) -> List[str]:
+    name = escape_latex(_first(info, "name")) or "Your Name"
+    contacts = []
+    if _first(info, "phone"):
+        contacts.append(escape_latex(info["phone"]))
+    if _first(info, "email"):
+        email = _text(info["email"])
+        contacts.append(f"\\href{{{_url('mailto:' + email)}}}{{\\underline{{{escape_latex(email)}}}}}")
+    for key in ("linkedin", "github", "website", "portfolio"):
+        if _first(info, key):
+            contacts.append(f"\\href{{{_url(info[key])}}}{{\\underline{{{escape_latex(_display_url(info[key]))}}}}}")
+    lines = ["\\begin{center}", f"    \\textbf{{\\Huge \\scshape {name}}} \\\\ \\vspace{{1pt}}"]
+    if contacts:
+        lines.append("    \\small " + " $|$ \n    ".join(contacts))
+    lines.append("\\end{center}")
+    return lines
+
+
+def _paragraph_section(title: str, text: str) -> List[str]:
+    return [
+        f"\\section{{{title}}}",
+        " \\begin{itemize}[leftmargin=0.15in, label={}]",
+        f"    \\small{{\\item{{{text}}}}}",
+        " \\end{itemize}",
+    ]
+
+
+def _subheading_section(title: str, entries: list, fields) -> List[str]:
+    # fields: four key tuples, for the bold, right, italic and italic-right cells
+    lines = [f"\\section{{{title}}}", "  \\resumeSubHeadingListStart"]
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise LatexRenderError(f"{title} entries must be objects")
+        cells = [f"{{{escape_latex(_first(entry, *keys))}}}" for keys in fields]
+        lines.append("    \\resumeSubheading")
+        lines.append("      " + "".join(cells[:2]))
+        lines.append("      " + "".join(cells[2:]))
+        lines.extend(_item_list(_bullets(entry), "      "))
+    lines.append("  \\resumeSubHeadingListEnd")
+    return lines
+
+
+def _projects_section(projects: list) -> List[str]:
+    lines = ["\\section{Projects}", "    \\resumeSubHeadingListStart"]
+    for project in projects:
+        if not isinstance(project, dict):
+            raise LatexRenderError("Projects entries must be objects")
+        heading = f"\\textbf{{{escape_latex(_first(project, 'name', 'title'))}}}"
+        stack = _first(project, "technologies", "stack", "tech_stack")
+        if stack:
+            heading += f" $|$ \\emph{{{escape_latex(stack)}}}"
+        lines.append("      \\resumeProjectHeading")
+        lines.append(f"          {{{heading}}}{{{escape_latex(_first(project, 'dates', 'date'))}}}")
+        lines.extend(_item_list(_bullets(project), "          "))
+    lines.append("    \\resumeSubHeadingListEnd")
+    return lines
+
+
+def _certifications_section(certifications: list) -> List[str]:
+    # One line, " | " separated; the name links to the verification URL
+    parts = []
+    for cert in certifications:
+        if isinstance(cert, dict):
+            name = escape_latex(_first(cert, "name", "title"))
+            if _first(cert, "url", "link"):
+                name = f"\\href{{{_url(_first(cert, 'url', 'link'))}}}{{{name}}}"
+            provider = _first(cert, "provider", "issuer")
+            parts.append(f"{name} ({escape_latex(provider)})" if provider else name)
+        elif _text(cert):
+            parts.append(escape_latex(cert))
+    if not parts:
+        return []
+    return [
+        "\\section{Certifications}",
+        "  \\resumeSubHeadingListStart",
+        "    \\small{\\item{",
+        "      " + " $|$ ".join(parts),
+        "    }}",
+        "  \\resumeSubHeadingListEnd",
+    ]
+
+
+def _category(key: str) -> str:
+    return " ".join(word[:1].upper() + word[1:] for word in re.split(r"[_\s]+", key.strip()) if word)
+
+
+def _skills_section(skills) -> List[str]:
+    if isinstance(skills, dict):
+        rows = [(_category(k), _text(v)) for k, v in skills.items() if _text(v)]
+    else:
+        rows = [("Skills", _text(skills))] if _text(skills) else []
+    if not rows:
+        return []
+    body = " \\\\\n".join(f"     \\textbf{{{escape_latex(k)}}}{{: {escape_latex(v)}}}" for k, v in rows)
+    return [
+        "\\section{Technical Skills}",
+        " \\begin{itemize}[leftmargin=0.15in, label={}]",
+        "    \\small{\\item{",
+        body,
+        "    }}",
+        " \\end{itemize}",
+    ]
+
+
+def _extra_line(entry) -> str:
+    if not isinstance(entry, dict):
+        return escape_latex(entry)
+    title = _first(entry, "title", "name", "role")
+    details = [
+        _text(v) for k, v in entry.items()
+        if k not in ("title", "name", "role", "url", "link") and _text(v)
+    ]
+    line = f"\\textbf{{{escape_latex(title)}}}" if title else ""
+    if details:
+        line += (" -- " if line else "") + escape_latex(", ".join(details))
+    if _first(entry, "url", "link"):
+        line += f" (\\href{{{_url(_first(entry, 'url', 'link'))}}}{{link}})"
+    return line
+
+
+def _extra_section(title: str, entries) -> List[str]:
+    if isinstance(entries, (str, dict)):
+        entries = [entries]
+    if title == "Languages":
+        # "English (Native), Spanish" on one line
+        spoken = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                language, level = _first(entry, "language", "name"), _first(entry, "proficiency", "level")
+                entry = f"{language} ({level})" if language and level else language or level
+            if _text(entry):
+                spoken.append(escape_latex(entry))
+        return _paragraph_section(title, ", ".join(spoken)) if spoken else []
+    lines = [line for line in (_extra_line(e) for e in entries) if line]
+    if not lines:
+        return []
+    return (
+        [f"\\section{{{title}}}", "  \\resumeSubHeadingListStart"]
+        + [f"    \\resumeItem{{{line}}}" for line in lines]
+        + ["  \\resumeSubHeadingListEnd"]
+    )
+
+
+def render_resume_latex(resume: dict, template: str) -> str:
+    """Fill the Jake Ryan ``template`` with the parsed ``resume``.
+
+    Raises LatexRenderError when the template doesn't define the Jake Ryan
+    macros or the JSON isn't shaped like the parser's schema; callers can
+    fall back to the model then.
+    """
+    if not isinstance(resume, dict):
+        raise LatexRenderError("Resume must be a JSON object")
+    preamble, marker, _ = template.partition("\\begin{document}")
+    if not marker:
+        raise LatexRenderError("Template has no \\begin{document}")
+    missing = [m for m in REQUIRED_MACROS if f"\\newcommand{{\\{m}}}" not in preamble]
+    if missing:
+        raise LatexRenderError(f"Template does not define {', '.join(missing)}")
+
+    info = resume.get("personal_info") or {}
+    if not isinstance(info, dict):
+        raise LatexRenderError("personal_info must be an object")
+
+    sections = [_heading(info)]
+    if _text(resume.get("summary")):
+        sections.append(_paragraph_section("Summary", escape_latex(resume["summary"])))
+    if resume.get("education"):
+        sections.append(_subheading_section("Education", resume["education"], (
+            ("school", "institution"), ("location",), ("degree",), ("dates", "date"),
+        )))
+    if resume.get("experience"):
+        sections.append(_subheading_section("Experience", resume["experience"], (
+            ("company",), ("location",), ("title", "role"), ("dates", "date"),
+        )))
+    if resume.get("projects"):
+        sections.append(_projects_section(resume["projects"]))
+    if resume.get("certifications"):
+        sections.append(_certifications_section(resume["certifications"]))
+    if resume.get("skills"):
+        sections.append(_skills_section(resume["skills"]))
+    for key, title in EXTRA_SECTIONS:
+        if resume.get(key):
+            sections.append(_extra_section(title, resume[key]))
+
+    body = "\n\n".join("\n".join(lines) for lines in sections if lines)
+    return f"{preamble}\\begin{{document}}\n\n{body}\n\n\\end{{document}}\n"
@@ -0,0 +1,151 @@
+import re
+from typing import Dict, List, Optional
+
+HEADING = "Heading"
+
+_SECTION_RE = re.compile(r"^[ \t]*\\section\*?\{([^}]*)\}", re.MULTILINE)
+_BEGIN_RE = re.compile(r"^[ \t]*\\begin\{document\}[^\n]*\n?", re.MULTILINE)
+_END_RE = re.compile(r"^[ \t]*\\end\{document\}", re.MULTILINE)
+
+# Words in a short instruction that point at a section, by section title;
+# matched as whole words, optionally plural
+_SECTION_WORDS = {
+    "summary": ("summary", "objective", "profile"),
+    "education": ("education", "degree", "school", "university", "college", "gpa"),
+    "experience": ("experience", "job", "role", "position", "work", "employer", "company", "internship"),
+    "projects": ("project",),
+    "certifications": ("certification", "certificate", "cert", "license"),
+    "technical skills": ("skill", "technology", "technologies", "tool", "language", "framework"),
+    "skills": ("skill", "technology", "technologies", "tool", "language", "framework"),
+    HEADING.lower(): ("email", "phone", "linkedin", "github", "contact", "name", "website", "portfolio"),
+}
+_SECTION_WORD_RES = {
+    kind: re.compile(rf"\b(?:{'|'.join(map(re.escape, words))})(?:s|es)?\b") for kind, words in _SECTION_WORDS.items()
+}
+
+# Instructions that retarget the whole resume rather than edit one part of it:
+# "Tailor for a Data Engineer role at Stripe", "make it one page"
+_WHOLE_DOCUMENT_RE = re.compile(
+    r"\b(?:tailor\w*|job descriptions?|jd|job postings?|postings?|apply\w*|one[- ]page)\b"
+    r"|\b(?:for|at|towards?)\b.*\b(?:role|job|position|opening)s?\b",
+    re.I,
+)
+
+# Longer input is a job description, which can touch every section
+TARGETED_INSTRUCTION_MAX_CHARS = 400
+
+
+class LatexDocument:
+    """A Jake Ryan resume split at its ``\\section`` lines.
+
+    ``head`` is the preamble up to and including ``\\begin{document}``,
+    ``sections`` maps titles (plus ``Heading`` for the name and contact
+    block) to their LaTeX in document order, and ``tail`` is
+    ``\\end{document}`` onwards.
+    """
+
+    def __init__(self, head: str, sections: Dict[str, str], tail: str):
+        self.head = head
+        self.sections = sections
+        self.tail = tail
+
+    @classmethod
+    def split(cls, latex: str) -> Optional["LatexDocument"]:
+        """Split ``latex``, or return None if it has no sections to split on."""
+        begin = _BEGIN_RE.search(latex)
+        if begin is None:
+            return None
+        ends = list(_END_RE.finditer(latex, begin.end()))
+        end = ends[-1].start() if ends else len(latex)
+        starts = list(_SECTION_RE.finditer(latex, begin.end(), end))
+        if not starts:
+            return None
+
+        sections = {HEADING: latex[begin.end():starts[0].start()]}
+        for i, match in enumerate(starts):
+            name = match.group(1).strip()
+            stop = starts[i + 1].start() if i + 1 < len(starts) else end
+            if name in sections:
+                # Repeated titles can't be addressed by name; keep them together
+                sections[name] += latex[match.start():stop]
+            else:
+                sections[name] = latex[match.start():stop]
+        return cls(latex[:begin.end()], sections, latex[end:])
+
+    def render(self) -> str:
+        return self.head + "".join(self.sections.values()) + self.tail
+
+    def relevant(self, instruction: str) -> List[str]:
+        """Sections a short, targeted instruction is about; all for anything else.
+
+        Job descriptions and "tailor for ... role" instructions get every
+        section, as does an instruction that names no section of this
+        resume ("add certification Z" to one without Certifications).
+        """
+        if len(instruction) > TARGETED_INSTRUCTION_MAX_CHARS or _WHOLE_DOCUMENT_RE.search(instruction):
+            return list(self.sections)
+        text = instruction.lower()
+        kinds = {kind for kind, pattern in _SECTION_WORD_RES.items() if pattern.search(text)}
+        chosen = [
+            name for name in self.sections
+            if name.lower() in kinds or re.search(rf"\b{re.escape(name.lower())}\b", text)
+        ]
+        # Proper nouns ("remove the Accenture role") point at whichever section names them
+        for match in re.finditer(r"\b[A-Z][\w+#&-]{2,}", instruction):
+            if match.start() == 0:
+                continue  # usually the verb ("Remove ...")
+            word = re.compile(rf"(?<!\w){re.escape(match.group())}(?!\w)")
+            chosen += [name for name, body in self.sections.items() if name not in chosen and word.search(body)]
+        if not chosen:
+            return list(self.sections)
+        return [name for name in self.sections if name in chosen]
+
+    def outline(self, included: List[str]) -> str:
+        lines = []
+        for name, body in self.sections.items():
+            entries = len(re.findall(r"\\resume(?:Subheading|ProjectHeading)\b", body))
+            bullets = len(re.findall(r"\\resumeItem\{", body))
+            detail = f"{entries} entries, {bullets} bullets" if entries else f"{len(body.strip())} characters"
+            state = "included below" if name in included else "not included"
+            lines.append(f"- {name} ({detail}; {state})")
+        return "\n".join(lines)
+
+    def merge(self, replacements: list) -> str:
+        """Apply the model's section replacements and return the whole document.
+
+        Each replacement is ``{"name", "latex"[, "after"]}``: an empty
+        ``latex`` removes the section and an unknown name adds one, after
+        ``after`` when given, else at the end. Raises ValueError on
+        anything else.
+        """
+        if not isinstance(replacements, list):
+            raise ValueError("sections must be a list")
+        sections = dict(self.sections)
+        by_lower = {name.lower(): name for name in sections}
+        for replacement in replacements:
+            if not isinstance(replacement, dict) or not isinstance(replacement.get("latex"), str):
+                raise ValueError("Each section needs a name and latex")
+            name = str(replacement.get("name", "")).strip()
+            latex = replacement["latex"].strip()
+            existing = by_lower.get(name.lower())
+            if latex and existing != HEADING and not _SECTION_RE.match(latex):
+                raise ValueError(f"Section {name!r} does not start with \\section")
+            if latex:
+                latex = f"{latex}\n\n"
+
+            if existing is not None:
+                if existing == HEADING and not latex:
+                    continue  # the name block is never removed
+                if latex:
+                    sections[existing] = f"\n{latex}" if existing == HEADING else latex
+                else:
+                    del sections[existing]
+                    del by_lower[existing.lower()]
+            elif latex:
+                after = by_lower.get(str(replacement.get("after", "")).strip().lower())
+                items = list(sections.items())
+                position = [n for n, _ in items].index(after) + 1 if after else len(items)
+                items.insert(position, (name, latex))
+                sections = dict(items)
+                by_lower[name.lower()] = name
+        return LatexDocument(self.head, sections, self.tail).render()
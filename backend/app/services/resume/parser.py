@@ -1,39 +1,67 @@
-import google.generativeai as genai
+import asyncio
 import json
 import os
+import time
+from typing import Optional
 from fastapi import UploadFile
-from pypdf import PdfReader
-from docx import Document
-import io
+from app.core import metrics
+from app.core.config import settings
+from app.services.llm.cache import get_response_cache
+from app.services.llm.gateway import ApiKeyRequired, get_llm_gateway
+from app.services.resume.extraction import PageExtractor, collapse_layout
+from app.services.resume.heuristic_parser import parse_resume_text
+
+# Part of the response cache key; bump when the prompt or parsing changes
+PARSE_PROMPT_VERSION = "1"
+
+def _parse_json_response(text: str) -> dict:
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
 
 class ResumeParser:
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+    def __init__(self, api_key: Optional[str], model=None, extractor: Optional[PageExtractor] = None):
+        self.model_name = 'gemini-2.0-flash'
+        # Without a key only resumes the heuristic parser is sure of can be imported
+        if model is None and api_key:
+            # Imported here so the app loads without the Gemini SDK installed
+            from app.services.llm.clients import get_client_pool
+            model = get_client_pool().model(api_key, self.model_name)
+        # Anything with generate_content(prompt).text will do, e.g. a local fake
+        self.model = model
+        self.cache = get_response_cache()
+        self.gateway = get_llm_gateway()
+        # Size and page limits are enforced by the extractor
+        self.extractor = extractor or PageExtractor(
+            workers=1, max_bytes=settings.IMPORT_MAX_BYTES, max_pages=settings.IMPORT_MAX_PAGES,
+        )
+        self.timings = []
+        self.confidence = None
 
     async def parse_file(self, file: UploadFile) -> dict:
-        content = await file.read()
-        filename = file.filename.lower()
-        text = ""
-
         try:
-            if filename.endswith('.pdf'):
-                reader = PdfReader(io.BytesIO(content))
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            elif filename.endswith('.docx'):
-                doc = Document(io.BytesIO(content))
-                for para in doc.paragraphs:
-                    text += para.text + "\n"
-            else:
-                raise ValueError("Unsupported file format. Please upload PDF or DOCX.")
+            text, self.timings = await self.extractor.extract(file.file, file.filename or "", file.size)
+
+            # Well-structured resumes (the Jake Ryan layout, our own DOCX)
+            # are parsed by rule; the model only sees the ones that aren't
+            began = time.perf_counter()
+            data, self.confidence = await asyncio.to_thread(parse_resume_text, text)
+            self.timings.append(("heuristic", (time.perf_counter() - began) * 1000))
+            if self.confidence >= settings.IMPORT_HEURISTIC_MIN_CONFIDENCE:
+                metrics.inc("import_heuristic")
+                return data
+            if self.model is None:
+                raise ApiKeyRequired("Missing API Key")
+            metrics.inc("import_llm")
 
-            return self._extract_json_from_text(text)
+            began = time.perf_counter()
+            try:
+                return await self._extract_json_from_text(collapse_layout(text))
+            finally:
+                self.timings.append(("llm", (time.perf_counter() - began) * 1000))
         except Exception as e:
             print(f"Error parsing file: {e}")
             raise e
 
-    def _extract_json_from_text(self, text: str) -> dict:
+    async def _extract_json_from_text(self, text: str) -> dict:
         prompt = f"""
         You are an expert resume parser. Extract the following information from the resume text below and return it as a VALID JSON object.
 
@@ -87,7 +115,7 @@ class ResumeParser:
         }}
 
         RESUME TEXT:
-        {text[:10000]}  # Truncate to avoid token limits if necessary, though Gemini handles large context well.
+        {text}
 
         OUTPUT GUIDELINES:
         - Return ONLY valid JSON.
@@ -103,9 +131,11 @@ class ResumeParser:
         """
 
         try:
-            response = self.model.generate_content(prompt)
-            clean_text = response.text.replace("```json", "").replace("```", "").strip()
-            return json.loads(clean_text)
+            return await self.cache.fetch(
+                self.model_name, PARSE_PROMPT_VERSION, prompt,
+                lambda: self.gateway.run(lambda: self.model.generate_content(prompt).text),
+                _parse_json_response,
+            )
         except Exception as e:
             print(f"Error extracting JSON from text: {e}")
             raise e
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class PdfCache:
+    """Content-addressed store of compiled PDFs with LRU eviction.
+
+    Entries are ``<sha256>.pdf`` files keyed on the LaTeX source plus the
+    compiler version. Recency lives in file mtimes, so the LRU order
+    survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_entries: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self.total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key_for(latex_code: str, compiler_version: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(compiler_version.encode())
+        digest.update(b"\0")
+        digest.update(latex_code.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _load(self):
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Removed behind our back; forget it
+                self.total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return path
+
+    def put(self, key: str, pdf_path: str) -> str:
+        """Move a freshly compiled PDF into the cache and return its new path."""
+        path = self._path(key)
+        with self._lock:
+            os.replace(pdf_path, path)
+            self.total_bytes -= self._entries.pop(key, 0)
+            size = os.path.getsize(path)
+            self._entries[key] = size
+            self.total_bytes += size
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._entries and (self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self.total_bytes -= self._entries.pop(key)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
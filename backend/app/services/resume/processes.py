@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+
+async def run_process(
+    args: List[str], timeout: float, env: Optional[dict] = None, cwd: Optional[str] = None
+) -> Tuple[int, bytes]:
+    """Run ``args`` to completion without blocking the event loop.
+
+    Returns ``(returncode, stdout)``. Past ``timeout`` seconds the process
+    is killed and ``asyncio.TimeoutError`` raised; a missing program raises
+    ``FileNotFoundError``. Event loops that can't start subprocesses (the
+    selector loop uvicorn --reload runs on Windows) get ``subprocess.run``
+    on a worker thread instead.
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, env=env, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+    except NotImplementedError:
+        return await asyncio.to_thread(_run_blocking, args, timeout, env, cwd)
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout
+
+
+def _run_blocking(args: List[str], timeout: float, env: Optional[dict], cwd: Optional[str]) -> Tuple[int, bytes]:
+    try:
+        # subprocess.run kills the child itself on timeout
+        completed = subprocess.run(
+            args, env=env, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise asyncio.TimeoutError()
+    return completed.returncode, completed.stdout
+
+
+class SpawnPool:
+    """A process pool started on first use and replaced once it breaks.
+
+    A worker that dies (out of memory, killed) takes its whole
+    ``ProcessPoolExecutor`` with it; callers that see ``BrokenProcessPool``
+    hand the pool to ``discard`` and the next ``get`` starts a fresh one.
+    """
+
+    def __init__(self, workers: int, initializer: Optional[Callable[[], None]] = None):
+        self.workers = workers
+        self.initializer = initializer
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def get(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the server process has threads of its own
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+            )
+        return self._executor
+
+    def discard(self, pool: ProcessPoolExecutor):
+        # Another caller may already have replaced it
+        if self._executor is pool:
+            self._executor = None
+        pool.shutdown(wait=False)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
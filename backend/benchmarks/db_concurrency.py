@@ -0,0 +1,160 @@
+"""Concurrent reads and writes against a scratch copy of the tracker database.
+
+Readers list jobs with their contacts, as GET /jobs/ does, and writers add
+a note and move a job's status, each through its own session the way a
+request would. Every configuration runs the same workload on a fresh file,
+from as many threads as AnyIO runs sync handlers in. The output is
+per-operation latency and the number of "database is locked" errors.
+
+``legacy`` is the engine the app used to build: rollback journal and
+SQLAlchemy's default pool. The others are ``create_sqlite_engine`` at each
+``--pool-sizes`` entry. All of them wait ``--busy-timeout-ms`` for a lock
+before giving up. Run from backend/:
+
+    python -m benchmarks.db_concurrency --pool-sizes 5,10,20,40
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from app.core.config import settings
+
+# Keep app.core.database from creating the real database directory
+settings.DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="career-bench-"), "career.db")
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import joinedload, sessionmaker
+from app.core.database import Base, create_sqlite_engine
+from app.core.migrations import run_migrations
+from app.models import job_tracker as models
+
+STATUSES = ("Applied", "Interviewing", "Offer", "Rejected")
+
+
+def seed(engine, contacts: int = 500, jobs_per_contact: int = 4):
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    session = sessionmaker(bind=engine)()
+    for c in range(contacts):
+        contact = models.Contact(name=f"Contact {c}", company=f"Company {c % 40}")
+        session.add(contact)
+        session.flush()
+        session.add_all(
+            models.Job(company=f"Company {c % 40}", position=f"Engineer {j}",
+                       status=STATUSES[(c + j) % 4], contact_id=contact.id)
+            for j in range(jobs_per_contact)
+        )
+    session.commit()
+    session.close()
+
+
+def run_load(engine, readers: int, writers: int, ops: int) -> Dict[str, object]:
+    """Run ``ops`` operations on each reader and writer thread, all at once."""
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as session:
+        job_ids = [job_id for (job_id,) in session.query(models.Job.id)]
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    locked = {"read": 0, "write": 0}
+    lock = threading.Lock()
+    start = threading.Barrier(readers + writers)
+
+    def read(session, rng):
+        offset = rng.randrange(max(1, len(job_ids) - 100))
+        (session.query(models.Job).options(joinedload(models.Job.contact))
+         .order_by(models.Job.id.desc()).offset(offset).limit(100).all())
+
+    def write(session, rng):
+        session.add(models.Note(title="Follow up", content="Sent a thank-you note"))
+        job = session.get(models.Job, rng.choice(job_ids))
+        job.status = rng.choice(STATUSES)
+        session.commit()
+
+    def worker(kind, operation, seed_value):
+        rng = random.Random(seed_value)
+        start.wait()
+        for _ in range(ops):
+            session = Session()
+            began = time.perf_counter()
+            try:
+                operation(session, rng)
+            except OperationalError as e:
+                if "database is locked" not in str(e):
+                    raise
+                session.rollback()
+                with lock:
+                    locked[kind] += 1
+                continue
+            finally:
+                session.close()
+            with lock:
+                latencies[kind].append(time.perf_counter() - began)
+
+    threads = [threading.Thread(target=worker, args=("read", read, i)) for i in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write", write, -i)) for i in range(1, writers + 1)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    result: Dict[str, object] = {"ops_per_s": (readers + writers) * ops / elapsed}
+    for kind, samples in latencies.items():
+        samples.sort()
+        result[kind] = {
+            "p50_ms": statistics.median(samples) * 1000 if samples else None,
+            "p99_ms": samples[int(len(samples) * 0.99) - 1] * 1000 if samples else None,
+            "locked": locked[kind],
+        }
+    return result
+
+
+def legacy_engine(url: str):
+    return create_engine(url, connect_args={
+        "check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--pool-sizes", default="5,10,20,40")
+    parser.add_argument("--busy-timeout-ms", type=int, default=settings.SQLITE_BUSY_TIMEOUT_MS)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per configuration; the median is shown")
+    args = parser.parse_args()
+    settings.SQLITE_BUSY_TIMEOUT_MS = args.busy_timeout_ms
+
+    configurations = [("legacy", legacy_engine)]
+    for size in (int(size) for size in args.pool_sizes.split(",")):
+        configurations.append((f"pool_size={size}", lambda url, size=size: create_sqlite_engine(url, pool_size=size)))
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.ops} ops each, "
+          f"busy timeout {args.busy_timeout_ms} ms, median of {args.repeat}")
+    print(f"{'engine':<14}{'ops/s':>8}{'read p50':>10}{'read p99':>10}{'write p50':>11}{'write p99':>11}{'locked':>8}")
+    for name, factory in configurations:
+        runs = []
+        for _ in range(args.repeat):
+            directory = tempfile.mkdtemp(prefix="career-bench-")
+            engine = factory(f"sqlite:///{os.path.join(directory, 'career.db')}")
+            seed(engine)
+            runs.append(run_load(engine, args.readers, args.writers, args.ops))
+            engine.dispose()
+        median = lambda pick: statistics.median(pick(run) for run in runs)
+        print(
+            f"{name:<14}{median(lambda r: r['ops_per_s']):>8.0f}"
+            f"{median(lambda r: r['read']['p50_ms']):>10.2f}{median(lambda r: r['read']['p99_ms']):>10.2f}"
+            f"{median(lambda r: r['write']['p50_ms']):>11.2f}{median(lambda r: r['write']['p99_ms']):>11.2f}"
+            f"{median(lambda r: r['read']['locked'] + r['write']['locked']):>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Cold vs warm pdflatex compiles of the bundled Jake Ryan template.
+
+Cold runs load the whole preamble every time. Warm runs start from a format
+that ``FormatCache`` dumped for it with mylatexformat. Both go through
+``LatexCompiler`` one at a time, without a PDF cache. Needs pdflatex (and
+mylatexformat for the warm half). Run from backend/:
+
+    python -m benchmarks.latex_compile --runs 10
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from app.core import metrics
+from app.services.resume.compiler import LatexCompiler
+from app.services.resume.latex_formats import FormatCache
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "app", "templates", "jake_ryan.tex")
+
+
+async def time_compiles(compiler: LatexCompiler, source: str, runs: int):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        job = await compiler.compile(source)
+        timings.append(time.perf_counter() - started)
+        if job.status != "done":
+            raise SystemExit(f"Compile failed: {job.error}")
+    return timings
+
+
+async def main(runs: int, timeout: float):
+    with open(TEMPLATE) as f:
+        source = f.read()
+    directory = tempfile.mkdtemp(prefix="latex-bench-")
+    try:
+        cold = LatexCompiler(os.path.join(directory, "cold"), concurrency=1, queue_size=1,
+                             timeout=timeout, job_ttl=3600)
+        formats = FormatCache(os.path.join(directory, "formats"), max_formats=1, timeout=timeout)
+        warm = LatexCompiler(os.path.join(directory, "warm"), concurrency=1, queue_size=1,
+                             timeout=timeout, job_ttl=3600, formats=formats)
+
+        # The first warm compile is cold and builds the format
+        await time_compiles(warm, source, 1)
+        await asyncio.gather(*formats._tasks)
+        if not len(formats):
+            raise SystemExit("The format could not be built; is mylatexformat installed?")
+
+        results = {"cold": await time_compiles(cold, source, runs)}
+        fallbacks = metrics.snapshot()["counters"].get("latex_warm_fallbacks", 0)
+        results["warm"] = await time_compiles(warm, source, runs)
+        if metrics.snapshot()["counters"].get("latex_warm_fallbacks", 0) != fallbacks:
+            raise SystemExit("Warm compiles fell back to cold; the format doesn't load")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{runs} compiles each of {os.path.basename(TEMPLATE)}")
+    print(f"{'':<6}{'median':>10}{'min':>10}{'max':>10}")
+    for name, timings in results.items():
+        print(f"{name:<6}{statistics.median(timings) * 1000:>8.0f}ms{min(timings) * 1000:>8.0f}ms"
+              f"{max(timings) * 1000:>8.0f}ms")
+    speedup = statistics.median(results["cold"]) / statistics.median(results["warm"])
+    print(f"warm is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+    if shutil.which("pdflatex") is None:
+        sys.exit("pdflatex is not on PATH")
+    asyncio.run(main(args.runs, args.timeout))
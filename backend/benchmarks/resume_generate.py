@@ -0,0 +1,85 @@
+"""Requests/sec of POST /resumes/generate, rendered in memory vs ?persist=true.
+
+Both modes render the same resume through the full app (routing,
+validation, the sync handler's threadpool) from ``--concurrency``
+clients at once. Persisted files go to a scratch directory that is removed
+afterwards. Run from backend/:
+
+    python -m benchmarks.resume_generate --requests 400 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from app.core.config import settings
+
+# Keep app.core.database from creating the real database directory
+settings.DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="career-bench-"), "career.db")
+
+import httpx
+from app.api.v1 import resumes
+from app.main import app
+
+RESUME = {
+    "name": "Jane Doe",
+    "email": "jane@example.com",
+    "phone": "+1 555 010 2030",
+    "linkedin": "https://www.linkedin.com/in/jane-doe/",
+    "summary": "Backend engineer with five years of Python and distributed systems.",
+    "education": [{"school": "State University", "location": "Austin, TX", "degree": "B.S. Computer Science", "date": "2018"}],
+    "certifications": [{"name": "AWS Solutions Architect", "provider": "Amazon", "url": "https://example.com/verify/1"}],
+    "experience": [
+        {"title": f"Engineer {i}", "company": f"Company {i}", "location": "Remote", "date": "2019 – 2021",
+         "bullets": [f"Shipped feature {i}.{b} used by thousands of customers" for b in range(4)]}
+        for i in range(4)
+    ],
+    "projects": [{"name": "Gitlytics", "stack": "Python, Flask", "date": "2021", "bullets": ["Analyzed a million commits"]}],
+    "skills": {"Languages": "Python, Go, SQL", "Tools": "Docker, Kubernetes, Terraform"},
+}
+
+
+async def measure(http: httpx.AsyncClient, url: str, requests: int, concurrency: int):
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def client():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await http.post(url, json=RESUME)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise SystemExit(f"{url} answered {response.status_code}: {response.text}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return requests / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def main(requests: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        print(f"{requests} requests from {concurrency} clients")
+        print(f"{'mode':<10}{'req/s':>8}{'p50':>10}{'p99':>10}")
+        for mode, url in (("memory", "/api/v1/resumes/generate"), ("persist", "/api/v1/resumes/generate?persist=true")):
+            await measure(http, url, concurrency * 2, concurrency)  # warm up
+            rate, p50, p99 = await measure(http, url, requests, concurrency)
+            print(f"{mode:<10}{rate:>8.0f}{p50 * 1000:>8.1f}ms{p99 * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    resumes.OUTPUT_DIR = tempfile.mkdtemp(prefix="resume-bench-")
+    try:
+        asyncio.run(main(args.requests, args.concurrency))
+    finally:
+        shutil.rmtree(resumes.OUTPUT_DIR, ignore_errors=True)
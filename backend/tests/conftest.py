@@ -0,0 +1,72 @@
+import os
+import tempfile
+import pytest
+from app.core.config import settings
+
+# Point the app at a throwaway database (and LLM cache next to it) before
+# app.core.database builds its engine
+settings.DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="career-tests-"), "career.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core import http_cache
+from app.core.database import Base, SessionLocal, engine
+from app.core.migrations import run_migrations
+from app.models import job_tracker as models
+
+
+@pytest.fixture(scope="session")
+def db_engine():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return engine
+
+
+@pytest.fixture
+def db(db_engine):
+    session = SessionLocal()
+    for model in (models.Task, models.Job, models.Contact, models.Note, models.Company):
+        session.query(model).delete()
+    session.commit()
+    with http_cache._lock:
+        http_cache._pages.clear()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def seed(db):
+    """``seed(contacts, jobs_per_contact, tasks_per_contact)`` fills the tracker tables."""
+    def fill(contacts: int, jobs_per_contact: int = 2, tasks_per_contact: int = 2):
+        for c in range(contacts):
+            contact = models.Contact(name=f"Contact {c}", company=f"Company {c % 7}")
+            contact.tasks = [models.Task(text=f"Task {t}") for t in range(tasks_per_contact)]
+            db.add(contact)
+            db.flush()
+            for j in range(jobs_per_contact):
+                db.add(models.Job(
+                    company=f"Company {c % 7}", position=f"Engineer {j}",
+                    status=("Applied", "Interviewing", "Offer", "Rejected")[(c + j) % 4],
+                    contact_id=contact.id,
+                ))
+        db.commit()
+    return fill
+
+
+@pytest.fixture(scope="session")
+def client(db_engine):
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(db_engine):
+    """Every ``(sql, parameters)`` the engine executes while the test runs."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(db_engine, "before_cursor_execute", capture)
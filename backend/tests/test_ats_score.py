@@ -0,0 +1,86 @@
+import pytest
+from app.services.resume.ats_score import job_keywords, latex_to_text, score_resume, stem
+
+
+def keywords(job_description):
+    return [keyword for _, keyword, _ in job_keywords(job_description)]
+
+
+@pytest.mark.parametrize("forms", [
+    ("managed", "manager", "management", "manages"),
+    ("deploy", "deployed", "deploying", "deployments"),
+    ("optimize", "optimization", "optimizations"),
+    ("plan", "planning", "planned"),
+    ("service", "services"),
+])
+def test_inflections_share_a_stem(forms):
+    assert len({stem(form) for form in forms}) == 1
+
+
+@pytest.mark.parametrize("word", ["analysis", "status", "class", "api", "sql", "c++", "c#", "s3"])
+def test_stem_leaves_these_alone(word):
+    assert stem(word) == word
+
+
+@pytest.mark.parametrize("resume, posting, keyword", [
+    ("Administered Active Directory for 2,000 users", "Maintain AD and GPO", "AD"),
+    ("Administered AD for 2,000 users", "Experience with Active Directory", "Active Directory"),
+    ("Ran k8s clusters", "Deploy to Kubernetes", "Kubernetes"),
+    ("Migrated services to Amazon Web Services", "Hands-on AWS", "AWS"),
+    ("Built services in C# on .NET", "Develop APIs in csharp", "csharp"),
+    ("Set up continuous integration", "Own our CI/CD", "CI/CD"),
+])
+def test_acronyms_and_spelled_out_forms_match(resume, posting, keyword):
+    matched = [k["keyword"] for k in score_resume(resume, posting)["matched"]]
+    assert keyword in matched
+
+
+def test_two_letter_acronyms_need_capitals():
+    assert "AD" in keywords("Manage AD accounts")
+    # "ad" the word is just a word, not Active Directory
+    assert score_resume("Administered Active Directory", "Place an ad")["matched"] == []
+    assert score_resume("Placed an ad", "Manage AD accounts")["matched"] == []
+
+
+@pytest.mark.parametrize("filler", ["need", "needs", "needed", "someone", "ideally", "preferably", "know", "e.g", "ll"])
+def test_filler_words_are_not_keywords(filler):
+    posting = (
+        "We need someone who knows Python. You'll need Terraform and ideally Go; "
+        "needs to know Kafka, e.g. Kafka Streams. Preferably someone who needed Redis before."
+    )
+    assert filler not in {keyword.lower() for keyword in keywords(posting)}
+    assert {"Python", "Terraform", "Go", "Kafka", "Redis"} <= set(keywords(posting))
+
+
+def test_score_is_the_weighted_share_of_keywords_present():
+    posting = "Python, Python, Python. Kafka. Terraform."
+    weights = {keyword: weight for _, keyword, weight in job_keywords(posting)}
+    # Repeated keywords weigh more
+    assert weights["Python"] > weights["Kafka"] == weights["Terraform"]
+
+    assert score_resume("Python and Kafka and Terraform", posting)["score"] == 100.0
+    assert score_resume("Gardening", posting)["score"] == 0.0
+    partial = score_resume("Wrote Python", posting)
+    assert partial["score"] == round(100 * weights["Python"] / sum(weights.values()), 1)
+    # Heaviest first, so the top of "missing" is what to add next
+    assert [k["keyword"] for k in partial["missing"]] == ["Kafka", "Terraform"]
+
+
+def test_two_word_phrases_count_only_when_repeated():
+    once = keywords("Experience with data pipelines. Kafka.")
+    twice = keywords("Build data pipelines. Monitor data pipelines.")
+    assert "data pipelines" not in once
+    assert "data pipelines" in twice
+
+
+def test_empty_job_description_scores_zero():
+    assert score_resume("Python", "") == {"score": 0.0, "matched": [], "missing": []}
+
+
+def test_latex_to_text_keeps_the_body_text():
+    latex = (
+        "\\documentclass{article}\\usepackage{hyperref}\n\\begin{document}\n"
+        "\\textbf{Python} \\& SQL % comment\n\\href{https://x.y}{\\underline{Site}}\n\\end{document}"
+    )
+    words = latex_to_text(latex).split()
+    assert words == ["Python", "&", "SQL", "Site"]
@@ -0,0 +1,32 @@
+from app.models import job_tracker as models
+
+
+def test_bulk_create_ids_belong_to_their_rows(client, seed, db, statements):
+    seed(contacts=3)
+    rows = [
+        {"company": "Acme", "position": "Engineer 0"},
+        {"company": "Acme"},  # no position
+        {"company": "Initech", "position": "Engineer 2", "status": "Interviewing"},
+        {"position": "Engineer 3"},  # no company
+        {"company": "Globex", "position": "Engineer 4"},
+    ]
+    statements.clear()
+    response = client.post("/api/v1/jobs/bulk", json=rows)
+    assert response.status_code == 200
+    results = response.json()
+
+    assert [r["ok"] for r in results] == [True, False, True, False, True]
+    assert [sql for sql, _ in statements if "max(" in sql.lower()] == []
+    for result in results:
+        if result["ok"]:
+            job = db.get(models.Job, result["id"])
+            assert job.position == rows[result["index"]]["position"]
+            assert job.company == rows[result["index"]]["company"]
+
+
+def test_bulk_create_contacts_reports_ids_in_input_order(client, db):
+    rows = [{"name": f"Contact {i}", "company": "Acme"} for i in range(50)]
+    results = client.post("/api/v1/contacts/bulk", json=rows).json()
+    assert all(r["ok"] for r in results)
+    for result in results:
+        assert db.get(models.Contact, result["id"]).name == f"Contact {result['index']}"
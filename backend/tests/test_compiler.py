@@ -0,0 +1,211 @@
+import asyncio
+import os
+import shutil
+import sys
+import time
+import pytest
+from app.core import metrics
+from app.services.resume import processes
+from app.services.resume.compiler import LatexCompiler
+from app.services.resume.pdf_cache import PdfCache
+from app.services.resume.processes import run_process
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "app", "templates", "jake_ryan.tex")
+
+
+@pytest.fixture
+def selector_loop(monkeypatch):
+    """Behave like the selector event loop on Windows, which can't start subprocesses."""
+    async def unsupported(*args, **kwargs):
+        raise NotImplementedError
+    monkeypatch.setattr(processes.asyncio, "create_subprocess_exec", unsupported)
+
+
+@pytest.fixture
+def no_pdflatex(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+
+def test_run_process(selector_loop):
+    returncode, stdout = asyncio.run(run_process([sys.executable, "-c", "print('hello')"], timeout=10))
+    assert (returncode, stdout.strip()) == (0, b"hello")
+
+
+@pytest.mark.parametrize("loop_kind", ["default", "selector"])
+def test_run_process_timeout(request, loop_kind):
+    if loop_kind == "selector":
+        request.getfixturevalue("selector_loop")
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run_process([sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.2))
+
+
+@pytest.mark.parametrize("loop_kind", ["default", "selector"])
+def test_missing_pdflatex_fails_the_job_with_a_message(request, tmp_path, no_pdflatex, loop_kind):
+    if loop_kind == "selector":
+        request.getfixturevalue("selector_loop")
+    compiler = LatexCompiler(str(tmp_path), concurrency=1, queue_size=4, timeout=10, job_ttl=60)
+
+    async def scenario():
+        return await compiler.compiler_version(), await compiler.compile("\\documentclass{article}")
+
+    version, job = asyncio.run(scenario())
+    assert version == "unavailable"
+    assert job.status == "failed"
+    assert "pdflatex command not found" in job.error
+
+
+class InstantTex(LatexCompiler):
+    """Writes the source out as the "PDF" instead of running pdflatex."""
+
+    async def _pdflatex(self, job, tex_file, deadline, format_name=None):
+        with open(tex_file, "rb") as source, open(os.path.join(job.job_dir, "resume.pdf"), "wb") as pdf:
+            pdf.write(b"%PDF-" + source.read())
+        return 0, b""
+
+
+@pytest.fixture
+def cached_compiler(tmp_path):
+    cache = PdfCache(str(tmp_path / "cache"), max_bytes=1 << 20, max_entries=2)
+    return InstantTex(str(tmp_path / "jobs"), concurrency=1, queue_size=8, timeout=10, job_ttl=3600, cache=cache)
+
+
+def test_cache_hits_are_not_registered_as_jobs(cached_compiler):
+    async def scenario():
+        first = await cached_compiler.compile("one")
+        hits = [await cached_compiler.compile("one") for _ in range(20)]
+        return first, hits
+
+    first, hits = asyncio.run(scenario())
+    assert list(cached_compiler.jobs) == [first.id]
+    assert all(hit.status == "done" for hit in hits)
+    # A hit's id still resolves, straight from the cache
+    assert cached_compiler.read_pdf(cached_compiler.get(hits[0].id)) == b"%PDF-one"
+
+
+def test_evicted_pdf_reads_as_gone(cached_compiler):
+    async def scenario():
+        return [await cached_compiler.compile(source) for source in ("one", "two", "three")]
+
+    first, _, third = asyncio.run(scenario())
+    # max_entries=2, so "one" has been evicted while its job is still listed
+    assert cached_compiler.get(first.id) is first
+    assert cached_compiler.read_pdf(first) is None
+    assert cached_compiler.read_pdf(third) == b"%PDF-three"
+
+
+def test_pdf_route_answers_410_after_eviction(client, cached_compiler, monkeypatch):
+    from app.api.v1 import resumes
+    monkeypatch.setattr(resumes, "compiler", cached_compiler)
+
+    job_ids = []
+    for source in ("one", "two", "three"):
+        response = client.post("/api/v1/resumes/compile/jobs", json={"latex_code": source})
+        assert response.status_code == 202
+        job_ids.append(response.json()["job_id"])
+        while client.get(f"/api/v1/resumes/compile/jobs/{job_ids[-1]}").json()["status"] in ("queued", "running"):
+            time.sleep(0.01)
+
+    assert client.get(f"/api/v1/resumes/compile/jobs/{job_ids[0]}/pdf").status_code == 410
+    latest = client.get(f"/api/v1/resumes/compile/jobs/{job_ids[2]}/pdf")
+    assert latest.status_code == 200
+    assert latest.content == b"%PDF-three"
+    assert latest.headers["content-disposition"] == 'attachment; filename="resume.pdf"'
+
+
+FAKE_PDFLATEX = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("pdfTeX 3.141592653 (fake)")
+    sys.exit(0)
+time.sleep({seconds})
+if any(arg.startswith("-fmt=") for arg in args):
+    sys.exit(1)  # the format is stale
+out = args[args.index("-output-directory") + 1]
+with open(os.path.join(out, "resume.pdf"), "wb") as pdf:
+    pdf.write(b"%PDF-fake")
+"""
+
+
+@pytest.fixture
+def slow_pdflatex(monkeypatch, tmp_path):
+    """A pdflatex taking 0.6 s a run, whose warm (``-fmt``) runs always fail."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "pdflatex"
+    script.write_text(FAKE_PDFLATEX.format(python=sys.executable, seconds=0.6))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+
+def test_warm_fallback_shares_the_job_timeout(tmp_path, slow_pdflatex):
+    from app.services.resume.latex_formats import FormatCache
+
+    source = "\\documentclass{article}\n\\begin{document}\nHi\n\\end{document}\n"
+    formats = FormatCache(str(tmp_path / "formats"), max_formats=2, timeout=10)
+
+    async def scenario(timeout):
+        compiler = LatexCompiler(str(tmp_path / "jobs"), concurrency=1, queue_size=4,
+                                 timeout=timeout, job_ttl=60, formats=formats)
+        key = formats.key_for(formats.split_preamble(source), await compiler.compiler_version())
+        open(os.path.join(formats.directory, f"{key}.fmt"), "w").close()
+        started = time.perf_counter()
+        job = await compiler.compile(source)
+        return job, time.perf_counter() - started
+
+    # Warm (0.6 s, fails) then cold (0.6 s) doesn't fit in one second
+    job, elapsed = asyncio.run(scenario(timeout=1.0))
+    assert job.status == "failed"
+    assert job.error == "Compilation timed out."
+    assert elapsed < 1.3
+
+    job, _ = asyncio.run(scenario(timeout=5.0))
+    assert job.status == "done"
+
+
+@pytest.mark.skipif(shutil.which("pdflatex") is None, reason="pdflatex is not installed")
+def test_bundled_template_compiles_cold_then_warm(tmp_path):
+    from app.services.resume.latex_formats import FormatCache
+
+    with open(TEMPLATE) as f:
+        source = f.read()
+    formats = FormatCache(str(tmp_path / "formats"), max_formats=2, timeout=120)
+    compiler = LatexCompiler(str(tmp_path / "jobs"), concurrency=1, queue_size=4,
+                             timeout=120, job_ttl=60, formats=formats)
+
+    async def scenario():
+        cold = await compiler.compile(source)
+        await asyncio.gather(*formats._tasks)
+        warm = await compiler.compile(source + "\n")
+        return cold, warm
+
+    before = metrics.snapshot()["counters"]
+    cold, warm = asyncio.run(scenario())
+    counted = lambda name: metrics.snapshot()["counters"].get(name, 0) - before.get(name, 0)
+    assert cold.status == "done", cold.error
+    assert compiler.read_pdf(cold).startswith(b"%PDF")
+    assert warm.status == "done", warm.error
+    assert compiler.read_pdf(warm).startswith(b"%PDF")
+    if counted("latex_format_build_failures"):
+        pytest.skip("mylatexformat is not installed")
+    assert counted("latex_warm_compiles") == 1
+
+
+def test_spawn_pool_replaces_a_broken_pool():
+    from concurrent.futures.process import BrokenProcessPool
+    from app.services.resume.processes import SpawnPool
+
+    processes = SpawnPool(workers=1)
+    try:
+        pool = processes.get()
+        assert processes.get() is pool
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result(timeout=60)
+        processes.discard(pool)
+        # Discarding again (say, from a second caller) leaves the new pool alone
+        fresh = processes.get()
+        processes.discard(pool)
+        assert processes.get() is fresh is not pool
+        assert fresh.submit(abs, -3).result(timeout=60) == 3
+    finally:
+        processes.shutdown()
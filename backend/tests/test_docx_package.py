@@ -0,0 +1,61 @@
+import io
+import zipfile
+import pytest
+from docx import Document
+from app.services.resume.generator import ResumeGenerator
+
+RESUME = {
+    "name": "Jane O'Neil",
+    "email": "jane@example.com",
+    "phone": "+1 (555) 010-2030",
+    "linkedin": "https://www.linkedin.com/in/jane-doe/",
+    "summary": "Backend engineer – 5+ years, 99.9% uptime.",
+    "education": [
+        {"school": "Texas A&M University", "location": "College Station, TX", "degree": "B.S. Computer Science", "date": "2018"},
+    ],
+    "certifications": [{"name": "CCNA", "provider": "Cisco", "url": "https://example.com/verify/1"}],
+    "experience": [
+        {"title": "Senior Engineer", "company": "Acme", "location": "Remote", "date": "2020 – Present",
+         "bullets": ["Cut p99 latency by 40%", "Owned <config> & templates"]},
+    ],
+    "projects": [{"name": "Gitlytics", "stack": "Python, Flask", "date": "2021", "bullets": ["Analyzed 10^6 commits"]}],
+    "skills": {"Languages": "Python, C#, SQL"},
+}
+
+
+@pytest.fixture(scope="module")
+def rendered():
+    return ResumeGenerator().render(RESUME).getvalue()
+
+
+def test_package_is_a_valid_zip(rendered):
+    with zipfile.ZipFile(io.BytesIO(rendered)) as package:
+        assert package.testzip() is None
+        names = package.namelist()
+        assert len(names) == len(set(names))
+        assert "[Content_Types].xml" in names
+        assert "word/document.xml" in names
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in package.infolist())
+
+
+def test_package_opens_in_python_docx(rendered):
+    document = Document(io.BytesIO(rendered))
+    text = [p.text for p in document.paragraphs]
+    assert text[0] == "Jane O'Neil"
+    assert "Backend engineer – 5+ years, 99.9% uptime." in text
+    assert "Texas A&M University\tCollege Station, TX" in text
+    assert "Owned <config> & templates" in text
+    assert "Languages: Python, C#, SQL" in text
+
+
+def test_links_are_external_relationships(rendered):
+    document = Document(io.BytesIO(rendered))
+    targets = {rel.target_ref for rel in document.part.rels.values() if rel.is_external}
+    assert {"mailto:jane@example.com", RESUME["linkedin"], "https://example.com/verify/1"} <= targets
+
+
+def test_renders_are_independent():
+    generator = ResumeGenerator()
+    first = generator.render(RESUME).getvalue()
+    generator.render({**RESUME, "name": "Someone Else"})
+    assert generator.render(RESUME).getvalue() == first
@@ -0,0 +1,138 @@
+import asyncio
+import io
+import json
+import pytest
+from docx import Document
+from fastapi import UploadFile
+from app.core.config import settings
+from app.services.llm.gateway import ApiKeyRequired
+from app.services.resume.generator import ResumeGenerator
+from app.services.resume.heuristic_parser import parse_resume_text
+from app.services.resume.parser import ResumeParser
+from tests.test_docx_package import RESUME
+from tests.test_llm_cache import FakeModel
+
+JAKE_RYAN_TEXT = """Jane Doe
++1 555-010-2030 | jane@example.com | linkedin.com/in/jane | github.com/jane
+Education
+Texas A&M University\t\tCollege Station, TX
+B.S. Computer Science\t\tAug. 2014 -- May 2018
+Experience
+Senior Engineer    Jan 2020 -- Present
+Acme Corp    Remote
+• Cut p99 latency by 40% with caching
+• Owned deploy tooling for 120 services
+Projects
+Gitlytics | Python, Flask, React    2021
+• Analyzed a million commits
+Technical Skills
+Languages: Python, C#, SQL
+Developer Tools: Git, Docker
+"""
+
+PROSE = (
+    "I am a hardworking person who likes computers.\n"
+    "I have worked at many places over the years and would love to work for you.\n"
+    "Call me anytime.\n"
+)
+
+
+def test_structured_resume_clears_the_threshold():
+    data, confidence = parse_resume_text(JAKE_RYAN_TEXT)
+    assert confidence >= settings.IMPORT_HEURISTIC_MIN_CONFIDENCE
+    assert data["personal_info"] == {
+        "name": "Jane Doe", "email": "jane@example.com", "phone": "+1 555-010-2030",
+        "linkedin": "linkedin.com/in/jane", "github": "github.com/jane",
+    }
+    assert data["education"] == [{
+        "school": "Texas A&M University", "location": "College Station, TX",
+        "degree": "B.S. Computer Science", "dates": "Aug. 2014 -- May 2018",
+    }]
+    assert data["experience"][0]["bullets"] == ["Cut p99 latency by 40% with caching", "Owned deploy tooling for 120 services"]
+    assert data["projects"] == [
+        {"name": "Gitlytics", "technologies": "Python, Flask, React", "dates": "2021", "bullets": ["Analyzed a million commits"]},
+    ]
+    assert data["skills"] == {"languages": "Python, C#, SQL", "developer_tools": "Git, Docker"}
+
+
+def test_prose_falls_below_the_threshold():
+    _, confidence = parse_resume_text(PROSE)
+    assert confidence < settings.IMPORT_HEURISTIC_MIN_CONFIDENCE
+
+
+def test_unsplittable_entries_lower_the_confidence():
+    clean = parse_resume_text(JAKE_RYAN_TEXT)[1]
+    messy = parse_resume_text(JAKE_RYAN_TEXT.replace("Senior Engineer    Jan 2020 -- Present", "Senior engineer at a big firm"))[1]
+    assert messy < clean
+
+
+@pytest.mark.parametrize("title_line, company_line, expected", [
+    # Column gaps from PDF layout text or DOCX tabs
+    ("Senior Engineer    Jan 2020 -- Present", "Acme Corp    Remote", ("Senior Engineer", "Jan 2020 -- Present", "Acme Corp", "Remote")),
+    ("Senior Engineer\tJan 2020 – Present", "Acme Corp\tAustin, TX", ("Senior Engineer", "Jan 2020 – Present", "Acme Corp", "Austin, TX")),
+    # No gap: the split is guessed from the dates and the "City, ST" shape
+    ("Software Engineer Intern Summer 2019", "Initech Austin, TX", ("Software Engineer Intern", "Summer 2019", "Initech", "Austin, TX")),
+    ("Data Analyst | 03/2017 - 12/2018", "Globex Corporation New York, NY", ("Data Analyst", "03/2017 - 12/2018", "Globex Corporation", "New York, NY")),
+    # Location line first, as some templates have it
+    ("Initech    San Francisco, CA", "Engineer    2019 to 2021", ("Engineer", "2019 to 2021", "Initech", "San Francisco, CA")),
+])
+def test_two_column_lines_are_split(title_line, company_line, expected):
+    data, _ = parse_resume_text(f"Jane Doe\njane@example.com\nExperience\n{title_line}\n{company_line}\n• Did things\n")
+    [job] = data["experience"]
+    assert (job["title"], job["dates"], job["company"], job["location"]) == expected
+    assert job["bullets"] == ["Did things"]
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (["CCNA (Cisco) cp.certmetrics.com/cisco/en/public/verify/credential/A1"],
+     [("CCNA", "Cisco", "https://cp.certmetrics.com/cisco/en/public/verify/credential/A1")]),
+    (["• CCNA – Cisco – Link (https://example.com/verify/1)"], [("CCNA", "Cisco", "https://example.com/verify/1")]),
+    (["AZ-900 – Microsoft (https://learn.microsoft.com/api/credentials/share/x)."],
+     [("AZ-900", "Microsoft", "https://learn.microsoft.com/api/credentials/share/x")]),
+    # A URL on its own line goes to the certification whose provider it names
+    (["Security+ (CompTIA) | AWS SAA (Amazon)", "https://www.credly.com/badges/comptia-1"],
+     [("Security+", "CompTIA", "https://www.credly.com/badges/comptia-1"), ("AWS SAA", "Amazon", "")]),
+    (["Security+ – CompTIA", "Kubernetes CKA – CNCF", "www.credly.com/badges/2"],
+     [("Security+", "CompTIA", ""), ("Kubernetes CKA", "CNCF", "https://www.credly.com/badges/2")]),
+])
+def test_certification_urls(lines, expected):
+    text = "Jane Doe\njane@example.com\nCertifications\n" + "\n".join(lines)
+    data, _ = parse_resume_text(text)
+    assert [(c["name"], c["provider"], c["url"]) for c in data["certifications"]] == expected
+
+
+def _upload(document_bytes: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(document_bytes), filename="resume.docx", size=len(document_bytes))
+
+
+def _prose_docx() -> bytes:
+    document = Document()
+    for line in PROSE.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_generated_docx_is_parsed_without_the_model():
+    model = FakeModel()
+    parser = ResumeParser(None, model=model)
+    data = asyncio.run(parser.parse_file(_upload(ResumeGenerator().render(RESUME).getvalue())))
+    assert parser.confidence >= settings.IMPORT_HEURISTIC_MIN_CONFIDENCE
+    assert model.calls == 0
+    assert data["personal_info"]["name"] == RESUME["name"]
+    assert data["certifications"] == [{"name": "CCNA", "provider": "Cisco", "url": "https://example.com/verify/1"}]
+
+
+def test_low_confidence_falls_back_to_the_model():
+    model = FakeModel(reply=json.dumps({"personal_info": {"name": "From the model"}}))
+    parser = ResumeParser(None, model=model)
+    data = asyncio.run(parser.parse_file(_upload(_prose_docx())))
+    assert parser.confidence < settings.IMPORT_HEURISTIC_MIN_CONFIDENCE
+    assert model.calls == 1
+    assert data == {"personal_info": {"name": "From the model"}}
+
+
+def test_low_confidence_without_a_model_needs_a_key():
+    with pytest.raises(ApiKeyRequired):
+        asyncio.run(ResumeParser(None).parse_file(_upload(_prose_docx())))
@@ -0,0 +1,45 @@
+import asyncio
+import gc
+import os
+import time
+from app.services.resume.latex_formats import FormatCache
+
+
+class InstantFormats(FormatCache):
+    """Writes an empty .fmt instead of running pdflatex -ini."""
+
+    async def _build(self, key: str, preamble: str):
+        await asyncio.sleep(0.01)
+        gc.collect()  # an unreferenced task would be collected here
+        open(os.path.join(self.directory, f"{key}.fmt"), "w").close()
+        self._building.discard(key)
+
+
+def test_builds_are_kept_alive_until_done(tmp_path):
+    formats = InstantFormats(str(tmp_path), max_formats=4, timeout=5)
+
+    async def scenario():
+        formats.schedule_build("a", "")
+        assert len(formats._tasks) == 1
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert formats.lookup("a") == "a"
+    assert not formats._tasks
+
+
+def test_least_recently_used_format_makes_room(tmp_path):
+    formats = InstantFormats(str(tmp_path), max_formats=3, timeout=5)
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            formats.schedule_build(key, "")
+            await asyncio.sleep(0.05)
+            time.sleep(0.01)  # distinct mtimes
+        formats.lookup("a")
+        formats.schedule_build("d", "")
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert sorted(entry.name for entry in formats._formats()) == ["a.fmt", "c.fmt", "d.fmt"]
+    assert formats.lookup("b") is None
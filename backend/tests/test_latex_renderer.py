@@ -0,0 +1,63 @@
+import json
+import os
+import time
+import pytest
+from app.services.resume.latex_renderer import LatexRenderError, escape_latex, render_resume_latex
+
+HERE = os.path.dirname(__file__)
+GOLDEN = os.path.join(HERE, "golden")
+TEMPLATE = os.path.join(HERE, "..", "app", "templates", "jake_ryan.tex")
+
+# UPDATE_GOLDEN=1 rewrites the expected output after an intended change
+UPDATE = os.getenv("UPDATE_GOLDEN") == "1"
+
+
+@pytest.fixture(scope="module")
+def template():
+    with open(TEMPLATE) as f:
+        return f.read()
+
+
+def load(name):
+    with open(os.path.join(GOLDEN, name)) as f:
+        return f.read()
+
+
+def test_render_matches_golden_file(template):
+    resume = json.loads(load("resume.json"))
+    rendered = render_resume_latex(resume, template)
+    golden = os.path.join(GOLDEN, "resume.tex")
+    if UPDATE:
+        with open(golden, "w") as f:
+            f.write(rendered)
+    assert rendered == load("resume.tex")
+
+
+def test_render_is_deterministic_and_fast(template):
+    resume = json.loads(load("resume.json"))
+    began = time.perf_counter()
+    outputs = {render_resume_latex(resume, template) for _ in range(20)}
+    assert len(outputs) == 1
+    assert (time.perf_counter() - began) / 20 < 0.05
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("R&D 100% $5 #1 a_b", r"R\&D 100\% \$5 \#1 a\_b"),
+    ("{x} ~ ^", r"\{x\} \textasciitilde{} \textasciicircum{}"),
+    ("C:\\path", r"C:\textbackslash{}path"),
+    ("a | b < c > d", r"a \textbar{} b \textless{} c \textgreater{} d"),
+    (None, ""),
+])
+def test_escape_latex(text, expected):
+    assert escape_latex(text) == expected
+
+
+def test_template_without_macros_is_rejected():
+    with pytest.raises(LatexRenderError):
+        render_resume_latex({"personal_info": {}}, "\\documentclass{article}\\begin{document}\\end{document}")
+
+
+@pytest.mark.parametrize("resume", [[], {"personal_info": "Jane"}, {"experience": ["not an object"]}])
+def test_malformed_json_is_rejected(template, resume):
+    with pytest.raises(LatexRenderError):
+        render_resume_latex(resume, template)
@@ -0,0 +1,65 @@
+import os
+import pytest
+from app.services.resume.latex_sections import HEADING, LatexDocument
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "app", "templates", "jake_ryan.tex")
+
+WITH_CERTIFICATIONS = r"""\documentclass{article}
+\begin{document}
+\begin{center}Jake Ryan\end{center}
+\section{Summary}
+Backend engineer.
+\section{Experience}
+\resumeSubheading{Acme}{Austin, TX}{Engineer}{2020 -- Present}
+\section{Certifications}
+CCNA (Cisco)
+\section{Technical Skills}
+Python, Go
+\end{document}
+"""
+
+
+@pytest.fixture
+def template():
+    with open(TEMPLATE) as f:
+        return LatexDocument.split(f.read())
+
+
+@pytest.fixture
+def certified():
+    return LatexDocument.split(WITH_CERTIFICATIONS)
+
+
+@pytest.mark.parametrize("instruction", [
+    "Tailor for a Senior Data Engineer role at Stripe",
+    "Optimize this for the backend position at Acme",
+    "Make it one page",
+    "Fix typos",
+    "x" * 401,
+])
+def test_whole_document_instructions_get_every_section(template, instruction):
+    assert template.relevant(instruction) == list(template.sections)
+
+
+def test_network_is_not_work(certified):
+    assert certified.relevant("Add Network+ certification") == ["Certifications"]
+
+
+def test_missing_section_falls_back_to_everything(template):
+    assert template.relevant("Add certification CCNA") == list(template.sections)
+
+
+def test_targeted_instructions(certified):
+    assert certified.relevant("Add certification CCNA") == ["Certifications"]
+    assert certified.relevant("Shorten my summary") == ["Summary"]
+    assert certified.relevant("Update my phone number") == [HEADING]
+    assert certified.relevant("Remove the Acme entry") == ["Experience"]
+
+
+def test_merge_replaces_only_named_sections(certified):
+    merged = LatexDocument.split(certified.merge([
+        {"name": "Summary", "latex": "\\section{Summary}\nData engineer."},
+    ]))
+    assert "Data engineer." in merged.sections["Summary"]
+    assert merged.sections["Experience"] == certified.sections["Experience"]
+    assert list(merged.sections) == list(certified.sections)
@@ -0,0 +1,36 @@
+import pytest
+
+# A list page is a count, the page itself and one batch per eager-loaded
+# relationship, however many rows it holds
+MAX_LIST_STATEMENTS = 4
+
+
+@pytest.mark.parametrize("path", ["/api/v1/jobs/", "/api/v1/contacts/"])
+@pytest.mark.parametrize("limit", [10, 100])
+def test_list_page_statement_count_is_fixed(client, seed, statements, path, limit):
+    seed(contacts=120, jobs_per_contact=1, tasks_per_contact=3)
+    statements.clear()
+    response = client.get(path, params={"limit": limit})
+    assert response.status_code == 200
+    assert len(response.json()) == limit
+    assert len(statements) <= MAX_LIST_STATEMENTS, [sql for sql, _ in statements]
+
+
+def test_job_page_serializes_nested_contacts_and_tasks(client, seed, statements):
+    seed(contacts=5, jobs_per_contact=1, tasks_per_contact=2)
+    statements.clear()
+    jobs = client.get("/api/v1/jobs/", params={"limit": 5}).json()
+    assert all(len(job["contact"]["tasks"]) == 2 for job in jobs)
+    assert len(statements) <= MAX_LIST_STATEMENTS
+
+
+def test_keyset_pages_keep_the_statement_count(client, seed, statements):
+    seed(contacts=30)
+    first = client.get("/api/v1/jobs/", params={"limit": 20, "sort": "status"})
+    cursor = first.headers["X-Next-Cursor"]
+    statements.clear()
+    second = client.get("/api/v1/jobs/", params={"limit": 20, "sort": "status", "cursor": cursor})
+    assert second.status_code == 200
+    assert {job["id"] for job in first.json()}.isdisjoint(job["id"] for job in second.json())
+    # A cursor may split the page into two index segments
+    assert len(statements) <= MAX_LIST_STATEMENTS + 1
@@ -0,0 +1,258 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from app.services.llm.cache import ResponseCache
+from app.services.llm.gateway import LlmGateway, LlmTimeout
+
+
+class FakeModel:
+    """Stands in for a Gemini model: anything with ``generate_content(prompt).text``."""
+
+    def __init__(self, reply='{"answer": 42}', delay: float = 0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.started = threading.Event()
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        return SimpleNamespace(text=self.reply)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / "llm_cache.db"), ttl=60, max_entries=100, max_bytes=1 << 20)
+
+
+def ask(cache, gateway, model, prompt="Parse this resume"):
+    # The same path AITailor and ResumeParser take to the model
+    return cache.fetch("fake-model", "1", prompt, lambda: gateway.run(lambda: model.generate_content(prompt).text), json.loads)
+
+
+def test_second_identical_prompt_is_a_cache_hit(cache, tmp_path):
+    model = FakeModel()
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=2, timeout=5)
+        first = await ask(cache, gateway, model)
+        second = await ask(cache, gateway, model)
+        other = await ask(cache, gateway, model, prompt="Another prompt")
+        return first, second, other
+
+    first, second, other = asyncio.run(scenario())
+    assert first == second == other == {"answer": 42}
+    assert model.calls == 2
+
+    # Persisted: a fresh cache on the same file still hits
+    reopened = ResponseCache(cache.path, ttl=60, max_entries=100, max_bytes=1 << 20)
+    assert reopened.lookup(cache.key_for("fake-model", "1", "Parse this resume"), json.loads) == {"answer": 42}
+
+
+def test_unparseable_answer_is_not_cached(cache):
+    model = FakeModel(reply="not json")
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=1, timeout=5)
+        for _ in range(2):
+            with pytest.raises(json.JSONDecodeError):
+                await ask(cache, gateway, model)
+
+    asyncio.run(scenario())
+    assert model.calls == 2
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm_cache.db"), ttl=0, max_entries=100, max_bytes=1 << 20)
+    model = FakeModel()
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=1, timeout=5)
+        await ask(cache, gateway, model)
+        await ask(cache, gateway, model)
+
+    asyncio.run(scenario())
+    assert model.calls == 2
+
+
+def test_unreadable_cache_is_a_miss(cache):
+    model = FakeModel()
+    # Every read and write now fails with sqlite3.OperationalError
+    cache._connection().execute("DROP TABLE llm_responses")
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=1, timeout=5)
+        return [await ask(cache, gateway, model) for _ in range(2)]
+
+    assert asyncio.run(scenario()) == [{"answer": 42}] * 2
+    assert model.calls == 2
+
+
+def test_cache_io_runs_off_the_event_loop(cache, monkeypatch):
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+
+        def recording(*args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(*args)
+
+        monkeypatch.setattr(cache, name, recording)
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=1, timeout=5)
+        await ask(cache, gateway, FakeModel())
+        await ask(cache, gateway, FakeModel())
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(threads) == 3  # miss, store, hit
+    assert loop_thread not in threads
+
+
+def test_concurrent_identical_prompts_share_one_call(cache):
+    model = FakeModel(delay=0.2)
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=4, timeout=5)
+        return await asyncio.gather(*(ask(cache, gateway, model) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert results == [{"answer": 42}] * 5
+    assert model.calls == 1
+
+
+def test_followers_retry_when_the_leader_is_cancelled(cache):
+    model = FakeModel(delay=0.2)
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=2, timeout=5)
+        leader = asyncio.create_task(ask(cache, gateway, model))
+        await asyncio.to_thread(model.started.wait, 1)
+        follower = asyncio.create_task(ask(cache, gateway, model))
+        await asyncio.sleep(0.05)  # the follower is now waiting on the leader
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(follower, 5)
+
+    assert asyncio.run(scenario()) == {"answer": 42}
+    # The follower asked again rather than sharing the cancelled call
+    assert model.calls == 2
+
+
+def test_tailor_uses_an_injected_model(tmp_path):
+    from app.services.resume.ai_tailor import AITailor
+
+    model = FakeModel(reply=json.dumps({"latex_code": "\\documentclass{article}", "explanation": "done"}))
+    tailor = AITailor(None, model=model)
+    result = asyncio.run(tailor.tailor_resume("\\documentclass{article}", f"Fix typos {tmp_path}"))
+    assert result["explanation"] == "done"
+    assert model.calls == 1
+
+
+class HangingModel(FakeModel):
+    """Never answers in time for prompts that mention "HANG"; counts threads in use."""
+
+    def __init__(self, reply='{"answer": 42}', delay: float = 0.0, hang: float = 2.0):
+        super().__init__(reply, delay)
+        self.hang = hang
+        self.running = 0
+        self.most_running = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        try:
+            if "HANG" in prompt:
+                time.sleep(self.hang)
+            return super().generate_content(prompt)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def test_timed_out_calls_do_not_hold_up_later_ones():
+    model = HangingModel()
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=2, timeout=0.3)
+        hung = await asyncio.gather(
+            *(gateway.run(lambda: model.generate_content("HANG")) for _ in range(2)), return_exceptions=True
+        )
+        started = time.perf_counter()
+        answer = await gateway.run(lambda: model.generate_content("quick"))
+        return hung, answer, time.perf_counter() - started, gateway.abandoned
+
+    hung, answer, elapsed, abandoned = asyncio.run(scenario())
+    assert all(isinstance(error, LlmTimeout) for error in hung)
+    # Both hung threads are still sleeping, yet the next call ran straight away
+    assert answer.text == '{"answer": 42}'
+    assert elapsed < 0.2
+    assert abandoned == 2
+
+
+def test_abandoned_threads_are_capped():
+    model = HangingModel(hang=1.0)
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=1, timeout=0.2, max_abandoned=1)
+        for _ in range(2):
+            with pytest.raises(LlmTimeout):
+                await gateway.run(lambda: model.generate_content("HANG"))
+        # The second hung call is past the cap, so it keeps the only slot
+        with pytest.raises(LlmTimeout, match="free model slot"):
+            await gateway.run(lambda: model.generate_content("quick"))
+        return gateway.abandoned
+
+    assert asyncio.run(scenario()) == 1
+    assert model.most_running == 2
+
+
+def test_other_endpoints_stay_responsive_under_model_load(db, monkeypatch):
+    import httpx
+    from app.main import app
+    from app.services.resume import ai_tailor
+
+    model = HangingModel(reply=json.dumps({"latex_code": "\\documentclass{article}", "explanation": "done"}), delay=0.1)
+    monkeypatch.setattr(ai_tailor, "AITailor", functools.partial(ai_tailor.AITailor, model=model))
+
+    async def scenario():
+        gateway = LlmGateway(concurrency=2, timeout=1.0)
+        monkeypatch.setattr(ai_tailor, "get_llm_gateway", lambda: gateway)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            async def tailor(instruction):
+                body = {"resume_text": "\\documentclass{article}", "job_description": instruction, "api_key": "local"}
+                return (await http.post("/api/v1/resumes/tailor", json=body)).status_code
+
+            latencies = []
+            done = asyncio.Event()
+
+            async def probe():
+                while not done.is_set():
+                    started = time.perf_counter()
+                    assert (await http.get("/api/v1/jobs/")).status_code == 200
+                    latencies.append(time.perf_counter() - started)
+                    await asyncio.sleep(0.02)
+
+            prober = asyncio.create_task(probe())
+            hung = await asyncio.gather(*(tailor(f"HANG {i}") for i in range(2)))
+            served = await asyncio.gather(*(tailor(f"Tighten bullet {i}") for i in range(8)))
+            done.set()
+            await prober
+            return hung, served, latencies
+
+    hung, served, latencies = asyncio.run(scenario())
+    assert hung == [504] * 2
+    # The hung SDK calls are still running, but don't starve the next requests
+    assert served == [200] * 8
+    assert len(latencies) > 10
+    assert max(latencies) < 0.25
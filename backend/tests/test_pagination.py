@@ -0,0 +1,90 @@
+import statistics
+import time
+import pytest
+from sqlalchemy import insert
+from app.core.pagination import MAX_PAGE_SIZE, encode_cursor, paginate
+from app.models import job_tracker as models
+
+LIST_PATHS = ["/api/v1/jobs/", "/api/v1/contacts/", "/api/v1/companies/", "/api/v1/notes/"]
+
+
+@pytest.mark.parametrize("path", LIST_PATHS)
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+def test_out_of_range_limit_is_rejected(client, db, path, limit):
+    assert client.get(path, params={"limit": limit}).status_code == 422
+
+
+@pytest.mark.parametrize("path", LIST_PATHS)
+def test_negative_skip_is_rejected(client, db, path):
+    assert client.get(path, params={"skip": -1}).status_code == 422
+
+
+def test_cursor_is_bound_to_its_sort(client, seed):
+    seed(contacts=10)
+    cursor = client.get("/api/v1/jobs/", params={"limit": 5, "sort": "status"}).headers["X-Next-Cursor"]
+
+    assert client.get("/api/v1/jobs/", params={"limit": 5, "sort": "status", "cursor": cursor}).status_code == 200
+    assert client.get("/api/v1/jobs/", params={"limit": 5, "sort": "company", "cursor": cursor}).status_code == 400
+    assert client.get("/api/v1/jobs/", params={"limit": 5, "sort": "id", "cursor": cursor}).status_code == 400
+    assert client.get(
+        "/api/v1/jobs/", params={"limit": 5, "sort": "status", "order": "desc", "cursor": cursor}
+    ).status_code == 400
+
+
+def test_garbage_cursor_is_rejected(client, db):
+    assert client.get("/api/v1/jobs/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_walking_every_page_visits_every_row_once(client, seed):
+    seed(contacts=45, jobs_per_contact=1)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, "sort": "status", "order": "desc"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/jobs/", params=params)
+        seen += [job["id"] for job in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 45
+
+
+def _median_ms(fn, runs=7):
+    timings = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - began) * 1000)
+    return statistics.median(timings)
+
+
+def test_keyset_page_latency_is_flat_at_100k_rows(db):
+    rows = 100_000
+    statuses = ("Applied", "Interviewing", "Offer", "Rejected")
+    db.execute(insert(models.Job), [
+        {"company": f"Company {i % 500}", "position": f"Engineer {i}", "status": statuses[i % 4]}
+        for i in range(rows)
+    ])
+    db.commit()
+
+    query = db.query(models.Job)
+    order = (models.Job.status, models.Job.id)
+    timings = {}
+    for position in (0, rows // 2, rows - 100):
+        if position:
+            before = query.order_by(*order).offset(position - 1).first()
+            cursor = encode_cursor([before.status, before.id], "status:asc")
+        else:
+            cursor = None
+        keyset = lambda: paginate(query, models.Job.id, cursor, 100, sort_column=models.Job.status)
+        offset = lambda: query.order_by(*order).offset(position).limit(100).all()
+        assert [job.id for job in keyset()[0]] == [job.id for job in offset()]
+        timings[position] = (_median_ms(keyset), _median_ms(offset))
+        db.expunge_all()
+
+    print("\nrow     keyset ms  offset ms")
+    for position, (keyset_ms, offset_ms) in timings.items():
+        print(f"{position:<7} {keyset_ms:9.2f}  {offset_ms:9.2f}")
+    first = timings[0][0]
+    assert all(keyset_ms < first * 3 + 2 for keyset_ms, _ in timings.values())
@@ -0,0 +1,54 @@
+import pytest
+from app.models import job_tracker as models
+
+
+def explain(db_engine, statement, parameters) -> str:
+    with db_engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def job_page_plans(db_engine, statements):
+    return [explain(db_engine, sql, params) for sql, params in statements if sql.lstrip().startswith("SELECT jobs.")]
+
+
+@pytest.mark.parametrize("sort, index", [
+    ("date_applied", "ix_jobs_date_applied_id"),
+    ("status", "ix_jobs_status_id"),
+    ("company", "ix_jobs_company"),
+    ("position", "ix_jobs_position"),
+])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_keyset_job_pages_seek_on_the_sort_index(client, seed, statements, db_engine, sort, index, order):
+    seed(contacts=30)
+    first = client.get("/api/v1/jobs/", params={"limit": 10, "sort": sort, "order": order})
+    statements.clear()
+    client.get("/api/v1/jobs/", params={
+        "limit": 10, "sort": sort, "order": order, "cursor": first.headers["X-Next-Cursor"],
+    })
+    plans = job_page_plans(db_engine, statements)
+    assert plans
+    for plan in plans:
+        assert index in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+def test_board_column_uses_status_date_index(db, statements, db_engine):
+    db.query(models.Job).filter(models.Job.status == "Applied").order_by(models.Job.date_applied.desc()).all()
+    plan = explain(db_engine, *statements[-1])
+    assert "ix_jobs_status_date_applied" in plan and "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.parametrize("model, index", [
+    (models.Task, "ix_tasks_contact_id"),
+    (models.Job, "ix_jobs_contact_id"),
+])
+def test_contact_foreign_keys_are_indexed(db, statements, db_engine, model, index):
+    db.query(model).filter(model.contact_id == 1).all()
+    assert index in explain(db_engine, *statements[-1])
+
+
+def test_recent_notes_use_updated_at_index(db, statements, db_engine):
+    db.query(models.Note).order_by(models.Note.updated_at.desc()).limit(20).all()
+    plan = explain(db_engine, *statements[-1])
+    assert "ix_notes_updated_at" in plan and "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,100 @@
+import random
+import statistics
+import time
+from sqlalchemy import insert, text
+from app.core.config import settings
+from app.core.migrations import run_migrations
+from app.models import job_tracker as models
+
+# Common-term searches over this many notes must stay under the target
+NOTES = 20_000
+TARGET_MS = 10
+
+
+def search(client, q, **params):
+    response = client.get("/api/v1/search/", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_stored_markup_is_escaped_around_highlights(client, db):
+    db.add(models.Note(title="Talked to <b>recruiter</b>", content='<img src=x onerror="alert(1)"> recruiter call'))
+    db.commit()
+
+    [result] = search(client, "recruiter")
+    assert result["title"] == "Talked to &lt;b&gt;<mark>recruiter</mark>&lt;/b&gt;"
+    assert "<img" not in result["snippet"]
+    assert "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>recruiter</mark> call" in result["snippet"]
+
+
+def test_rare_terms_are_found_outside_the_ranking_window(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_RANK_MAX_MATCHES", 5)
+    db.add(models.Note(title="Kubernetes migration", content="old notes"))
+    db.flush()
+    db.execute(insert(models.Note), [{"title": f"Standup {i}", "content": "weekly sync"} for i in range(20)])
+    db.commit()
+
+    assert [r["title"] for r in search(client, "kubernetes")] == ["<mark>Kubernetes</mark> migration"]
+    # A common term is ranked within its newest matches only
+    ids = [r["id"] for r in search(client, "standup", limit=100)]
+    assert len(ids) == 5
+    assert min(ids) == max(ids) - 4
+
+
+def index_writes(db, statement):
+    """Rows ``statement`` changes through triggers (the index and FTS5's own tables)."""
+    connection = db.connection().connection.driver_connection
+    before = connection.total_changes
+    db.execute(text(statement))
+    # total_changes counts trigger writes too; the statement itself changes one row
+    return connection.total_changes - before - 1
+
+
+def test_only_indexed_columns_reindex_on_update(client, db):
+    db.add(models.Job(company="Acme", position="Platform Engineer", status="Applied"))
+    db.commit()
+
+    assert index_writes(db, "UPDATE jobs SET status = 'Interviewing'") == 0
+    assert index_writes(db, "UPDATE jobs SET position = 'Staff Engineer'") > 0
+    db.commit()
+    assert [r["title"] for r in search(client, "staff")] == ["<mark>Staff</mark> Engineer"]
+    assert search(client, "platform") == []
+
+
+def test_migration_replaces_outdated_triggers(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(text("DROP TRIGGER jobs_search_au"))
+        conn.execute(text(
+            "CREATE TRIGGER jobs_search_au AFTER UPDATE ON jobs BEGIN "
+            "DELETE FROM search_index WHERE rowid = old.id * 3 + 2; END"
+        ))
+    run_migrations(db_engine)
+    with db_engine.connect() as conn:
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'jobs_search_au'")).scalar()
+    assert "AFTER UPDATE OF position, company ON jobs" in ddl
+
+
+def test_common_term_latency(client, db):
+    rng = random.Random(1)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = list(dict.fromkeys("".join(rng.choices(letters, k=rng.randint(3, 9))) for _ in range(2000)))
+    weights = [1 / (i + 1) for i in range(len(vocabulary))]
+    db.execute(insert(models.Note), [
+        {
+            "title": " ".join(rng.choices(vocabulary, weights, k=5)),
+            "content": " ".join(rng.choices(vocabulary, weights, k=40)),
+        }
+        for _ in range(NOTES)
+    ])
+    db.commit()
+    assert len(search(client, vocabulary[0])) == 20
+
+    # The most common word, two common words, a prefix being typed, one letter
+    for q in (vocabulary[0], f"{vocabulary[1]} {vocabulary[2]}", vocabulary[0][:2], vocabulary[0][0]):
+        timings = []
+        for _ in range(5):
+            began = time.perf_counter()
+            search(client, q)
+            timings.append((time.perf_counter() - began) * 1000)
+        assert statistics.median(timings) < TARGET_MS, (q, timings)
+        print(f"\n{q!r}: {statistics.median(timings):.1f} ms")